@@ -1,85 +1,224 @@
-import pandas as pd
-import json
-
-# Load Dataframes
-def load_data(raw_path="data/raw/"):
-    # Transaction Data
-    transactions = pd.read_csv(raw_path + "transactions_data.csv")
-    # Card Data
-    cards = pd.read_csv(raw_path + "cards_data.csv")
-    # Users Data
-    users = pd.read_csv(raw_path + "users_data.csv")
-    # MCC (Merchant Category Codes) Codes
-    with open(raw_path + "mcc_codes.json") as f:
-        mcc_codes = json.load(f)
-    mcc_codes = pd.DataFrame(list(mcc_codes.items()), columns=['mcc_code', 'mcc_description'])
-    # Fraud Labels
-    with open(raw_path + "train_fraud_labels.json") as f:
-        fraud_labels = json.load(f)
-    fraud_labels = pd.DataFrame(list(fraud_labels['target'].items()), columns=['transaction_id', 'fraud_flag'])
-    return transactions, cards, users, mcc_codes, fraud_labels
-
-# Standardize & Clean Dataframes
-def clean_transactions(transactions, cards, users, mcc_codes):
-    # Rename Columns
-    transactions = transactions.rename(columns={
-        "id": "transaction_id",
-        "date": "transaction_date",
-        "use_chip": "payment_method",
-        "merchant_id": "vendor_id",
-        "mcc": "mcc_code"
-    })
-    
-    # Convert `transaction_date` and `acct_open_date` to datetime
-    transactions["transaction_date"] = pd.to_datetime(transactions["transaction_date"], errors="coerce")
-    cards["acct_open_date"] = pd.to_datetime(cards["acct_open_date"], errors="coerce")
-    
-    # Clean amount (Remove $)
-    datasets = {
-        "transactions": transactions,
-        "cards": cards,
-        "users": users
-    }
-    for name, df in datasets.items():
-        for col in df.columns:
-            if df[col].dtype == "object":
-                if df[col].str.contains(r"\$", na=False).any():
-                    df[col] = (
-                        df[col]
-                        .replace(r"[\$,]", "", regex=True)
-                        .astype(float)
-                    )
-
-    # Ensure mcc is string
-    transactions["mcc_code"] = transactions["mcc_code"].astype(str)
-    return transactions, cards, users, mcc_codes
-
-def integrate_data(transactions, cards, users, mcc_codes, fraud_labels):
-    # Merge transactions with cards
-    cleaned_df = transactions.merge(cards, left_on="card_id", right_on="id", how="left", suffixes=("", "_card"))
-
-    # Merge with users
-    cleaned_df = cleaned_df.merge(users, left_on="client_id", right_on="id", how="left", suffixes=("", "_user"))
-
-    # Map MCC descriptions
-    mcc_dict = dict(zip(mcc_codes['mcc_code'], mcc_codes['mcc_description']))
-    cleaned_df['mcc_description'] = cleaned_df['mcc_code'].map(mcc_dict)
-
-    # Map fraud labels
-    fraud_dict = dict(zip(fraud_labels['transaction_id'], fraud_labels['fraud_flag']))
-    cleaned_df['fraud_flag'] = cleaned_df['transaction_id'].map(fraud_dict)
-
-    return cleaned_df
-
-def generate_synthetic_fields(df):
-    df["invoice_number"] = ["INV-" + str(i).zfill(6) for i in range(1, len(df)+1)]
-    df["currency"] = "USD"
-    df["cost_center"] = df["card_type"].fillna("Unknown")
-    return df
-
-def inject_dirty_data(df, n_duplicates=10, n_missing_vendor=5):
-    random_rows = df.sample(n=n_duplicates, replace=True).copy()
-    df = pd.concat([df, random_rows], ignore_index=True)
-    rows_to_corrupt = df.sample(n_missing_vendor, random_state=42).index
-    df.loc[rows_to_corrupt, "vendor_id"] = None
-    return df
\ No newline at end of file
+import pandas as pd
+import numpy as np
+import json
+import re
+import os
+from .schema import TRANSACTIONS_SCHEMA, CARDS_SCHEMA, USERS_SCHEMA, read_csv_schema, money_to_dollars
+
+# Load Dataframes
+def load_data(raw_path="data/raw/"):
+    # Transaction Data (dtypes and dates parsed at read time, see schema.py)
+    # Money is parsed exactly in cents, and handed out in float dollars as before (the streaming/lake paths keep cents)
+    transactions = money_to_dollars(read_csv_schema(raw_path + "transactions_data.csv", TRANSACTIONS_SCHEMA))
+    # Card Data
+    cards = money_to_dollars(read_csv_schema(raw_path + "cards_data.csv", CARDS_SCHEMA))
+    # Users Data
+    users = money_to_dollars(read_csv_schema(raw_path + "users_data.csv", USERS_SCHEMA))
+    # MCC (Merchant Category Codes) Codes
+    with open(raw_path + "mcc_codes.json") as f:
+        mcc_codes = json.load(f)
+    mcc_codes = pd.DataFrame(list(mcc_codes.items()), columns=['mcc_code', 'mcc_description'])
+    # Fraud Labels
+    with open(raw_path + "train_fraud_labels.json") as f:
+        fraud_labels = json.load(f)
+    fraud_labels = pd.DataFrame(list(fraud_labels['target'].items()), columns=['transaction_id', 'fraud_flag'])
+    return transactions, cards, users, mcc_codes, fraud_labels
+
+# Fraud Labels, parsed incrementally into arrays (no dict of millions of Python strings)
+LABEL_PATTERN = re.compile(rb'"(\d+)"\s*:\s*"(Yes|No)"')
+
+def parse_fraud_labels(path, block_size=1 << 22):
+    # Read the {"target": {"<transaction id>": "Yes"/"No", ...}} file block by block
+    ids, flags = [], []
+    tail = b""
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(block_size)
+            buffer = tail + block
+            # Keep the last (possibly cut) entry for the next block
+            cut = buffer.rfind(b",") + 1 if block else len(buffer)
+            matches = LABEL_PATTERN.findall(buffer[:cut])
+            if matches:
+                ids.append(np.array([m[0] for m in matches], dtype=np.int64))
+                flags.append(np.array([m[1] == b"Yes" for m in matches], dtype=np.int8))
+            tail = buffer[cut:]
+            if not block:
+                break
+
+    # Sorted by transaction id
+    ids = np.concatenate(ids) if ids else np.empty(0, dtype=np.int64)
+    flags = np.concatenate(flags) if flags else np.empty(0, dtype=np.int8)
+    order = np.argsort(ids, kind="stable")
+    return ids[order], flags[order]
+
+# Standardize & Clean Dataframes
+def rename_transactions(transactions):
+    # Rename Columns
+    return transactions.rename(columns={
+        "id": "transaction_id",
+        "date": "transaction_date",
+        "use_chip": "payment_method",
+        "merchant_id": "vendor_id",
+        "mcc": "mcc_code"
+    })
+
+def strip_currency(df):
+    # Clean amount (Remove $) in text columns holding money (schema-typed frames have none left)
+    for col in df.columns:
+        if pd.api.types.is_string_dtype(df[col]) and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            if df[col].str.contains(r"\$", na=False).any():
+                df[col] = (
+                    df[col]
+                    .replace(r"[\$,]", "", regex=True)
+                    .astype(float)
+                )
+    return df
+
+def clean_transaction_chunk(transactions):
+    transactions = rename_transactions(transactions)
+    if not pd.api.types.is_datetime64_any_dtype(transactions["transaction_date"]):
+        transactions["transaction_date"] = pd.to_datetime(transactions["transaction_date"], errors="coerce")
+    transactions = strip_currency(transactions)
+    # Ensure mcc is string (integer codes from the schema are kept, and matched as integers in integrate_data)
+    if not pd.api.types.is_integer_dtype(transactions["mcc_code"]):
+        transactions["mcc_code"] = transactions["mcc_code"].astype(str)
+    return transactions
+
+def clean_reference_data(cards, users):
+    # Small tables: cleaned once and kept in memory
+    if not pd.api.types.is_datetime64_any_dtype(cards["acct_open_date"]):
+        cards["acct_open_date"] = pd.to_datetime(cards["acct_open_date"], errors="coerce")
+    return strip_currency(cards), strip_currency(users)
+
+def clean_transactions(transactions, cards, users, mcc_codes):
+    # Convert `transaction_date` and `acct_open_date` to datetime, remove $
+    transactions = clean_transaction_chunk(transactions)
+    cards, users = clean_reference_data(cards, users)
+    return transactions, cards, users, mcc_codes
+
+# Enrichment: dense arrays indexed by key (card id, client id, MCC, transaction id) give the row of the
+# small table (or the value) for every key, so a chunk is enriched by gathering only the needed columns
+def dense_lookup(keys, values=None, fill=-1, dtype=np.int32):
+    # table[key] = position of key (or values[position]), fill for absent keys
+    keys = np.asarray(keys, dtype=np.int64)
+    table = np.full(keys.max() + 1 if len(keys) else 0, fill, dtype=dtype)
+    table[keys] = np.arange(len(keys)) if values is None else values
+    return table
+
+def gather(table, keys, fill=-1):
+    # table[key] for every key, fill for missing keys and keys outside the table
+    keys = np.nan_to_num(np.asarray(keys, dtype=float), nan=-1).astype(np.int64)
+    inside = (keys >= 0) & (keys < len(table))
+    result = np.full(len(keys), fill, dtype=table.dtype)
+    result[inside] = table[keys[inside]]
+    return result
+
+def build_enrichment_index(cards, users, mcc_codes, fraud_labels):
+    # Lookups are built once, then shared by every chunk
+    mcc_keys = mcc_codes['mcc_code'].astype(int).to_numpy()
+    mcc_descriptions = pd.Categorical(mcc_codes['mcc_description'])
+    if not isinstance(fraud_labels, tuple):
+        # DataFrame from load_data (string ids, "Yes"/"No")
+        fraud_labels = (fraud_labels['transaction_id'].astype(np.int64).to_numpy(),
+                        (fraud_labels['fraud_flag'] == "Yes").to_numpy(dtype=np.int8))
+    return {
+        'cards': cards,
+        'users': users,
+        'card_row': dense_lookup(cards['id']),
+        'user_row': dense_lookup(users['id']),
+        'mcc_description': dense_lookup(mcc_keys, mcc_descriptions.codes, dtype=np.int16),
+        'mcc_categories': mcc_descriptions.categories,
+        'fraud_flag': dense_lookup(fraud_labels[0], fraud_labels[1], dtype=np.int8)
+    }
+
+def _take_columns(table, rows, suffix, existing):
+    # Columns of table at the given rows (-1: missing, NaN like a left merge), renamed on name clashes
+    columns = {}
+    for col in table.columns:
+        name = col + suffix if col in existing else col
+        columns[name] = pd.api.extensions.take(table[col].array, rows, allow_fill=True)
+    return columns
+
+def enrich_transactions(transactions, index, unmatched=None):
+    # Same columns as merging cards (on card_id) and users (on client_id), then mapping MCC descriptions and
+    # fraud labels; unmatched keys are counted per lookup in the unmatched dict
+    card_rows = gather(index['card_row'], transactions['card_id'])
+    user_rows = gather(index['user_row'], transactions['client_id'])
+    mcc_codes = gather(index['mcc_description'], transactions['mcc_code'])
+    fraud_codes = gather(index['fraud_flag'], transactions['transaction_id'])
+
+    columns = {col: transactions[col].array for col in transactions.columns}
+    columns.update(_take_columns(index['cards'], card_rows, "_card", columns))
+    columns.update(_take_columns(index['users'], user_rows, "_user", columns))
+    columns['mcc_description'] = pd.Categorical.from_codes(mcc_codes, categories=index['mcc_categories'])
+    columns['fraud_flag'] = pd.Categorical.from_codes(fraud_codes, categories=["No", "Yes"])
+
+    if unmatched is not None:
+        for key, codes in (("card_id", card_rows), ("client_id", user_rows), ("mcc_code", mcc_codes), ("fraud_label", fraud_codes)):
+            unmatched[key] = unmatched.get(key, 0) + int((codes < 0).sum())
+    return pd.DataFrame(columns)
+
+def integrate_data(transactions, cards, users, mcc_codes, fraud_labels, unmatched=None):
+    # Enrich with cards, users, MCC descriptions and fraud labels (label arrays from parse_fraud_labels,
+    # or the DataFrame from load_data)
+    index = build_enrichment_index(cards, users, mcc_codes, fraud_labels)
+    return enrich_transactions(transactions, index, unmatched)
+
+def generate_synthetic_fields(df, start=1):
+    # Invoice numbers continue from `start` (row number of the first row when processing chunks)
+    df["invoice_number"] = ["INV-" + str(i).zfill(6) for i in range(start, start+len(df))]
+    df["currency"] = "USD"
+    card_type = df["card_type"]
+    if isinstance(card_type.dtype, pd.CategoricalDtype):
+        card_type = card_type.cat.add_categories(["Unknown"])
+    df["cost_center"] = card_type.fillna("Unknown")
+    return df
+
+def inject_dirty_data(df, n_duplicates=10, n_missing_vendor=5):
+    random_rows = df.sample(n=n_duplicates, replace=True).copy()
+    df = pd.concat([df, random_rows], ignore_index=True)
+    rows_to_corrupt = df.sample(n_missing_vendor, random_state=42).index
+    df.loc[rows_to_corrupt, "vendor_id"] = None
+    return df
+
+# Streaming mode: transactions go through clean -> integrate -> synthetic fields -> write in fixed-size chunks,
+# so peak memory depends on the chunk size, not on the size of transactions_data.csv
+def load_enrichment_index(raw_path="data/raw/"):
+    # Small tables (cleaned once) and fraud labels, kept resident as enrichment lookups
+    cards = read_csv_schema(raw_path + "cards_data.csv", CARDS_SCHEMA)
+    users = read_csv_schema(raw_path + "users_data.csv", USERS_SCHEMA)
+    cards, users = clean_reference_data(cards, users)
+    with open(raw_path + "mcc_codes.json") as f:
+        mcc_codes = json.load(f)
+    mcc_codes = pd.DataFrame(list(mcc_codes.items()), columns=['mcc_code', 'mcc_description'])
+    fraud_labels = parse_fraud_labels(raw_path + "train_fraud_labels.json")
+    return build_enrichment_index(cards, users, mcc_codes, fraud_labels)
+
+def stream_pipeline(raw_path="data/raw/", output_path="data/cleaned/ap_gl_cleaned.csv", chunksize=500_000, log=True):
+    from .logging_utils import log_pipeline_step
+
+    # Small tables stay resident
+    index = load_enrichment_index(raw_path)
+    if log:
+        log_pipeline_step("stream_load_reference", int((index['fraud_flag'] >= 0).sum()))
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    n_rows = 0
+    unmatched = {}
+    for chunk in read_csv_schema(raw_path + "transactions_data.csv", TRANSACTIONS_SCHEMA, chunksize=chunksize):
+        chunk = clean_transaction_chunk(chunk)
+        chunk = enrich_transactions(chunk, index, unmatched)
+        chunk = generate_synthetic_fields(chunk, start=n_rows + 1)
+
+        # First chunk writes the header, the next ones append (money back in dollars)
+        chunk = money_to_dollars(chunk)
+        chunk.to_csv(output_path, mode="w" if n_rows == 0 else "a", header=n_rows == 0, index=False)
+        n_rows += len(chunk)
+        if log:
+            log_pipeline_step("stream_chunk", len(chunk))
+
+    if log:
+        log_pipeline_step("stream_pipeline", n_rows)
+        for key, count in unmatched.items():
+            log_pipeline_step(f"unmatched_{key}", count, status="WARNING" if count else "SUCCESS")
+    return n_rows, unmatched
\ No newline at end of file
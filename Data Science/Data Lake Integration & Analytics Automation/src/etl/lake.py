@@ -0,0 +1,206 @@
+import pandas as pd
+import io
+import json
+import os
+import glob
+import uuid
+from datetime import datetime
+from .schema import TRANSACTIONS_SCHEMA, read_csv_schema
+from .etl_functions import (clean_transaction_chunk, enrich_transactions, generate_synthetic_fields, load_enrichment_index,
+                            rename_transactions)
+
+# Data lake layout: <lake_path>/year=YYYY/month=MM/part-<run id>-<chunk>.parquet
+# Money stays in int64 cents, as parsed by the schema
+WATERMARK_FILE = "_watermark.json"
+PENDING_FILE = "_pending.json"
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__" # Rows without a transaction date
+PARTITION_COLUMNS = ["year", "month"]
+
+def require_parquet():
+    # Parquet support is only needed when writing the lake (imported on first use)
+    try:
+        import pyarrow # noqa: F401
+    except ImportError as e:
+        raise ImportError("Writing the data lake requires pyarrow (pip install pyarrow)") from e
+
+def lake_partitioning():
+    # year/month partition keys read as (nullable) integers: the default inference makes them dictionaries,
+    # which cannot be unified with the null of the undated partition
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    return ds.partitioning(pa.schema([("year", pa.int32()), ("month", pa.int32())]), flavor="hive")
+
+def read_lake(lake_path="data/lake/transactions", **kwargs):
+    # Whole lake (or a filtered part of it, e.g. filters=[("year", "=", 2012)]) with its year/month columns
+    require_parquet()
+    return pd.read_parquet(lake_path, partitioning=lake_partitioning(), **kwargs)
+
+def _write_json(path, content):
+    # Atomic write: readers never see a half-written file
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(content, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+def read_watermark(lake_path):
+    # High-water mark of the last successful run (None before the first run)
+    path = os.path.join(lake_path, WATERMARK_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        watermark = json.load(f)
+    watermark["transaction_date"] = pd.Timestamp(watermark["transaction_date"])
+    watermark.setdefault("undated_transaction_id", None)
+    watermark.setdefault("raw_offset", None)
+    return watermark
+
+def raw_start(path, watermark):
+    # Header of the raw CSV and byte offset to read from: the end of the rows read by the last run (the raw file
+    # is appended to), or the first row if there is no usable offset (first run, or the file was rewritten)
+    with open(path, "rb") as f:
+        header = f.readline()
+        offset = watermark["raw_offset"] if watermark is not None else None
+        if offset is not None and len(header) < offset <= os.path.getsize(path):
+            f.seek(offset - 1)
+            if f.read(1) == b"\n":
+                return header, offset, True
+    return header, len(header), False
+
+def rows_after_watermark(df, watermark):
+    # New rows: later date, or same date and larger transaction id.
+    # Undated rows have no place in time: new if their transaction id is larger than the last undated one ingested
+    if watermark is None:
+        return df
+    date, ids = df["transaction_date"], df["transaction_id"]
+    last_date = watermark["transaction_date"]
+    if pd.isna(last_date):
+        keep = date.notna()
+    else:
+        keep = (date > last_date) | ((date == last_date) & (ids > watermark["transaction_id"]))
+    undated = date.isna()
+    if watermark["undated_transaction_id"] is not None:
+        undated &= ids > watermark["undated_transaction_id"]
+    return df[(keep | undated).to_numpy()]
+
+def partition_path(lake_path, year, month):
+    if pd.isna(year):
+        return os.path.join(lake_path, f"year={NULL_PARTITION}")
+    return os.path.join(lake_path, f"year={int(year)}", f"month={int(month):02d}")
+
+def write_partitions(df, lake_path, part_name, mode="append"):
+    # Write rows into their year/month partitions
+    # - append: one new part file per touched partition
+    # - replace: the partition is rewritten with its existing rows and the new ones (same transaction_id: new wins)
+    dates = df["transaction_date"]
+    touched = []
+    for (year, month), part in df.groupby([dates.dt.year, dates.dt.month], sort=True, dropna=False):
+        folder = partition_path(lake_path, year, month)
+        os.makedirs(folder, exist_ok=True)
+        target = os.path.join(folder, f"part-{part_name}.parquet")
+
+        if mode == "replace":
+            existing = glob.glob(os.path.join(folder, "*.parquet"))
+            if existing:
+                # Files read on their own (partitioning=None): the year/month keys of the path are not columns
+                old = pd.read_parquet(existing, partitioning=None).drop(columns=PARTITION_COLUMNS, errors="ignore")
+                part = pd.concat([old, part], ignore_index=True)
+                part = part.drop_duplicates("transaction_id", keep="last")
+            # Write the new file first, then drop the old ones
+            part.to_parquet(target + ".tmp", index=False)
+            os.replace(target + ".tmp", target)
+            for path in existing:
+                if path != target:
+                    os.remove(path)
+        else:
+            part.to_parquet(target, index=False)
+        touched.append(os.path.relpath(folder, lake_path))
+    return touched
+
+def _discard_pending(lake_path):
+    # Appended part files of a run that did not finish (its watermark was never written) are removed.
+    # Replaced partitions are kept: they hold the old rows too, and rerunning replaces the same rows again
+    path = os.path.join(lake_path, PENDING_FILE)
+    if os.path.exists(path):
+        with open(path) as f:
+            pending = json.load(f)
+        if pending["mode"] == "append":
+            for part in glob.glob(os.path.join(lake_path, "**", f"part-{pending['run_id']}-*.parquet"), recursive=True):
+                os.remove(part)
+        os.remove(path)
+
+def incremental_pipeline(raw_path="data/raw/", lake_path="data/lake/transactions", chunksize=500_000, mode="append", log=True):
+    # Process only the raw transactions after the watermark: clean -> enrich -> synthetic fields -> partitions
+    # Reading starts where the last run stopped (raw_offset), and rows are filtered on the watermark before cleaning.
+    # Rows read but dated at or before the watermark arrived late and are dropped (counted in late_rows)
+    from .logging_utils import log_pipeline_step
+
+    require_parquet()
+    os.makedirs(lake_path, exist_ok=True)
+    _discard_pending(lake_path)
+    watermark = read_watermark(lake_path)
+    run_id = datetime.now().strftime("%Y%m%d%H%M%S") + "-" + uuid.uuid4().hex[:6]
+    _write_json(os.path.join(lake_path, PENDING_FILE), {"run_id": run_id, "mode": mode})
+
+    index = load_enrichment_index(raw_path)
+    n_rows = watermark["rows"] if watermark is not None else 0
+    new_rows = 0
+    max_date, max_id = (watermark["transaction_date"], watermark["transaction_id"]) if watermark is not None else (None, None)
+    max_undated_id = watermark["undated_transaction_id"] if watermark is not None else None
+    max_date = None if pd.isna(max_date) else max_date
+    touched = set()
+    unmatched = {}
+    read_rows = 0
+
+    path = raw_path + "transactions_data.csv"
+    header, offset, resumed = raw_start(path, watermark)
+    with open(path, "rb") as f:
+        f.seek(offset)
+        names = pd.read_csv(io.BytesIO(header)).columns
+        reader = read_csv_schema(f, TRANSACTIONS_SCHEMA, chunksize=chunksize, names=names, header=None)
+        for i, chunk in enumerate(reader):
+            read_rows += len(chunk)
+            chunk = rows_after_watermark(rename_transactions(chunk), watermark)
+            if chunk.empty:
+                continue
+            chunk = clean_transaction_chunk(chunk)
+            chunk = enrich_transactions(chunk, index, unmatched)
+            # Invoice numbers continue from the rows already in the lake
+            chunk = generate_synthetic_fields(chunk, start=n_rows + new_rows + 1)
+            touched.update(write_partitions(chunk, lake_path, f"{run_id}-{i:05d}", mode=mode))
+            new_rows += len(chunk)
+
+            # Latest (date, transaction id) seen so far, and largest undated transaction id
+            dates = chunk["transaction_date"]
+            if dates.notna().any():
+                last = chunk[dates == dates.max()]["transaction_id"].max()
+                if max_date is None or dates.max() > max_date or (dates.max() == max_date and last > max_id):
+                    max_date, max_id = dates.max(), last
+            if dates.isna().any():
+                undated_id = chunk.loc[dates.isna(), "transaction_id"].max()
+                max_undated_id = undated_id if max_undated_id is None else max(max_undated_id, undated_id)
+
+        raw_offset = f.tell()
+
+    # Rows dropped by the watermark filter: all late when reading from raw_offset, a full read also drops the
+    # rows already in the lake
+    late_rows = read_rows - new_rows if resumed else max(read_rows - new_rows - n_rows, 0)
+
+    if new_rows or (watermark is not None and raw_offset != watermark["raw_offset"]):
+        _write_json(os.path.join(lake_path, WATERMARK_FILE), {
+            "transaction_date": max_date.isoformat() if max_date is not None else None,
+            "transaction_id": int(max_id) if max_id is not None else None,
+            "undated_transaction_id": int(max_undated_id) if max_undated_id is not None else None,
+            "rows": n_rows + new_rows,
+            "raw_offset": raw_offset,
+            "run_id": run_id,
+            "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        })
+    os.remove(os.path.join(lake_path, PENDING_FILE))
+
+    if log:
+        log_pipeline_step("lake_incremental", new_rows)
+        log_pipeline_step("lake_partitions", len(touched))
+        log_pipeline_step("lake_late_rows", late_rows)
+    return {"rows": new_rows, "late_rows": late_rows, "partitions": sorted(touched), "unmatched": unmatched,
+            "watermark": read_watermark(lake_path)}
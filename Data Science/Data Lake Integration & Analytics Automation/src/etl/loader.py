@@ -0,0 +1,217 @@
+import pandas as pd
+import numpy as np
+import os
+import time
+import sqlite3
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+# Staging loader: a DataFrame (or an iterator of chunks, e.g. from stream reads or the lake) is bulk-loaded into
+# a staging table through a backend, chunk by chunk, optionally with parallel workers (one connection each)
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+IF_EXISTS = ("fail", "replace", "append") # As DataFrame.to_sql
+
+def _prepare(df):
+    # Values the database drivers accept: dates as text, booleans as 0/1, categoricals as plain values
+    df = df.copy()
+    for col in df.columns:
+        dtype = df[col].dtype
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            df[col] = df[col].dt.strftime(DATE_FORMAT)
+        elif pd.api.types.is_bool_dtype(dtype):
+            df[col] = df[col].astype("Int8")
+        elif isinstance(dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(object)
+    return df
+
+def _rows(df):
+    # Plain Python tuples with None for missing values (prepared statement parameters)
+    # (built column by column: tolist() gives native Python values, only the missing positions are patched)
+    columns = []
+    for _, values in _prepare(df).items():
+        column = values.tolist()
+        for i in np.flatnonzero(values.isna().to_numpy()):
+            column[i] = None
+        columns.append(column)
+    return list(zip(*columns))
+
+def _sql_type(dtype, types):
+    # SQL type of a column from its pandas dtype
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return types["int"]
+    if pd.api.types.is_float_dtype(dtype):
+        return types["float"]
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return types["datetime"]
+    return types["text"]
+
+class SQLiteBackend:
+    # Local stand-in for the staging database (local runs and tests), loaded with prepared-statement executemany.
+    # SQLite has a single writer, so chunks are loaded sequentially.
+    parallel = False
+    types = {"int": "INTEGER", "float": "REAL", "datetime": "TEXT", "text": "TEXT"}
+
+    def __init__(self, path="data/processed/staging.db"):
+        self.path = path
+
+    def connect(self):
+        conn = sqlite3.connect(self.path)
+        # Staging data can be reloaded: trade durability for load speed
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA journal_mode=MEMORY")
+        return conn
+
+    def quote(self, name):
+        return '"' + name.replace('"', '""') + '"'
+
+    def create_table(self, conn, table, df, if_exists="replace"):
+        exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()
+        if exists and if_exists == "fail":
+            raise ValueError(f"Table '{table}' already exists")
+        if if_exists == "replace":
+            conn.execute(f"DROP TABLE IF EXISTS {self.quote(table)}")
+        columns = ", ".join(f"{self.quote(col)} {_sql_type(df[col].dtype, self.types)}" for col in df.columns)
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {self.quote(table)} ({columns})")
+        conn.commit()
+
+    def load_chunk(self, conn, table, df):
+        placeholders = ", ".join("?" for _ in df.columns)
+        columns = ", ".join(self.quote(col) for col in df.columns)
+        conn.executemany(f"INSERT INTO {self.quote(table)} ({columns}) VALUES ({placeholders})", _rows(df))
+        conn.commit()
+
+class MySQLBackend:
+    # MySQL staging database (pymysql imported on first use)
+    # - method="load_data": each chunk is staged as a CSV file and bulk-loaded with LOAD DATA LOCAL INFILE
+    #   (requires local_infile enabled on the server)
+    # - method="executemany": prepared INSERT statements, batched by the driver
+    parallel = True
+    types = {"int": "BIGINT", "float": "DOUBLE", "datetime": "DATETIME", "text": "TEXT"}
+
+    def __init__(self, host="localhost", user="root", password="", database="data_lake_project", port=3306,
+                 method="load_data"):
+        self.params = {"host": host, "user": user, "password": password, "database": database, "port": port}
+        self.method = method
+
+    def connect(self):
+        import pymysql
+
+        return pymysql.connect(**self.params, local_infile=self.method == "load_data", autocommit=False)
+
+    def quote(self, name):
+        return "`" + name.replace("`", "``") + "`"
+
+    def create_table(self, conn, table, df, if_exists="replace"):
+        columns = ", ".join(f"{self.quote(col)} {_sql_type(df[col].dtype, self.types)}" for col in df.columns)
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s",
+                           (table,))
+            if cursor.fetchone() and if_exists == "fail":
+                raise ValueError(f"Table '{table}' already exists")
+            if if_exists == "replace":
+                cursor.execute(f"DROP TABLE IF EXISTS {self.quote(table)}")
+            cursor.execute(f"CREATE TABLE IF NOT EXISTS {self.quote(table)} ({columns})")
+        conn.commit()
+
+    def load_chunk(self, conn, table, df):
+        columns = ", ".join(self.quote(col) for col in df.columns)
+        with conn.cursor() as cursor:
+            if self.method == "executemany":
+                placeholders = ", ".join("%s" for _ in df.columns)
+                cursor.executemany(f"INSERT INTO {self.quote(table)} ({columns}) VALUES ({placeholders})", _rows(df))
+            else:
+                # Stage the chunk as CSV (\N = NULL), then one LOAD DATA statement
+                fd, path = tempfile.mkstemp(suffix=".csv")
+                os.close(fd)
+                try:
+                    _prepare(df).to_csv(path, index=False, header=False, na_rep="\\N", lineterminator="\n")
+                    cursor.execute(
+                        f"LOAD DATA LOCAL INFILE %s INTO TABLE {self.quote(table)} "
+                        "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' "
+                        f"LINES TERMINATED BY '\\n' ({columns})",
+                        (path,)
+                    )
+                finally:
+                    os.remove(path)
+        conn.commit()
+
+def _chunks(data, chunksize):
+    # A DataFrame is split into chunks, an iterator of DataFrames is used as is
+    if isinstance(data, pd.DataFrame):
+        for start in range(0, len(data), chunksize):
+            yield data.iloc[start:start+chunksize]
+    else:
+        yield from data
+
+def load_table(data, backend, table="stg_ap_gl_transactions", if_exists="replace", chunksize=100_000, n_workers=4, log=True):
+    # Load data into table, report rows loaded, seconds and rows per second
+    # (lake partitions hold money in cents: pass them through money_to_dollars first, like the CSV output)
+    # if_exists: "fail" (error if the table exists), "replace" (drop and recreate) or "append"
+    from .logging_utils import log_pipeline_step
+
+    if if_exists not in IF_EXISTS:
+        raise ValueError(f"if_exists must be one of {IF_EXISTS}, got '{if_exists}'")
+
+    start = time.perf_counter()
+    chunks = _chunks(data, chunksize)
+    first = next(chunks, None)
+    if first is None:
+        # An empty DataFrame still creates (or with replace, empties) the table, an empty iterator has no columns
+        if not isinstance(data, pd.DataFrame):
+            raise ValueError(f"No chunks to load into {table}: its columns are unknown")
+        first = data
+
+    # Table from the first chunk's columns and dtypes
+    conn = backend.connect()
+    try:
+        backend.create_table(conn, table, first, if_exists)
+    finally:
+        conn.close()
+
+    def all_chunks():
+        if len(first):
+            yield first
+        yield from chunks
+
+    rows = 0
+    if n_workers <= 1 or not backend.parallel:
+        conn = backend.connect()
+        try:
+            for chunk in all_chunks():
+                backend.load_chunk(conn, table, chunk)
+                rows += len(chunk)
+        finally:
+            conn.close()
+    else:
+        # One connection per worker thread, at most 2 chunks per worker in flight (bounded memory)
+        local = threading.local()
+        connections = []
+        lock = threading.Lock()
+
+        def load(chunk):
+            if not hasattr(local, "conn"):
+                local.conn = backend.connect()
+                with lock:
+                    connections.append(local.conn)
+            backend.load_chunk(local.conn, table, chunk)
+            return len(chunk)
+
+        try:
+            with ThreadPoolExecutor(max_workers=n_workers) as pool:
+                pending = set()
+                for chunk in all_chunks():
+                    if len(pending) >= 2 * n_workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        rows += sum(f.result() for f in done)
+                    pending.add(pool.submit(load, chunk))
+                rows += sum(f.result() for f in pending)
+        finally:
+            for conn in connections:
+                conn.close()
+
+    seconds = time.perf_counter() - start
+    stats = {"rows": rows, "seconds": seconds, "rows_per_second": rows / seconds if seconds > 0 else 0.0}
+    if log:
+        log_pipeline_step(f"load_{table}", rows)
+    return stats
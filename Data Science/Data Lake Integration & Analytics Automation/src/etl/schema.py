@@ -0,0 +1,119 @@
+import pandas as pd
+import numpy as np
+
+# Declared schemas of the raw files, applied at read time:
+# - dtypes: downcast integers/floats, categoricals (a list fixes the categories, so every chunk shares them),
+#   plain strings for free text. Integers are read as int64 and downcast with a range check
+#   (read_csv would wrap out-of-range values silently, e.g. card_id 999999 -> 16959 in int16)
+# - dates: fixed formats (no per-row format inference)
+# - money: "$1,234.56" text parsed into int64 cents
+TRANSACTIONS_SCHEMA = {
+    "dtypes": {
+        "id": "int32",
+        "client_id": "int16",
+        "card_id": "int16",
+        "use_chip": ["Chip Transaction", "Online Transaction", "Swipe Transaction"],
+        "merchant_id": "int32",
+        "merchant_city": "category",
+        "merchant_state": "category",
+        "zip": "float32",
+        "mcc": "int16",
+        "errors": "category"
+    },
+    "dates": {"date": "%Y-%m-%d %H:%M:%S"},
+    "money": ["amount"]
+}
+
+CARDS_SCHEMA = {
+    "dtypes": {
+        "id": "int16",
+        "client_id": "int16",
+        "card_brand": ["Amex", "Discover", "Mastercard", "Visa"],
+        "card_type": ["Credit", "Debit", "Debit (Prepaid)"],
+        "card_number": "int64",
+        "expires": "category",
+        "cvv": "int16",
+        "has_chip": ["NO", "YES"],
+        "num_cards_issued": "int8",
+        "year_pin_last_changed": "int16",
+        "card_on_dark_web": ["No", "Yes"]
+    },
+    "dates": {"acct_open_date": "%m/%Y"},
+    "money": ["credit_limit"]
+}
+
+USERS_SCHEMA = {
+    "dtypes": {
+        "id": "int16",
+        "current_age": "int8",
+        "retirement_age": "int8",
+        "birth_year": "int16",
+        "birth_month": "int8",
+        "gender": ["Female", "Male"],
+        "address": "str",
+        "latitude": "float32",
+        "longitude": "float32",
+        "credit_score": "int16",
+        "num_credit_cards": "int8"
+    },
+    "dates": {},
+    "money": ["per_capita_income", "yearly_income", "total_debt"]
+}
+
+# Money columns of all tables (after the transactions rename, amount keeps its name)
+MONEY_COLUMNS = TRANSACTIONS_SCHEMA["money"] + CARDS_SCHEMA["money"] + USERS_SCHEMA["money"]
+
+NARROW_INTEGERS = ("int8", "int16", "int32", "uint8", "uint16", "uint32")
+
+def read_dtypes(schema):
+    # dtype argument of pd.read_csv: dates and money are read as text and parsed afterwards,
+    # narrow integers are read wide (downcast by apply_schema)
+    dtypes = {}
+    for col, dtype in schema["dtypes"].items():
+        if isinstance(dtype, list):
+            dtypes[col] = pd.CategoricalDtype(dtype)
+        else:
+            dtypes[col] = "int64" if dtype in NARROW_INTEGERS else dtype
+    for col in list(schema["dates"]) + schema["money"]:
+        dtypes[col] = "str"
+    return dtypes
+
+def parse_money(values: pd.Series):
+    # "$-77.00" / "$24,295" -> -7700 / 2429500 cents (int64, nullable Int64 if some values are missing)
+    text = values.str.replace("$", "", regex=False).str.replace(",", "", regex=False)
+    cents = (pd.to_numeric(text, errors="coerce") * 100).round()
+    return cents.astype("Int64" if cents.isna().any() else "int64")
+
+def downcast(values: pd.Series, dtype):
+    # Integer column to a narrower integer type, raising if a value does not fit
+    info = np.iinfo(dtype)
+    if len(values) and (values.min() < info.min or values.max() > info.max):
+        raise ValueError(f"Column '{values.name}' has values outside the {dtype} range [{info.min}, {info.max}]")
+    return values.astype(dtype)
+
+def apply_schema(df, schema):
+    # Downcast the integer columns, parse the date and money columns of a frame read with read_dtypes(schema)
+    for col, dtype in schema["dtypes"].items():
+        if col in df and not isinstance(dtype, list) and dtype in NARROW_INTEGERS:
+            df[col] = downcast(df[col], dtype)
+    for col, fmt in schema["dates"].items():
+        if col in df:
+            df[col] = pd.to_datetime(df[col], format=fmt, errors="coerce")
+    for col in schema["money"]:
+        if col in df:
+            df[col] = parse_money(df[col])
+    return df
+
+def read_csv_schema(path, schema, chunksize=None, **kwargs):
+    # Read a raw CSV with its schema (a DataFrame, or an iterator of DataFrames if chunksize is given)
+    reader = pd.read_csv(path, dtype=read_dtypes(schema), chunksize=chunksize, **kwargs)
+    if chunksize is None:
+        return apply_schema(reader, schema)
+    return (apply_schema(chunk, schema) for chunk in reader)
+
+def money_to_dollars(df, columns=MONEY_COLUMNS):
+    # int64 cents back to float dollars (e.g. before writing files read by tools expecting dollars)
+    for col in columns:
+        if col in df:
+            df[col] = df[col].astype(float) / 100
+    return df
@@ -0,0 +1 @@
+# Makes the main package importable when running pytest from this directory
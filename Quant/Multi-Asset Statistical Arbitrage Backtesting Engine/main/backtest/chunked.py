@@ -0,0 +1,241 @@
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+
+@dataclass
+class ChunkedResult:
+    """
+    Output of run_chunked. Only per-bar portfolio series and per-pair totals are kept,
+    so memory does not grow with (time x pairs).
+    """
+    pair_names: list
+    portfolio_returns: pd.Series
+    equity: pd.Series
+    pair_pnl: np.ndarray # Sum of net returns of each pair
+    pair_costs: np.ndarray # Sum of execution costs of each pair
+    turnover: np.ndarray # Sum of absolute position changes of each pair
+    periods_per_year: float
+    halted_at: pd.Timestamp = None # First bar of the drawdown stop (None: never breached)
+
+    def summary(self):
+        """
+        Performance report of the portfolio returns, annualized with the bar frequency of the data.
+        """
+        from ..risk.performance import performance_report
+        return performance_report(self.portfolio_returns, periods_per_year=self.periods_per_year)
+
+def _leg_returns(prices: np.ndarray):
+    # Simple returns, the first row has no return
+    returns = np.zeros_like(prices)
+    np.divide(prices[1:], prices[:-1], out=returns[1:])
+    returns[1:] -= 1
+    return returns
+
+def run_chunked(store,
+                dataset: str,
+                pairs: list,
+                chunk_size: int=100_000,
+                hedge_window: int=60,
+                zscore_window: int=None,
+                entry_threshold=2.0,
+                exit_threshold=0.5,
+                max_hold=None,
+                min_gap=1,
+                target_vol: float=0.02,
+                scaling: np.ndarray=None,
+                execution_model=None,
+                risk_manager=None,
+                max_leverage: float=None,
+                capital: float=1_000_000,
+                start=None,
+                end=None,
+                dtype=np.float64,
+                profiler=None):
+    """
+    Out-of-core backtest: stream blocks of bars from a PriceStore through spreads, signals, sizing, risk limits,
+    execution costs and PnL, carrying the state of every stage from one block to the next.
+
+    Intraday histories (e.g. years of 1-minute bars for hundreds of pairs) do not fit in memory as (time x pairs)
+    arrays; here only one block (plus a short overlap with the previous one) is held at a time.
+    The rolling spread, signals, z-score stop, costs and drawdown stop give the same bars as one pass over the
+    whole history (up to floating point), the volatility scaling is the only difference (see scaling).
+
+    Steps (per block):
+    1) Read the legs of every pair for the block, prepended with the last rows of the previous block,
+       enough to fill the rolling hedge ratio, z-score and slippage windows
+    2) Rolling spreads and z-scores on the extended block, keeping the rows of the block
+    3) Signals, continuing open positions and holding periods from the previous block
+    4) Volatility targeting with the spread return volatility of all previous bars (the first block uses its own)
+    5) Per-pair z-score stop (continuing stopped trades) and leverage cap
+    6) Execution costs and net pair returns (the first bar of the block trades against the previous block's positions)
+    7) Drawdown stop, continuing equity and peak; once breached, all later bars are flat
+
+    Inputs:
+    - store: PriceStore holding the dataset
+    - dataset: Dataset name in the store
+    - pairs: List of (stock 1, stock 2) or (stock 1, stock 2, p-value) tuples
+    - chunk_size: Number of bars per block
+    - hedge_window: Rolling window for hedge ratios (in bars)
+    - zscore_window: Rolling window for z-scores (defaults to hedge_window)
+    - entry_threshold, exit_threshold, max_hold, min_gap: Signal parameters (see generate_signals_matrix)
+    - target_vol: Desired per-bar volatility of each pair before the leverage cap
+    - scaling: Optional fixed position scaling per pair (e.g. fitted on an earlier period), replacing step 4
+    - execution_model: ExecutionModel (None: default costs)
+    - risk_manager: RiskManager (None: default limits)
+    - max_leverage: Gross exposure limit, counting both legs of every pair (None: the risk manager's)
+    - capital: Capital behind the positions
+    - start, end: Inclusive date bounds of the backtest (None: whole dataset)
+    - dtype: Float type of the streamed prices and per-block arrays (np.float32 halves memory;
+             rolling regressions still accumulate in float64)
+    - profiler: Optional Profiler the stages report to
+
+    Outputs:
+    - result (ChunkedResult): Portfolio returns/equity and per-pair totals
+    """
+    from ..research.spread import construct_rolling_spread
+    from ..signals.signal_generator import generate_signals_matrix
+    from ..execution.execution_model import ExecutionModel
+    from ..risk.risk_manager import RiskManager
+    from ..utils.frequency import periods_per_year
+    from ..utils.profiling import Profiler
+
+    execution_model = execution_model if execution_model is not None else ExecutionModel()
+    risk_manager = risk_manager if risk_manager is not None else RiskManager()
+    profiler = profiler if profiler is not None else Profiler(enabled=False)
+    if zscore_window is None:
+        zscore_window = hedge_window
+    if max_leverage is None:
+        max_leverage = risk_manager.max_leverage
+
+    # Both legs of every pair are read as one ticker list: legs 1 then legs 2
+    n_pairs = len(pairs)
+    tickers = [pair[0] for pair in pairs] + [pair[1] for pair in pairs]
+    pair_names = [f"{pair[0]}_{pair[1]}" for pair in pairs]
+
+    # Rows of the previous block needed to fill every rolling window
+    overlap = max(hedge_window + zscore_window, execution_model.slippage_window, execution_model.impact_window) + 1
+
+    # State carried across blocks
+    signal_state = {}
+    risk_state = {}
+    tail_prices = np.empty((0, 2 * n_pairs), dtype=dtype)
+    tail_positions = np.empty((0, n_pairs), dtype=dtype)
+    vol_n = 0
+    vol_sum = np.zeros(n_pairs)
+    vol_sumsq = np.zeros(n_pairs)
+    equity, peak = 1.0, 1.0
+    halted_at = None
+
+    pair_pnl = np.zeros(n_pairs)
+    pair_costs = np.zeros(n_pairs)
+    turnover = np.zeros(n_pairs)
+    returns_blocks, index_blocks = [], []
+
+    with profiler.span("chunked_backtest", n_pairs=n_pairs, chunk_size=chunk_size):
+        chunks = store.iter_chunks(dataset, tickers, chunk_size, start, end, dtype=dtype)
+        for block, index in chunks:
+            n, m = len(block), len(tail_prices)
+            profiler.count("bars", n)
+            profiler.count("pair_bars", n * n_pairs)
+
+            if halted_at is not None:
+                # Drawdown stop already hit: flat until the end
+                returns_blocks.append(np.zeros(n, dtype=dtype))
+                index_blocks.append(index)
+                continue
+
+            # 1) Block extended with the overlap
+            prices = np.vstack([tail_prices, block])
+            S1, S2 = prices[:, :n_pairs], prices[:, n_pairs:]
+
+            # 2) Rolling spreads and z-scores, rows of the block only
+            with profiler.span("spreads"):
+                _, zscores, _ = construct_rolling_spread(S1.astype(float), S2.astype(float),
+                                                         window=hedge_window, zscore_window=zscore_window)
+                zscores = zscores[m:]
+
+            # 3) Signals
+            with profiler.span("signals"):
+                signals = generate_signals_matrix(zscores, entry_threshold, exit_threshold, max_hold, min_gap,
+                                                  state=signal_state)
+
+            # 4) Volatility targeting
+            with profiler.span("sizing"):
+                spread_returns = (_leg_returns(S1) - _leg_returns(S2))[m:]
+                # The very first bar of the backtest has no return
+                new_returns = spread_returns if m else spread_returns[1:]
+                if scaling is not None:
+                    pair_scaling = np.asarray(scaling, dtype=float)
+                else:
+                    block_sum = new_returns.sum(axis=0, dtype=float)
+                    block_sumsq = np.square(new_returns, dtype=float).sum(axis=0)
+                    if vol_n == 0:
+                        # First block: fit on itself, as the in-memory engine does on the whole sample
+                        vol = new_returns.std(axis=0, ddof=1, dtype=float)
+                    else:
+                        vol = np.sqrt(np.maximum(vol_sumsq - vol_sum**2 / vol_n, 0) / max(vol_n - 1, 1))
+                    pair_scaling = np.where(vol > 0, target_vol / np.where(vol > 0, vol, 1), 1.0)
+
+                    # This block enters the estimate from the next block onward
+                    vol_n += len(new_returns)
+                    vol_sum += block_sum
+                    vol_sumsq += block_sumsq
+                positions = (signals * pair_scaling).astype(dtype)
+
+            # 5) Per-pair z-score stop and leverage cap
+            with profiler.span("risk_limits"):
+                positions = risk_manager.apply_limits(positions, zscores, max_leverage=max_leverage,
+                                                      state=risk_state, legs=2).astype(dtype)
+
+            # 6) Costs and net returns over the extended block (the overlap rows are dropped)
+            def block_returns(positions):
+                with profiler.span("execution"):
+                    held = np.vstack([tail_positions, positions])
+                    legs = execution_model.apply_batch(np.hstack([held, -held]), prices,
+                                                       notional=True, capital=capital)
+                    costs = (legs.total[:, :n_pairs] + legs.total[:, n_pairs:])[m:]
+                    trades = np.abs(legs.trades[m:, :n_pairs])
+                    pair_returns = -costs
+                    # Previous bar's positions times this bar's spread returns (no position before the first bar)
+                    previous = held[m-1:-1] if m else np.vstack([np.zeros((1, n_pairs), dtype=dtype), positions[:-1]])
+                    pair_returns += previous * spread_returns
+                    return pair_returns, costs, trades
+
+            pair_returns, costs, trades = block_returns(positions)
+
+            # 7) Drawdown stop, continuing equity and peak
+            with profiler.span("drawdown_stop"):
+                portfolio_returns = pair_returns.sum(axis=1)
+                breach = risk_manager.drawdown_breach(portfolio_returns, initial_equity=equity, initial_peak=peak)
+            if breach < n:
+                positions[breach:] = 0
+                pair_returns, costs, trades = block_returns(positions)
+                portfolio_returns = pair_returns.sum(axis=1)
+                halted_at = index[breach]
+            path = equity * np.cumprod(1 + portfolio_returns.astype(float))
+            if n:
+                equity, peak = float(path[-1]), max(peak, float(path.max()))
+
+            # Totals and per-bar portfolio returns
+            pair_pnl += pair_returns.sum(axis=0, dtype=float)
+            pair_costs += costs.sum(axis=0, dtype=float)
+            turnover += trades.sum(axis=0, dtype=float)
+            returns_blocks.append(portfolio_returns.astype(dtype))
+            index_blocks.append(index)
+
+            # Overlap for the next block
+            tail_prices = prices[-overlap:]
+            tail_positions = np.vstack([tail_positions, positions])[-overlap:]
+
+    index = index_blocks[0].append(index_blocks[1:]) if index_blocks else pd.DatetimeIndex([])
+    portfolio_returns = pd.Series(np.concatenate(returns_blocks) if returns_blocks else [], index=index, dtype=dtype)
+    return ChunkedResult(
+        pair_names=pair_names,
+        portfolio_returns=portfolio_returns,
+        equity=(1 + portfolio_returns.astype(float)).cumprod(),
+        pair_pnl=pair_pnl,
+        pair_costs=pair_costs,
+        turnover=turnover,
+        periods_per_year=periods_per_year(store.index(dataset) if start is None and end is None else index),
+        halted_at=halted_at
+    )
@@ -1,24 +1,207 @@
-class BacktestEngine:
-    """
-    Event-driven backtesting engine.
-    Coordinates data, signals, portfolio, execution and risk.
-    """
-    
-    def __init__(self,
-                 data_handler,
-                 signal_generator,
-                 portfolio,
-                 execution_model,
-                 risk_manager):
-        self.data_handler = data_handler
-        self.signal_generator = signal_generator
-        self.portfolio = portfolio
-        self.execution_model = execution_model
-        self.risk_manager = risk_manager
-        
-    def run(self):
-        """
-        Main backtest loop.
-        """
-        raise NotImplementedError("Backtest loop implemented in later phase.")
-        
\ No newline at end of file
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+
+@dataclass
+class BacktestResult:
+    """
+    Output of BacktestEngine.run. Every matrix is (time x pairs), one column per pair.
+    """
+    index: pd.Index
+    pair_names: list
+    zscores: np.ndarray
+    signals: np.ndarray
+    positions: np.ndarray
+    costs: np.ndarray
+    pair_returns: np.ndarray
+    portfolio_returns: pd.Series
+    equity: pd.Series
+
+    def to_frame(self, field: str="pair_returns"):
+        """
+        Return one of the (time x pairs) matrices as a labelled DataFrame.
+        """
+        return pd.DataFrame(getattr(self, field), index=self.index, columns=self.pair_names)
+
+class BacktestEngine:
+    """
+    Event-driven backtesting engine.
+    Coordinates data, signals, portfolio, execution and risk.
+
+    All pairs are simulated together: prices, spreads, signals, positions, costs and returns
+    are kept in preallocated (time x pairs) NumPy arrays, so memory grows linearly with the number of pairs.
+
+    Components:
+    - data_handler: Aligned price DataFrame, or a callable returning one (e.g. align_assets)
+    - signal_generator: Callable mapping a (time x pairs) z-score array to signals (-1, 0, 1) of the same shape.
+                        If None, generate_signals_matrix with its default thresholds is used.
+    - portfolio: PortfolioManager (its max_leverage caps gross exposure, counting both legs of every pair)
+    - execution_model: ExecutionModel (transaction cost, bid-ask spread, slippage and market impact)
+    - risk_manager: RiskManager (max drawdown stop, leverage cap and per-pair z-score stop)
+    - profiler: Optional Profiler (utils/profiling.py) the stages report their time and counts to
+    """
+
+    def __init__(self,
+                 data_handler,
+                 signal_generator,
+                 portfolio,
+                 execution_model,
+                 risk_manager,
+                 profiler=None):
+        from ..utils.profiling import Profiler
+
+        self.data_handler = data_handler
+        self.signal_generator = signal_generator
+        self.portfolio = portfolio
+        self.execution_model = execution_model
+        self.risk_manager = risk_manager
+        self.profiler = profiler if profiler is not None else Profiler(enabled=False)
+
+    def run(self, pairs: list, target_vol: float=0.02, hedge_window: int=None,
+            volumes: pd.DataFrame=None, capital: float=1_000_000, fit_until: int=None,
+            rebalance_frequency="daily", drift_band: float=None):
+        """
+        Main backtest loop.
+
+        Steps:
+        1) Load aligned prices and gather both legs of every pair into (time x pairs) arrays
+        2) Construct spreads and z-scores for all pairs
+        3) Generate signals for all pairs in one call
+        4) Size dollar-neutral positions (long S1 / short S2) by volatility targeting, as fractions of capital
+        5) Hold positions between rebalancing dates, then apply the per-pair z-score stop and cap gross exposure
+           (both legs: 2 x sum of |position|) at the portfolio/risk leverage limit on the held positions
+        6) Charge execution costs on position changes and compute pair and portfolio returns
+        7) Apply the drawdown stop (flatten all positions from the breach onward)
+
+        Inputs:
+        - pairs: List of (stock 1, stock 2) or (stock 1, stock 2, p-value) tuples, e.g. from find_cointegrated_pairs
+        - target_vol: Desired daily volatility of each pair before the leverage cap
+        - hedge_window: Rolling window for hedge ratios and z-scores (None: full-sample fit, as construct_spread)
+        - volumes: Optional traded volumes aligned with the prices, enabling the market impact cost
+        - capital: Capital behind the positions, used to express trades in shares for market impact
+        - fit_until: Number of leading rows used only for fitting (hedge ratios, z-score moments, volatility scaling).
+                     No positions are taken before it, so the rows after it are out of sample (None: fit and trade on all rows)
+        - rebalance_frequency: When positions may change, e.g. ExecutionConfig.rebalance_frequency (see rebalance_schedule)
+        - drift_band: Only rebalance positions that drifted more than this relative tolerance (see rebalance_positions)
+
+        Outputs:
+        - result (BacktestResult): Per-pair arrays and portfolio returns/equity
+        """
+        from ..research.spread import construct_spreads, construct_rolling_spread
+        from ..signals.signal_generator import generate_signals_matrix
+        from ..portfolio.portfolio_manager import PortfolioManager
+        from ..execution.execution_model import ExecutionModel
+        from ..risk.risk_manager import RiskManager
+        from ..execution.rebalance import rebalance_positions
+
+        portfolio = self.portfolio if self.portfolio is not None else PortfolioManager()
+        execution_model = self.execution_model if self.execution_model is not None else ExecutionModel()
+        risk_manager = self.risk_manager if self.risk_manager is not None else RiskManager()
+
+        profiler = self.profiler
+        with profiler.span("backtest", n_pairs=len(pairs)):
+            # 1) Aligned prices (no missing values expected, see data/align.py)
+            with profiler.span("data"):
+                prices = self.data_handler() if callable(self.data_handler) else self.data_handler
+                values = prices.to_numpy(dtype=float)
+                column = {name: i for i, name in enumerate(prices.columns)}
+                leg1 = np.array([column[pair[0]] for pair in pairs])
+                leg2 = np.array([column[pair[1]] for pair in pairs])
+                pair_names = [f"{pair[0]}_{pair[1]}" for pair in pairs]
+
+                S1 = values[:, leg1]
+                S2 = values[:, leg2]
+                del values
+                if volumes is not None:
+                    volumes = volumes.reindex(index=prices.index, columns=prices.columns).to_numpy(dtype=float)
+                    volumes = np.hstack([volumes[:, leg1], volumes[:, leg2]])
+            profiler.count("bars", len(prices))
+            profiler.count("pairs", len(pairs))
+            profiler.count("pair_bars", len(prices) * len(pairs))
+
+            # 2) Spreads and z-scores (z-scores are NaN, hence flat, during a rolling warm-up)
+            with profiler.span("spreads"):
+                if hedge_window is None:
+                    _, zscores, _ = construct_spreads(S1, S2, fit_rows=fit_until)
+                else:
+                    _, zscores, _ = construct_rolling_spread(S1, S2, window=hedge_window)
+
+            # 3) Signals
+            with profiler.span("signals"):
+                signal_generator = self.signal_generator if self.signal_generator is not None else generate_signals_matrix
+                signals = np.asarray(signal_generator(zscores))
+                if fit_until is not None:
+                    # Fitting window only, no trading
+                    signals = signals.copy()
+                    signals[:fit_until] = 0
+
+            with profiler.span("sizing"):
+                # Leg returns (first bar has no return)
+                ret1 = np.zeros_like(S1)
+                ret2 = np.zeros_like(S2)
+                np.divide(S1[1:], S1[:-1], out=ret1[1:])
+                np.divide(S2[1:], S2[:-1], out=ret2[1:])
+                ret1[1:] -= 1
+                ret2[1:] -= 1
+                spread_returns = ret1 - ret2
+
+                # 4) Volatility targeting (avoid division by 0, as in volatility_targeting)
+                vol = spread_returns[1:fit_until].std(axis=0, ddof=1)
+                scaling = np.where(vol > 0, target_vol / np.where(vol > 0, vol, 1), 1.0)
+                positions = signals * scaling
+
+            # 5) Rebalancing schedule and drift band (daily without a band leaves positions unchanged)
+            if rebalance_frequency != "daily" or drift_band is not None:
+                with profiler.span("rebalance"):
+                    positions = rebalance_positions(positions, rebalance_frequency, drift_band, index=prices.index)
+
+            # Per-pair z-score stop and leverage cap on gross exposure (each pair holds two legs), on the positions
+            # actually held: held positions stay within the cap and are stopped on the bar of the breach
+            with profiler.span("risk_limits"):
+                max_leverage = min(portfolio.max_leverage, risk_manager.max_leverage)
+                positions = risk_manager.apply_limits(positions, zscores, max_leverage=max_leverage, legs=2)
+
+            # 6) Execution costs of both legs in one batched call, in units of capital
+            leg_prices = np.hstack([S1, S2])
+            del S1, S2, ret1, ret2
+            def pair_costs(positions):
+                with profiler.span("execution"):
+                    legs = execution_model.apply_batch(np.hstack([positions, -positions]), leg_prices,
+                                                       volumes=volumes, notional=True, capital=capital)
+                    n_pairs = positions.shape[1]
+                    return legs.total[:, :n_pairs] + legs.total[:, n_pairs:]
+
+            costs = pair_costs(positions)
+            pair_returns = self._pair_returns(positions, spread_returns, costs)
+
+            # 7) Drawdown stop: flatten everything from the first breach onward
+            with profiler.span("drawdown_stop"):
+                portfolio_returns = pair_returns.sum(axis=1)
+                breach = risk_manager.drawdown_breach(portfolio_returns)
+            if breach < len(portfolio_returns):
+                positions[breach:] = 0
+                costs = pair_costs(positions)
+                pair_returns = self._pair_returns(positions, spread_returns, costs)
+                portfolio_returns = pair_returns.sum(axis=1)
+            equity = np.cumprod(1 + portfolio_returns)
+
+        return BacktestResult(
+            index=prices.index,
+            pair_names=pair_names,
+            zscores=zscores,
+            signals=signals,
+            positions=positions,
+            costs=costs,
+            pair_returns=pair_returns,
+            portfolio_returns=pd.Series(portfolio_returns, index=prices.index),
+            equity=pd.Series(equity, index=prices.index)
+        )
+
+    @staticmethod
+    def _pair_returns(positions: np.ndarray, spread_returns: np.ndarray, costs: np.ndarray):
+        """
+        Net pair returns: yesterday's position times today's spread return, minus today's trading costs.
+        """
+        pair_returns = -costs
+        pair_returns[1:] += positions[:-1] * spread_returns[1:]
+        return pair_returns
\ No newline at end of file
@@ -0,0 +1,196 @@
+import gc
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from .synthetic import synthetic_market
+
+DEFAULT_SIZES = [(20, 500), (50, 1000), (100, 2520)]
+
+def _bench_find_cointegrated_pairs(prices, planted):
+    from ..research.pair_selection import find_cointegrated_pairs
+    n = prices.shape[1]
+    return (lambda: find_cointegrated_pairs(prices)), n * (n - 1) // 2, "pairs tested"
+
+def _bench_construct_spread(prices, planted):
+    from ..research.spread import construct_spread
+    legs = [(prices[s1], prices[s2]) for s1, s2 in zip(planted.stock1, planted.stock2)]
+    return (lambda: [construct_spread(S1, S2) for S1, S2 in legs]), len(legs) * len(prices), "pair-bars"
+
+def _bench_generate_signals(prices, planted):
+    from ..research.spread import construct_spread
+    from ..signals.signal_generator import generate_signals
+    zscores = [construct_spread(prices[s1], prices[s2])[1] for s1, s2 in zip(planted.stock1, planted.stock2)]
+    return (lambda: [generate_signals(z, max_hold=20) for z in zscores]), len(zscores) * len(prices), "pair-bars"
+
+def _bench_parameter_sweep(prices, planted):
+    from ..research.spread import construct_spread
+    from ..validation.sensitivity import parameter_sweep
+    zscores = pd.DataFrame({f"{s1}_{s2}": construct_spread(prices[s1], prices[s2])[1]
+                            for s1, s2 in zip(planted.stock1, planted.stock2)})
+    legs = pd.DataFrame({f"{s1}_{s2}": prices[s1] for s1, s2 in zip(planted.stock1, planted.stock2)})
+    entries, exits, max_holds = [1.5, 2.0, 2.5], [0.0, 0.5], [None, 10, 20]
+    n_combos = zscores.shape[1] * len(entries) * len(exits) * len(max_holds)
+    return (lambda: parameter_sweep(zscores, entries, exits, max_holds, legs)), n_combos * len(prices), "combination-bars"
+
+def _bench_execution_apply(prices, planted):
+    from ..execution.execution_model import ExecutionModel
+    model = ExecutionModel()
+    rng = np.random.default_rng(0)
+    positions = pd.DataFrame(rng.integers(-1, 2, size=prices.shape) * 100.0, index=prices.index, columns=prices.columns)
+    return (lambda: [model.apply(positions[c], prices[c]) for c in prices.columns]), prices.size, "asset-bars"
+
+def _bench_execution_apply_batch(prices, planted):
+    from ..execution.execution_model import ExecutionModel
+    model = ExecutionModel()
+    rng = np.random.default_rng(0)
+    positions = rng.integers(-1, 2, size=prices.shape) * 100.0
+    volumes = rng.uniform(1e5, 1e6, size=prices.shape)
+    values = prices.to_numpy()
+    return (lambda: model.apply_batch(positions, values, volumes)), prices.size, "asset-bars"
+
+def _bench_portfolio_aggregate(prices, planted):
+    from ..portfolio.portfolio_manager import PortfolioManager
+    rng = np.random.default_rng(0)
+    # One position column per asset pair slot (n_assets / 2 pairs)
+    positions = pd.DataFrame(rng.normal(0, 0.2, size=(len(prices), prices.shape[1] // 2)), index=prices.index)
+    positions.columns = [f"pair{i}" for i in range(positions.shape[1])]
+
+    def run():
+        portfolio = PortfolioManager()
+        portfolio.add_pairs(positions)
+        return portfolio.aggregate()
+    return run, positions.size, "pair-bars"
+
+BENCHMARKS = {
+    'find_cointegrated_pairs': _bench_find_cointegrated_pairs,
+    'construct_spread': _bench_construct_spread,
+    'generate_signals': _bench_generate_signals,
+    'parameter_sweep': _bench_parameter_sweep,
+    'ExecutionModel.apply': _bench_execution_apply,
+    'ExecutionModel.apply_batch': _bench_execution_apply_batch,
+    'PortfolioManager.aggregate': _bench_portfolio_aggregate
+}
+
+def time_call(func, repeat: int=3):
+    """
+    Time a function call.
+
+    Inputs:
+    - func: Function without arguments
+    - repeat: Number of timed runs (the fastest is kept, to limit noise)
+
+    Outputs:
+    - seconds (float): Best wall-clock time
+    - peak_memory_mb (float): Peak memory allocated by Python/NumPy during one extra (traced) run
+    """
+    seconds = np.inf
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        seconds = min(seconds, time.perf_counter() - start)
+
+    # Memory is traced in a separate run, tracing slows the code down
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 1e6
+
+def run_benchmarks(sizes: list=None, benchmarks: list=None, n_pairs: int=None, repeat: int=3, output=None, seed: int=0):
+    """
+    Run the benchmark suite over a grid of market sizes.
+
+    Inputs:
+    - sizes: List of (n_assets, n_obs) market sizes (None: DEFAULT_SIZES)
+    - benchmarks: Names of the benchmarks to run (None: all, see BENCHMARKS)
+    - n_pairs: Planted pairs per market (None: n_assets // 4)
+    - repeat: Timed runs per benchmark
+    - output: Optional JSON file the results are written to
+    - seed: Seed of the synthetic markets
+
+    Outputs:
+    - results (pd.DataFrame): One row per (benchmark, size), columns benchmark, n_assets, n_obs, n_pairs,
+                              seconds, peak_memory_mb, throughput, units (throughput is units per second)
+    """
+    sizes = sizes if sizes is not None else DEFAULT_SIZES
+    benchmarks = benchmarks if benchmarks is not None else list(BENCHMARKS)
+
+    rows = []
+    for n_assets, n_obs in sizes:
+        planted_pairs = n_pairs if n_pairs is not None else max(n_assets // 4, 1)
+        prices, planted = synthetic_market(n_assets, n_obs, planted_pairs, seed=seed)
+        for name in benchmarks:
+            func, n_units, units = BENCHMARKS[name](prices, planted)
+            seconds, peak_memory = time_call(func, repeat)
+            rows.append({
+                'benchmark': name,
+                'n_assets': n_assets,
+                'n_obs': n_obs,
+                'n_pairs': len(planted),
+                'seconds': seconds,
+                'peak_memory_mb': peak_memory,
+                'throughput': n_units / seconds if seconds > 0 else np.inf,
+                'units': units
+            })
+    results = pd.DataFrame(rows)
+
+    if output is not None:
+        report = {
+            'metadata': {
+                'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'pandas': pd.__version__,
+                'machine': platform.machine(),
+                'processor': platform.processor(),
+                'repeat': repeat,
+                'seed': seed
+            },
+            'results': results.to_dict(orient="records")
+        }
+        Path(output).write_text(json.dumps(report, indent=2))
+    return results
+
+def compare_results(baseline, current, tolerance: float=0.2):
+    """
+    Compare two benchmark result files and flag regressions.
+
+    Inputs:
+    - baseline: JSON file written by run_benchmarks for the reference version
+    - current: JSON file written by run_benchmarks for the version under test
+    - tolerance: Allowed relative slowdown before a benchmark counts as a regression (0.2 = 20%)
+
+    Outputs:
+    - comparison (pd.DataFrame): Benchmarks present in both files with their times, the ratio current / baseline
+                                 and a regression flag
+    """
+    keys = ['benchmark', 'n_assets', 'n_obs']
+    old = pd.DataFrame(json.loads(Path(baseline).read_text())['results'])
+    new = pd.DataFrame(json.loads(Path(current).read_text())['results'])
+    comparison = old[keys + ['seconds', 'peak_memory_mb']].merge(new[keys + ['seconds', 'peak_memory_mb']],
+                                                                 on=keys, suffixes=('_baseline', '_current'))
+    comparison['ratio'] = comparison['seconds_current'] / comparison['seconds_baseline']
+    comparison['regression'] = comparison['ratio'] > 1 + tolerance
+    return comparison
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the backtesting engine benchmarks on synthetic markets.")
+    parser.add_argument("--sizes", nargs="+", default=None, help="Market sizes as ASSETSxBARS, e.g. 50x1000 200x2520")
+    parser.add_argument("--benchmarks", nargs="+", default=None, choices=list(BENCHMARKS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", default=None, help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    sizes = [tuple(int(v) for v in size.lower().split("x")) for size in args.sizes] if args.sizes else None
+    results = run_benchmarks(sizes, args.benchmarks, repeat=args.repeat, output=args.output)
+    print(results.to_string(index=False))
+    if args.baseline:
+        print(compare_results(args.baseline, args.output).to_string(index=False))
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+def synthetic_market(n_assets: int=50,
+                     n_obs: int=1000,
+                     n_pairs: int=10,
+                     half_life=(5, 60),
+                     daily_vol: float=0.015,
+                     seed=None):
+    """
+    Generate a synthetic market with planted cointegrated pairs of known half-life.
+
+    Steps:
+    1) Every asset starts as an independent geometric random walk (not cointegrated with anything)
+    2) For each planted pair (stock 1, stock 2), stock 1 is rebuilt as alpha + beta * stock 2 + an AR(1)
+       (discrete Ornstein-Uhlenbeck) spread whose coefficient phi = 0.5 ** (1 / half_life)
+
+    Inputs:
+    - n_assets: Number of assets (columns)
+    - n_obs: Number of daily bars
+    - n_pairs: Number of planted pairs (at most n_assets // 2, every asset is in at most one pair)
+    - half_life: Half-life of the planted spreads, a (low, high) range drawn uniformly or one value for all pairs
+    - daily_vol: Daily return volatility of the random walks
+    - seed: Seed for reproducible markets
+
+    Outputs:
+    - prices (pd.DataFrame): (dates x tickers) prices
+    - planted (pd.DataFrame): One row per planted pair, columns stock1, stock2, beta, half_life
+    """
+    rng = np.random.default_rng(seed)
+    n_pairs = min(n_pairs, n_assets // 2)
+    tickers = [f"A{i:04d}" for i in range(n_assets)]
+    index = pd.bdate_range("2015-01-01", periods=n_obs)
+
+    # 1) Independent random walks in log-price
+    log_returns = rng.normal(0, daily_vol, size=(n_obs, n_assets))
+    prices = 100 * np.exp(np.cumsum(log_returns, axis=0))
+
+    # 2) Planted pairs on random, disjoint assets
+    chosen = rng.permutation(n_assets)[:2 * n_pairs]
+    leg1, leg2 = chosen[:n_pairs], chosen[n_pairs:]
+    if np.ndim(half_life) == 0:
+        half_lives = np.full(n_pairs, float(half_life))
+    else:
+        half_lives = rng.uniform(half_life[0], half_life[1], size=n_pairs)
+    phi = 0.5 ** (1 / half_lives)
+    beta = rng.uniform(0.5, 2.0, size=n_pairs)
+
+    # AR(1) spreads with a stationary standard deviation of 2 (in price units)
+    shocks = rng.normal(0, 1, size=(n_obs, n_pairs)) * np.sqrt(1 - phi**2)
+    spread = np.empty((n_obs, n_pairs))
+    spread[0] = rng.normal(0, 1, size=n_pairs)
+    for t in range(1, n_obs):
+        spread[t] = phi * spread[t-1] + shocks[t]
+    spread *= 2.0
+
+    alpha = rng.uniform(10, 50, size=n_pairs)
+    prices[:, leg1] = alpha + beta * prices[:, leg2] + spread
+
+    planted = pd.DataFrame({
+        'stock1': [tickers[i] for i in leg1],
+        'stock2': [tickers[i] for i in leg2],
+        'beta': beta,
+        'half_life': half_lives
+    })
+    return pd.DataFrame(prices, index=index, columns=tickers), planted
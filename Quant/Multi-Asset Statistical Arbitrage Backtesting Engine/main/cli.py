@@ -0,0 +1,206 @@
+import sys
+import argparse
+
+# Heavy dependencies (NumPy, pandas, statsmodels, yfinance) are imported inside the commands,
+# so parsing arguments and printing help do not pay for them
+
+def _load_prices(args):
+    """
+    Prices from a CSV file (--prices) or from a PriceStore dataset (--dataset in --store-dir).
+    """
+    import pandas as pd
+
+    if args.prices is not None:
+        return pd.read_csv(args.prices, index_col=0, parse_dates=True)
+    return _store(args).read(args.dataset)
+
+def _store(args):
+    from .data.store import PriceStore
+    from .config.settings import PathConfig
+
+    return PriceStore(args.store_dir if args.store_dir is not None else PathConfig().store_dir)
+
+def _load_pairs(path, max_pairs=None):
+    """
+    (stock 1, stock 2) tuples from a CSV file with stock1 and stock2 columns (as written by select-pairs).
+    """
+    import pandas as pd
+
+    pairs = pd.read_csv(path)
+    pairs = list(zip(pairs['stock1'], pairs['stock2']))
+    return pairs[:max_pairs] if max_pairs else pairs
+
+def _write(frame, path, index=True):
+    # Write a result table as CSV, creating the folder if needed
+    from pathlib import Path
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    frame.to_csv(path, index=index)
+    print(f"Wrote {path}")
+
+def cmd_fetch(args):
+    """
+    Download prices: only the missing date ranges into the store, or the full range as CSV (--csv).
+    """
+    from .data.fetch import fetch_yahoo, fetch_incremental
+
+    if args.csv:
+        df = fetch_yahoo(args.tickers, start=args.start, end=args.end)
+    else:
+        df = fetch_incremental(args.tickers, _store(args), start=args.start, end=args.end, dataset=args.dataset)
+    print(f"{df.shape[1]} tickers, {len(df)} bars ({df.index.min()} to {df.index.max()})")
+
+def cmd_clean(args):
+    """
+    Clean raw prices, from the store (default) or from the raw CSV folder (--csv).
+    """
+    from .data.clean import clean_prices
+
+    df = clean_prices(args.file, store=None if args.csv else _store(args))
+    print(f"Cleaned {df.shape[1]} tickers, {len(df)} bars")
+
+def cmd_select_pairs(args):
+    """
+    Find cointegrated pairs (optionally after a correlation prefilter) and write them as CSV.
+    """
+    import pandas as pd
+    from .research.pair_selection import correlation_prefilter, find_cointegrated_pairs
+
+    prices = _load_prices(args).dropna(axis=1)
+    candidates = correlation_prefilter(prices, window=args.window, k=args.prefilter_k) if args.prefilter_k else None
+    pairs, _ = find_cointegrated_pairs(prices, significance=args.significance, candidates=candidates, n_jobs=args.n_jobs)
+
+    pairs = pd.DataFrame(pairs, columns=['stock1', 'stock2', 'p_value']).sort_values('p_value', kind="stable")
+    print(f"{len(pairs)} cointegrated pairs at {args.significance:.0%}")
+    _write(pairs, args.output, index=False)
+
+def cmd_backtest(args):
+    """
+    Backtest the selected pairs and report performance.
+    With --chunk-size, the dataset is streamed from the store block by block (out-of-core).
+    """
+    from .config.settings import BacktestConfig, ExecutionConfig, RiskConfig
+    from .risk.risk_manager import RiskManager
+    from .risk.performance import performance_report
+
+    pairs = _load_pairs(args.pairs, args.max_pairs)
+    risk_manager = RiskManager.from_config(RiskConfig())
+    capital = BacktestConfig().initial_capital
+
+    if args.chunk_size:
+        from .backtest.chunked import run_chunked
+
+        result = run_chunked(_store(args), args.dataset, pairs, chunk_size=args.chunk_size,
+                             hedge_window=args.hedge_window or 60, target_vol=args.target_vol,
+                             risk_manager=risk_manager, capital=capital)
+        returns = result.portfolio_returns
+        report = result.summary()
+    else:
+        from .backtest.engine import BacktestEngine
+
+        engine = BacktestEngine(_load_prices(args), None, None, None, risk_manager)
+        result = engine.run(pairs, target_vol=args.target_vol, hedge_window=args.hedge_window, capital=capital,
+                            rebalance_frequency=args.rebalance or ExecutionConfig().rebalance_frequency)
+        returns = result.portfolio_returns
+        report = performance_report(returns)
+
+    print(report.T.to_string(header=False))
+    if args.output:
+        _write(returns.rename("portfolio_return").to_frame(), args.output)
+
+def cmd_sweep(args):
+    """
+    Grid search of the signal parameters on the selected pairs, written as CSV.
+    """
+    import numpy as np
+    import pandas as pd
+    from .research.spread import construct_spreads
+    from .validation.sensitivity import parameter_sweep
+
+    prices = _load_prices(args)
+    pairs = _load_pairs(args.pairs, args.max_pairs)
+    S1 = prices[[p[0] for p in pairs]].to_numpy(dtype=float)
+    S2 = prices[[p[1] for p in pairs]].to_numpy(dtype=float)
+    _, zscores, _ = construct_spreads(S1, S2)
+    names = [f"{p[0]}_{p[1]}" for p in pairs]
+
+    # Volatility targeting and PnL on the pair's spread returns, given as a synthetic price path
+    spread_returns = np.zeros_like(S1)
+    spread_returns[1:] = S1[1:] / S1[:-1] - S2[1:] / S2[:-1]
+    spread_prices = pd.DataFrame(np.cumprod(1 + spread_returns, axis=0), index=prices.index, columns=names)
+
+    # A max hold of 0 means no limit
+    max_holds = [None if m == 0 else m for m in args.max_hold]
+    results = parameter_sweep(pd.DataFrame(zscores, index=prices.index, columns=names),
+                              args.entry, args.exit, max_holds, spread_prices,
+                              target_vol=args.target_vol, n_jobs=args.n_jobs)
+    best = results.groupby(['entry', 'exit', 'max_hold'], dropna=False)['sharpe'].mean().sort_values(ascending=False)
+    print(best.head(10).to_string())
+    _write(results, args.output, index=False)
+
+def build_parser():
+    """
+    Command line interface: fetch, clean, select-pairs, backtest and sweep.
+    """
+    parser = argparse.ArgumentParser(prog="python -m main", description="Multi-asset statistical arbitrage backtesting engine.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    # Options shared by the commands reading or writing the price store
+    storage = argparse.ArgumentParser(add_help=False)
+    storage.add_argument("--store-dir", default=None, help="PriceStore folder (default: PathConfig().store_dir)")
+
+    # Price source of the research commands
+    source = argparse.ArgumentParser(add_help=False, parents=[storage])
+    source.add_argument("--prices", default=None, help="Prices CSV (dates x tickers), instead of a store dataset")
+    source.add_argument("--dataset", default="yahoo_prices_cleaned", help="Store dataset to read")
+
+    fetch = commands.add_parser("fetch", parents=[storage], help="Download prices")
+    fetch.add_argument("tickers", nargs="+")
+    fetch.add_argument("--start", default="2017-01-01")
+    fetch.add_argument("--end", default=None)
+    fetch.add_argument("--dataset", default="yahoo_prices")
+    fetch.add_argument("--csv", action="store_true", help="Write a CSV to the raw folder instead of the store")
+    fetch.set_defaults(func=cmd_fetch)
+
+    clean = commands.add_parser("clean", parents=[storage], help="Clean raw prices")
+    clean.add_argument("--file", default="yahoo_prices.csv")
+    clean.add_argument("--csv", action="store_true", help="Read and write CSV folders instead of the store")
+    clean.set_defaults(func=cmd_clean)
+
+    select = commands.add_parser("select-pairs", parents=[source], help="Find cointegrated pairs")
+    select.add_argument("--significance", type=float, default=0.05)
+    select.add_argument("--prefilter-k", type=int, default=None, help="Test only the k most correlated pairs")
+    select.add_argument("--window", type=int, default=60, help="Correlation window of the prefilter")
+    select.add_argument("--n-jobs", type=int, default=1)
+    select.add_argument("--output", default="pairs.csv")
+    select.set_defaults(func=cmd_select_pairs)
+
+    backtest = commands.add_parser("backtest", parents=[source], help="Backtest selected pairs")
+    backtest.add_argument("--pairs", default="pairs.csv", help="Pairs CSV written by select-pairs")
+    backtest.add_argument("--max-pairs", type=int, default=None)
+    backtest.add_argument("--target-vol", type=float, default=0.02)
+    backtest.add_argument("--hedge-window", type=int, default=None, help="Rolling hedge window (default: full-sample fit)")
+    backtest.add_argument("--rebalance", default=None, help="Rebalance frequency (default: ExecutionConfig)")
+    backtest.add_argument("--chunk-size", type=int, default=None, help="Stream the store dataset in blocks of this many bars")
+    backtest.add_argument("--output", default=None, help="Portfolio returns CSV")
+    backtest.set_defaults(func=cmd_backtest)
+
+    sweep = commands.add_parser("sweep", parents=[source], help="Signal parameter grid search")
+    sweep.add_argument("--pairs", default="pairs.csv", help="Pairs CSV written by select-pairs")
+    sweep.add_argument("--max-pairs", type=int, default=None)
+    sweep.add_argument("--entry", type=float, nargs="+", default=[1.5, 2.0, 2.5])
+    sweep.add_argument("--exit", type=float, nargs="+", default=[0.0, 0.5])
+    sweep.add_argument("--max-hold", type=int, nargs="+", default=[0, 10, 20], help="0: no limit")
+    sweep.add_argument("--target-vol", type=float, default=0.02)
+    sweep.add_argument("--n-jobs", type=int, default=1)
+    sweep.add_argument("--output", default="sweep.csv")
+    sweep.set_defaults(func=cmd_sweep)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
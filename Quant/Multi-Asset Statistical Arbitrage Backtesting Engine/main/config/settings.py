@@ -1,21 +1,66 @@
-from dataclasses import dataclass
-
-@dataclass
-class BacktestConfig:
-    start_date: str = "2017-01-01"
-    end_date: str = "2026-01-01"
-    initial_capital: float = 1_000_000
-    base_currency: str = "USD"
-    
-@dataclass
-class ExecutionConfig:
-    comission_per_trade: float = 1.0
-    bid_ask_spread_bps: float = 1.5
-    slippage_vol_multiplier: float = 0.1
-    rebalance_frequency: str = "daily"
-    
-@dataclass
-class RiskConfig:
-    max_leverage: float = 3.0
-    max_drawdown: float = 0.25
-    pair_stop_zscore: float = 4.0
\ No newline at end of file
+import os
+from pathlib import Path
+from dataclasses import dataclass, field
+
+PACKAGE_DIR = Path(__file__).resolve().parents[1] # .../main
+
+def _env_path(variable: str, default: Path):
+    # Path from an environment variable, or the default
+    value = os.environ.get(variable)
+    return Path(value).expanduser() if value else default
+
+@dataclass
+class BacktestConfig:
+    start_date: str = "2017-01-01"
+    end_date: str = "2026-01-01"
+    initial_capital: float = 1_000_000
+    base_currency: str = "USD"
+    
+@dataclass
+class ExecutionConfig:
+    comission_per_trade: float = 1.0
+    bid_ask_spread_bps: float = 1.5
+    slippage_vol_multiplier: float = 0.1
+    rebalance_frequency: str = "daily"
+    
+@dataclass
+class RiskConfig:
+    max_leverage: float = 3.0
+    max_drawdown: float = 0.25
+    pair_stop_zscore: float = 4.0
+
+@dataclass
+class PathConfig:
+    """
+    Locations of the data, price store, caches and logs.
+
+    Defaults live next to the package (main/data/...), and can be moved without code changes through
+    environment variables: STAT_ARB_DATA_DIR (raw/, cleaned/, store/ and cache/ below it) and STAT_ARB_LOG_DIR.
+    Nothing is created until ensure() is called (or a file is written there).
+    """
+    data_dir: Path = field(default_factory=lambda: _env_path("STAT_ARB_DATA_DIR", PACKAGE_DIR / "data"))
+    log_dir: Path = field(default_factory=lambda: _env_path("STAT_ARB_LOG_DIR", Path("logs")))
+
+    @property
+    def raw_dir(self):
+        return Path(self.data_dir) / "raw"
+
+    @property
+    def cleaned_dir(self):
+        return Path(self.data_dir) / "cleaned"
+
+    @property
+    def store_dir(self):
+        return Path(self.data_dir) / "store"
+
+    @property
+    def cache_dir(self):
+        return Path(self.data_dir) / "cache"
+
+    def ensure(self):
+        """
+        Create all directories (if missing) and return self.
+        """
+        for folder in (self.raw_dir, self.cleaned_dir, self.store_dir, self.cache_dir, Path(self.log_dir)):
+            folder.mkdir(parents=True, exist_ok=True)
+        return self
\ No newline at end of file
@@ -1,19 +1,28 @@
-import pandas as pd
-from pathlib import Path
-
-CLEAN_DATA_DIR = Path(r"PATH\Multi_Asset_Stat_Arb_Backtesting_Engine\main\data\cleaned") # Change path accordingly
-
-def align_assets(price_files=None):
-    # If no price files exists, "yahoo_prices_cleaned.csv" will be read
-    if price_files is None:
-        price_files = ['yahoo_prices_cleaned.csv']
-    
-    # Read multiple price files
-    dfs = [pd.read_csv(CLEAN_DATA_DIR/i, index_col=0, parse_dates=True) for i in price_files]
-    
-    # Outer join to ensure all dates are present
-    df_aligned = pd.concat(dfs, axis=1, join="outer").ffill().bfill()
-    
-    # Save aligned dataframe
-    df_aligned.to_csv(CLEAN_DATA_DIR / "aligned_prices.csv")
+import pandas as pd
+from pathlib import Path
+from ..config.settings import PathConfig
+
+def align_assets(price_files=None, store=None, paths: PathConfig=None):
+    # Cleaned CSV folder (see PathConfig, configurable through environment variables)
+    paths = paths if paths is not None else PathConfig()
+
+    # If no price files exists, "yahoo_prices_cleaned.csv" will be read
+    if price_files is None:
+        price_files = ['yahoo_prices_cleaned.csv']
+    
+    # Read multiple price files (or the PriceStore datasets named after them)
+    if store is not None:
+        dfs = [store.read(Path(i).stem) for i in price_files]
+    else:
+        dfs = [pd.read_csv(paths.cleaned_dir / i, index_col=0, parse_dates=True) for i in price_files]
+    
+    # Outer join to ensure all dates are present
+    df_aligned = pd.concat(dfs, axis=1, join="outer").ffill().bfill()
+    
+    # Save aligned dataframe
+    if store is not None:
+        store.write("aligned_prices", df_aligned)
+    else:
+        paths.cleaned_dir.mkdir(parents=True, exist_ok=True)
+        df_aligned.to_csv(paths.cleaned_dir / "aligned_prices.csv")
     return df_aligned
\ No newline at end of file
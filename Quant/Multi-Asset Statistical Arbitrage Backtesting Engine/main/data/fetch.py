@@ -1,13 +1,95 @@
-import yfinance as yf
-from pathlib import Path
-
-RAW_DATA_DIR = Path(r"PATH\Multi_Asset_Stat_Arb_Backtesting_Engine\main\data\raw") # Change path accordingly
-RAW_DATA_DIR.mkdir(exist_ok=True)
-
-def fetch_yahoo(tickers, start="2017-01-01", end="2026-01-01"):
-    """
-    Download adjusted close prices and cache locally
-    """
-    df = yf.download(tickers, start=start, end=end, auto_adjust=True)["Close"]
-    df.to_csv(RAW_DATA_DIR / "yahoo_prices.csv")
-    return df
\ No newline at end of file
+import pandas as pd
+from ..config.settings import PathConfig
+
+def fetch_yahoo(tickers, start="2017-01-01", end="2026-01-01", store=None, paths: PathConfig=None):
+    """
+    Download adjusted close prices and cache locally
+    (in the "yahoo_prices" dataset of a PriceStore if one is given, else as CSV in the raw folder of paths)
+    """
+    import yfinance as yf
+
+    df = yf.download(tickers, start=start, end=end, auto_adjust=True)["Close"]
+    if store is not None:
+        store.write("yahoo_prices", df)
+    else:
+        paths = paths if paths is not None else PathConfig()
+        paths.raw_dir.mkdir(parents=True, exist_ok=True)
+        df.to_csv(paths.raw_dir / "yahoo_prices.csv")
+    return df
+
+def fetch_incremental(tickers, store, provider=None, start="2017-01-01", end=None, dataset="yahoo_prices"):
+    """
+    Bring a PriceStore dataset up to date, downloading only what it does not cover yet.
+
+    The dataset keeps per-ticker coverage metadata (first and last dates the provider actually returned). For each ticker
+    only the missing ranges before and after its coverage are requested (from the last covered date on, so that bar
+    is downloaded again), new tickers get the full range, and tickers sharing the same missing range are downloaded
+    together. New prices are merged into the stored dataset. A failed or empty download leaves its range uncovered,
+    so it is requested again on the next call.
+
+    Inputs:
+    - tickers: Tickers to bring up to date
+    - store: PriceStore holding the local cache of record
+    - provider: PriceProvider to download from (default: YahooProvider)
+    - start: First date required
+    - end: End date required, exclusive (default: today)
+    - dataset: Dataset name in the store
+
+    Outputs:
+    - df (pd.DataFrame): Prices of the requested tickers over [start, end)
+    """
+    if provider is None:
+        from .providers import YahooProvider
+        provider = YahooProvider()
+
+    start = pd.Timestamp(start)
+    end = pd.Timestamp.today().normalize() if end is None else pd.Timestamp(end)
+
+    existing = store.read(dataset) if store.exists(dataset) else None
+    coverage = store.meta(dataset)["metadata"].get("coverage", {}) if existing is not None else {}
+
+    # Missing date ranges per ticker, grouped so each distinct range is one download
+    requests = {}
+    for ticker in tickers:
+        if ticker not in coverage:
+            missing = [(start, end)]
+        else:
+            covered_start, covered_end = map(pd.Timestamp, coverage[ticker])
+            missing = []
+            if start < covered_start:
+                missing.append((start, covered_start))
+            if end > covered_end:
+                missing.append((covered_end, end))
+        for date_range in missing:
+            requests.setdefault(date_range, []).append(ticker)
+
+    downloads = {date_range: provider.download(group, *date_range) for date_range, group in requests.items()}
+
+    if requests:
+        # Merge downloads into the stored prices (new values take precedence on overlapping dates)
+        merged = existing
+        for df in downloads.values():
+            if len(df):
+                merged = df if merged is None else df.combine_first(merged)
+        if merged is None:
+            merged = pd.DataFrame(index=pd.DatetimeIndex([]))
+
+        # Extend coverage of every requested ticker over the dates its download returned
+        for date_range, group in requests.items():
+            df = downloads[date_range]
+            for ticker in group:
+                dates = df[ticker].dropna().index if ticker in df.columns else []
+                if not len(dates):
+                    continue
+                covered = [pd.Timestamp(d) for d in coverage.get(ticker, [dates[0], dates[-1]])]
+                coverage[ticker] = [min(covered[0], dates[0]).isoformat(), max(covered[1], dates[-1]).isoformat()]
+
+        store.write(dataset, merged, metadata={"coverage": coverage})
+        existing = merged
+
+    if existing is None:
+        # Nothing stored and nothing requested (e.g. no tickers)
+        return pd.DataFrame(index=pd.DatetimeIndex([]))
+
+    rows = (existing.index >= start) & (existing.index < end)
+    return existing.loc[rows, [t for t in tickers if t in existing.columns]]
\ No newline at end of file
@@ -0,0 +1,47 @@
+import pandas as pd
+
+class PriceProvider:
+    """
+    Interface for price sources used by the incremental fetcher.
+
+    A provider returns adjusted close prices for a set of tickers over [start, end)
+    as a DataFrame indexed by date with one column per ticker.
+    """
+    def download(self, tickers: list, start, end):
+        raise NotImplementedError
+
+class YahooProvider(PriceProvider):
+    """
+    Adjusted close prices from Yahoo Finance (yfinance is imported on first use).
+    """
+    def __init__(self, auto_adjust: bool=True):
+        self.auto_adjust = auto_adjust
+
+    def download(self, tickers: list, start, end):
+        import yfinance as yf
+
+        df = yf.download(list(tickers), start=start, end=end, auto_adjust=self.auto_adjust, progress=False)["Close"]
+        if isinstance(df, pd.Series):
+            df = df.to_frame(tickers[0])
+        return df
+
+class CSVProvider(PriceProvider):
+    """
+    Local file-backed stand-in for a remote provider (e.g. for tests or offline runs).
+
+    Serves slices of a price CSV (dates x tickers) and records every request,
+    so callers can check exactly which ranges would have been downloaded.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.requests = []
+        self._prices = None
+
+    def download(self, tickers: list, start, end):
+        if self._prices is None:
+            self._prices = pd.read_csv(self.path, index_col=0, parse_dates=True)
+        self.requests.append((list(tickers), pd.Timestamp(start), pd.Timestamp(end)))
+
+        columns = [t for t in tickers if t in self._prices.columns]
+        rows = (self._prices.index >= pd.Timestamp(start)) & (self._prices.index < pd.Timestamp(end))
+        return self._prices.loc[rows, columns]
\ No newline at end of file
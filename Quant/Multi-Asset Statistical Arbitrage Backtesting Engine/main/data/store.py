@@ -0,0 +1,158 @@
+import json
+import shutil
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+class PriceStore:
+    """
+    Columnar price store backed by memory-mapped .npy files.
+
+    Each dataset (e.g. "yahoo_prices", "yahoo_prices_cleaned", "aligned_prices") is a folder holding:
+    - values.npy: (tickers x dates) price matrix, one contiguous row per ticker
+    - index.npy: Sorted datetime64 date index
+    - meta.json: Ticker names, dtype and any extra metadata (e.g. fetch coverage)
+
+    Reads memory-map the files, so only the requested tickers and dates are paged in from disk.
+    A contiguous block of tickers over a date range is returned without copying.
+    """
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def datasets(self):
+        """
+        List the datasets available in the store.
+        """
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if (p / "meta.json").exists())
+
+    def exists(self, name: str):
+        return (self.root / name / "meta.json").exists()
+
+    def write(self, name: str, prices: pd.DataFrame, dtype: str="float64", metadata: dict=None):
+        """
+        Write (or overwrite) a dataset.
+
+        Inputs:
+        - name: Dataset name
+        - prices: DataFrame indexed by date with one column per ticker
+        - dtype: Storage dtype ("float64" or "float32")
+        - metadata: Extra JSON-serializable metadata stored with the dataset
+        """
+        prices = prices.sort_index()
+        index = pd.DatetimeIndex(prices.index).as_unit("ns").to_numpy()
+        values = np.ascontiguousarray(prices.to_numpy(dtype=dtype).T)
+
+        # Write into a temporary folder first so readers never see a half-written dataset
+        target = self.root / name
+        tmp = self.root / f".{name}.tmp"
+        if tmp.exists():
+            shutil.rmtree(tmp)
+        tmp.mkdir(parents=True)
+        np.save(tmp / "values.npy", values)
+        np.save(tmp / "index.npy", index)
+        meta = {"tickers": [str(c) for c in prices.columns], "dtype": str(values.dtype), "metadata": metadata or {}}
+        (tmp / "meta.json").write_text(json.dumps(meta))
+
+        if target.exists():
+            shutil.rmtree(target)
+        tmp.rename(target)
+
+    def meta(self, name: str):
+        """
+        Return the stored metadata of a dataset.
+        """
+        return json.loads((self.root / name / "meta.json").read_text())
+
+    def update_metadata(self, name: str, metadata: dict):
+        """
+        Replace the extra metadata of a dataset without rewriting its prices.
+        """
+        meta = self.meta(name)
+        meta["metadata"] = metadata
+        (self.root / name / "meta.json").write_text(json.dumps(meta))
+
+    def tickers(self, name: str):
+        return self.meta(name)["tickers"]
+
+    def index(self, name: str):
+        return pd.DatetimeIndex(np.load(self.root / name / "index.npy", mmap_mode="r"))
+
+    def read_array(self, name: str, tickers: list=None, start=None, end=None):
+        """
+        Read a ticker subset over a date range as a NumPy array.
+
+        Inputs:
+        - name: Dataset name
+        - tickers: Tickers to read (None: all)
+        - start, end: Inclusive date bounds (None: open)
+
+        Outputs:
+        - values (np.ndarray): (dates x tickers) prices, a read-only view of the memory map
+                               when the tickers are contiguous in the store
+        - index (pd.DatetimeIndex): Dates of the rows
+        - tickers (list): Tickers of the columns
+        """
+        folder = self.root / name
+        all_tickers = self.tickers(name)
+        dates = np.load(folder / "index.npy", mmap_mode="r")
+        values = np.load(folder / "values.npy", mmap_mode="r")
+
+        # Date range by binary search on the sorted index
+        lo = 0 if start is None else int(np.searchsorted(dates, pd.Timestamp(start).as_unit("ns").to_datetime64(), side="left"))
+        hi = len(dates) if end is None else int(np.searchsorted(dates, pd.Timestamp(end).as_unit("ns").to_datetime64(), side="right"))
+
+        if tickers is None:
+            rows = slice(None)
+            tickers = all_tickers
+        else:
+            position = {t: i for i, t in enumerate(all_tickers)}
+            missing = [t for t in tickers if t not in position]
+            if missing:
+                raise KeyError(f"Tickers not in dataset '{name}': {missing}")
+            rows = np.array([position[t] for t in tickers], dtype=int)
+            # Contiguous ascending tickers can be sliced (zero-copy), others are gathered
+            if len(rows) and np.array_equal(rows, np.arange(rows[0], rows[0] + len(rows))):
+                rows = slice(int(rows[0]), int(rows[0]) + len(rows))
+            tickers = list(tickers)
+
+        block = values[rows, lo:hi]
+        return block.T, pd.DatetimeIndex(dates[lo:hi]), tickers
+
+    def read(self, name: str, tickers: list=None, start=None, end=None):
+        """
+        Read a ticker subset over a date range as a DataFrame (same arguments as read_array).
+        """
+        values, index, tickers = self.read_array(name, tickers, start, end)
+        return pd.DataFrame(values, index=index, columns=tickers, copy=False)
+
+    def iter_chunks(self, name: str, tickers: list=None, chunk_size: int=100_000, start=None, end=None, dtype=None):
+        """
+        Stream a dataset in consecutive blocks of dates, so series longer than memory can be processed.
+
+        Inputs:
+        - name: Dataset name
+        - tickers: Tickers to read (None: all)
+        - chunk_size: Number of dates per block
+        - start, end: Inclusive date bounds (None: open)
+        - dtype: Optional dtype of the returned blocks (e.g. "float32")
+
+        Outputs (yielded per block):
+        - values (np.ndarray): (dates x tickers) prices of the block
+        - index (pd.DatetimeIndex): Dates of the block
+        """
+        # Zero-copy view of the whole date range, tickers are gathered block by block
+        values, index, all_tickers = self.read_array(name, None, start, end)
+        columns = slice(None)
+        if tickers is not None:
+            position = {t: i for i, t in enumerate(all_tickers)}
+            missing = [t for t in tickers if t not in position]
+            if missing:
+                raise KeyError(f"Tickers not in dataset '{name}': {missing}")
+            columns = np.array([position[t] for t in tickers], dtype=int)
+
+        for lo in range(0, len(index), chunk_size):
+            # Only this block is paged in from the memory map
+            block = np.asarray(values[lo:lo+chunk_size][:, columns], dtype=dtype)
+            yield block, index[lo:lo+chunk_size]
\ No newline at end of file
@@ -1,55 +1,174 @@
-import pandas as pd
-import numpy as np
-
-class ExecutionModel:
-    """
-    Models realistic market frictions (impact) in a trading strategy:
-    1) Transaction Costs (Commissions per unit traded)
-    2) Bid-Ask Spread Impact
-    3) Slippage
-
-    This allows the backtest to more closely approximate real-world performance.
-    """
-    def __init__(self, transaction_cost=0.0005, bid_ask_spread=0.0002, slippage_vol_factor=0.1):
-        """
-        Initialize execution model parameters.
-
-        Inputs:
-        - transaction_cost: cost per unit traded (0.05% of trade in this case)
-        - bid_ask_spread: half_spread appread per trade
-        - slippage_vol_factor: fraction of recent volatility applied as additional slippage
-        """
-        self.transaction_cost = transaction_cost
-        self.bid_ask_spread = bid_ask_spread
-        self.slippage_vol_factor = slippage_vol_factor
-
-    def apply(self, positions: pd.Series, prices: pd.Series):
-        """
-        Apply execution frictions to positions and return effective prices.
-
-        Inputs:
-        - positions: Desired positions over time
-        - prices: Market prices
-
-        Outputs:
-        - adjusted_prices (pd.Series): Prices adjusted for realistic trading costs
-        """
-        # Compute trades (i.e. no. of position changes)
-        trades = positions.diff().fillna(positions.iloc[0])
-
-        # Transaction cost
-        transc_cost = np.abs(trades) * self.transaction_cost
-
-        # Bid-ask spread impact
-        ba_spread_impact = np.sign(trades) * self.bid_ask_spread * prices
-
-        # Slippage (Rolling 5-day standard deviation as proxy for short-term volatility)
-        vol = prices.pct_change().rolling(5).std().fillna(0)
-        slippage = np.sign(trades) * vol * self.slippage_vol_factor * prices
-
-        # Total friction (impact)
-        total_impact = transc_cost + ba_spread_impact + slippage
-
-        # Adjusted price, reflecting realistic execution
-        adjusted_prices = prices + total_impact
-        return adjusted_prices
\ No newline at end of file
+import pandas as pd
+import numpy as np
+from dataclasses import dataclass
+from ..utils.rolling import rolling_sum
+
+@dataclass
+class ExecutionCosts:
+    """
+    Output of ExecutionModel.apply_batch. Every array is (time x assets), one column per asset,
+    and every cost is in currency (or in units of capital when positions are notional).
+    """
+    trades: np.ndarray
+    commission: np.ndarray
+    spread: np.ndarray
+    slippage: np.ndarray
+    impact: np.ndarray
+    total: np.ndarray
+    adjusted_prices: np.ndarray
+
+    def summary(self, assets: list=None):
+        """
+        Total of each cost component per asset over the whole period.
+
+        Output:
+        - (pd.DataFrame): One row per asset, columns commission, spread, slippage, impact, total
+        """
+        return pd.DataFrame({
+            'commission': self.commission.sum(axis=0),
+            'spread': self.spread.sum(axis=0),
+            'slippage': self.slippage.sum(axis=0),
+            'impact': self.impact.sum(axis=0),
+            'total': self.total.sum(axis=0)
+        }, index=assets)
+
+class ExecutionModel:
+    """
+    Models realistic market frictions (impact) in a trading strategy:
+    1) Transaction Costs (Commissions per unit traded)
+    2) Bid-Ask Spread Impact
+    3) Slippage
+    4) Market Impact (square-root model, when traded volumes are available)
+
+    This allows the backtest to more closely approximate real-world performance.
+    """
+    def __init__(self, transaction_cost=0.0005, bid_ask_spread=0.0002, slippage_vol_factor=0.1,
+                 impact_coefficient=1.0, slippage_window=5, impact_window=20):
+        """
+        Initialize execution model parameters.
+
+        Inputs:
+        - transaction_cost: cost per unit traded (0.05% of trade in this case)
+        - bid_ask_spread: half_spread appread per trade
+        - slippage_vol_factor: fraction of recent volatility applied as additional slippage
+        - impact_coefficient: Y in the square-root impact model, impact = Y * daily vol * sqrt(shares traded / average daily volume)
+        - slippage_window: Rolling window of the volatility used for slippage
+        - impact_window: Rolling window of the volatility and average daily volume used for market impact
+        """
+        self.transaction_cost = transaction_cost
+        self.bid_ask_spread = bid_ask_spread
+        self.slippage_vol_factor = slippage_vol_factor
+        self.impact_coefficient = impact_coefficient
+        self.slippage_window = slippage_window
+        self.impact_window = impact_window
+
+    def apply(self, positions: pd.Series, prices: pd.Series):
+        """
+        Apply execution frictions to positions and return effective prices.
+
+        Inputs:
+        - positions: Desired positions over time
+        - prices: Market prices
+
+        Outputs:
+        - adjusted_prices (pd.Series): Prices adjusted for realistic trading costs
+        """
+        # Single-asset case of apply_batch
+        costs = self.apply_batch(positions.to_numpy(dtype=float)[:, None], prices.to_numpy(dtype=float)[:, None])
+        adjusted_prices = pd.Series(costs.adjusted_prices[:, 0], index=prices.index, name=prices.name)
+        return adjusted_prices
+
+    def apply_batch(self, positions: np.ndarray, prices: np.ndarray, volumes: np.ndarray=None,
+                    notional: bool=False, capital: float=1.0):
+        """
+        Apply execution frictions to the positions of all assets at once.
+
+        Commission, bid-ask spread and slippage (on rolling 5-day volatility) are computed on (time x assets) arrays
+        in one vectorized pass, plus square-root market impact when volumes are given.
+
+        Inputs:
+        - positions: Positions over time (time x assets), in units (shares) or, if notional=True, in fractions of capital
+        - prices: Market prices (time x assets)
+        - volumes: Optional traded volumes in units (time x assets). Without volumes, impact is 0.
+        - notional: Whether positions are notional amounts (as in the backtest engine) instead of units
+        - capital: Capital the notional positions refer to (only used to convert trades into units for the impact term)
+
+        Outputs:
+        - costs (ExecutionCosts): Trades, per-component costs and adjusted prices, all (time x assets)
+        """
+        positions = np.asarray(positions, dtype=float)
+        prices = np.asarray(prices, dtype=float)
+
+        # Compute trades (i.e. position changes, the first bar trades the initial position)
+        trades = np.empty_like(positions)
+        trades[0] = positions[0]
+        np.subtract(positions[1:], positions[:-1], out=trades[1:])
+        side = np.sign(trades)
+
+        # Traded amount in currency (or capital) and in units
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if notional:
+                traded_value = np.abs(trades)
+                traded_units = traded_value * capital / prices
+            else:
+                traded_units = np.abs(trades)
+                traded_value = traded_units * prices
+
+        # Daily returns (first bar has no return)
+        returns = np.zeros_like(prices)
+        np.divide(prices[1:], prices[:-1], out=returns[1:])
+        returns[1:] -= 1
+
+        # Cost rates as fractions of traded value
+        slippage_rate = self.slippage_vol_factor * _rolling_std(returns, self.slippage_window)
+        impact_rate = np.zeros_like(prices)
+        if volumes is not None:
+            # Square-root model: Y * sigma * sqrt(participation in average daily volume)
+            adv = _rolling_mean(np.asarray(volumes, dtype=float), self.impact_window)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                participation = np.where(adv > 0, traded_units / adv, 0.0)
+            impact_rate = self.impact_coefficient * _rolling_std(returns, self.impact_window) * np.sqrt(participation)
+
+        commission = traded_value * self.transaction_cost
+        spread = traded_value * self.bid_ask_spread
+        slippage = traded_value * slippage_rate
+        impact = traded_value * impact_rate
+        total = commission + spread + slippage + impact
+
+        # Adjusted price, reflecting realistic execution (commission per unit traded, as in apply)
+        adjusted_prices = prices * (1 + side * (self.bid_ask_spread + slippage_rate + impact_rate))
+        adjusted_prices += np.abs(trades) * self.transaction_cost
+
+        return ExecutionCosts(
+            trades=trades,
+            commission=commission,
+            spread=spread,
+            slippage=slippage,
+            impact=impact,
+            total=total,
+            adjusted_prices=adjusted_prices
+        )
+
+def _rolling_std(returns: np.ndarray, window: int):
+    """
+    Rolling sample standard deviation of each column from NaN-masked running sums (see utils/rolling.py),
+    0 until the window is full and while it holds a missing return
+    (same values as returns.rolling(window).std().fillna(0) on pct_change returns).
+    """
+    # The first bar has no return: leave it out of the windows, as pct_change does
+    returns = np.array(returns, dtype=float)
+    returns[:1] = np.nan
+    s, _ = rolling_sum(returns, window)
+    sq, _ = rolling_sum(returns**2, window)
+    with np.errstate(invalid="ignore"):
+        std = np.sqrt(np.maximum(sq - s**2 / window, 0) / (window - 1))
+    return np.nan_to_num(std, nan=0.0)
+
+def _rolling_mean(values: np.ndarray, window: int):
+    """
+    Rolling mean of each column over up to `window` observations (shorter windows at the start),
+    skipping missing values (NaN while a window holds none).
+    """
+    sums, counts = rolling_sum(values, window, min_periods=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return sums / counts
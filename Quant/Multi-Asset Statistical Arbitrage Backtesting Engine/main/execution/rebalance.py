@@ -1,24 +1,110 @@
-import pandas as pd
-
-def rebalance_positions(positions: pd.Series, freq: int=5):
-    """
-    Rebalance trading positions at a fixed frequency.
-
-    Inputs:
-    - positions: Positions over time
-    - freq: Rebalancing frequncy in day periods (i.e. freq=5: rebalance every 5 day)
-
-    Outputs:
-    - reb_positions (pd.Series): Rebalanced positions
-    """
-    # Copy original positions to avoid modifying input
-    reb_positions = positions.copy()
-
-    # Iterate through all time steps
-    for i in range(len(positions)):
-        # If not a rebalance day
-        if i % freq != 0:
-            # Carry forward previous position
-            reb_positions.iloc[i] = reb_positions.iloc[i-1]
-        # Else, if its a rebalance day, keep new position
-    return reb_positions
\ No newline at end of file
+import pandas as pd
+import numpy as np
+
+# Calendar frequencies -> pandas period used to find the last bar of each period
+CALENDAR_PERIODS = {
+    'weekly': "W",
+    'monthly': "M",
+    'month_end': "M",
+    'quarterly': "Q",
+    'quarter_end': "Q",
+    'yearly': "Y",
+    'year_end': "Y"
+}
+
+def rebalance_schedule(index, frequency="daily"):
+    """
+    Rows on which positions may be rebalanced.
+
+    Frequencies:
+    - "daily": Every row
+    - int N: Every N rows, starting with the first one (freq of rebalance_positions)
+    - "weekly", "month_end" (or "monthly"), "quarter_end" (or "quarterly"), "year_end" (or "yearly"):
+      Last bar of each calendar period
+    - List of dates: First bar on or after each date
+
+    Inputs:
+    - index: Dates of the rows (DatetimeIndex, or any index for "daily"/int frequencies)
+    - frequency: Rebalancing frequency (see above)
+
+    Outputs:
+    - schedule (np.ndarray of bool): True on rebalancing rows
+    """
+    n = len(index)
+    if isinstance(frequency, (int, np.integer)):
+        return np.arange(n) % frequency == 0
+
+    if isinstance(frequency, str):
+        name = frequency.lower()
+        if name == "daily":
+            return np.ones(n, dtype=bool)
+        if name not in CALENDAR_PERIODS:
+            raise ValueError(f"Unknown rebalance frequency '{frequency}'")
+        index = pd.DatetimeIndex(index)
+        periods = index.to_period(CALENDAR_PERIODS[name]).asi8
+
+        # A bar ends its period when the next bar is in a later period
+        schedule = np.zeros(n, dtype=bool)
+        schedule[:-1] = periods[1:] != periods[:-1]
+        if n:
+            # Last bar: period end if the next business day falls in the next period
+            next_day = (index[-1:] + pd.offsets.BDay(1)).to_period(CALENDAR_PERIODS[name]).asi8
+            schedule[-1] = next_day[0] != periods[-1]
+        return schedule
+
+    # Custom dates: first bar on or after each date
+    rows = pd.DatetimeIndex(index).searchsorted(pd.DatetimeIndex(frequency), side="left")
+    schedule = np.zeros(n, dtype=bool)
+    schedule[rows[rows < n]] = True
+    return schedule
+
+def rebalance_positions(positions, freq=5, drift_band: float=None, index=None):
+    """
+    Rebalance trading positions on a schedule, optionally only when they drift out of a tolerance band.
+
+    Between rebalancing rows the last rebalanced positions are carried forward (one vectorized forward-fill
+    over all columns); rows before the first rebalance hold no position.
+
+    With a drift band, on a rebalancing row a column only trades when its target has moved more than
+    drift_band (relative) away from the held position, or when the target changes side (entries, exits, flips).
+    This path dependence is resolved bar by bar, all columns at once.
+
+    Inputs:
+    - positions: Target positions over time (Series, (time x pairs) DataFrame or array)
+    - freq: Rebalancing frequency (i.e. freq=5: rebalance every 5 day), see rebalance_schedule for calendar frequencies
+    - drift_band: Relative tolerance, e.g. 0.1 = trade only when the target differs from the held position by more than 10%
+    - index: Dates of the rows, needed for calendar frequencies when positions is an array
+
+    Outputs:
+    - reb_positions: Rebalanced positions, same type and shape as positions
+    """
+    index = positions.index if isinstance(positions, (pd.Series, pd.DataFrame)) else index
+    values = np.asarray(positions, dtype=float)
+    target = values[:, None] if values.ndim == 1 else values
+    n = len(target)
+    schedule = rebalance_schedule(index if index is not None else pd.RangeIndex(n), freq)
+
+    if drift_band is None:
+        # Row of the latest rebalance at or before each row (-1: none yet), then gather
+        last = np.maximum.accumulate(np.where(schedule, np.arange(n), -1))
+        held = np.zeros_like(target)
+        started = last >= 0
+        held[started] = target[last[started]]
+    else:
+        held = np.empty_like(target)
+        current = np.zeros(target.shape[1])
+        for t in range(n):
+            if schedule[t]:
+                # Trade columns that changed side or drifted out of the band
+                new_side = np.sign(target[t]) != np.sign(current)
+                drifted = np.abs(target[t] - current) > drift_band * np.abs(current)
+                trade = new_side | drifted
+                current[trade] = target[t][trade]
+            held[t] = current
+
+    reb_positions = held[:, 0] if values.ndim == 1 else held
+    if isinstance(positions, pd.Series):
+        return pd.Series(reb_positions, index=positions.index, name=positions.name)
+    if isinstance(positions, pd.DataFrame):
+        return pd.DataFrame(reb_positions, index=positions.index, columns=positions.columns)
+    return reb_positions
@@ -1,52 +1,216 @@
-import pandas as pd
-
-class PortfolioManager:
-    """
-    Manages a portfolio consisting of multiple pairs, allowing aggregation and enforcing leverage/exposure limits.
-
-    Key Features:
-    - Add individual pair positions
-    - Aggregate positions across all pairs
-    - Apply a maximum leverage cap to control risk
-    """
-    def __init__(self, max_leverage: float=3.0):
-        self.max_leverage = max_leverage
-        self.positions = pd.DataFrame()
-
-    def add_pair(self, pair_name:str, positions:pd.Series):
-        """
-        Add a new pair's position to the portfolio.
-
-        Input:
-        - pair_name: Identifier for the pair
-        - positions: Positions of the pair over time
-        """
-        self.positions[pair_name] = positions
-
-    def aggregate(self):
-        """
-        Aggregate positions across all pairs and enforce leverage limits.
-
-        Steps:
-        1) Compute total exposure (sum of absolute positions)
-        2) Compute scaling factor to limit leverage
-        3) Scale all pair positions proportionally
-        4) Sum scaled positions to get total portfolio exposure per time step
-
-        Output:
-        - net_agg_position (pd.Series): Aggregated portfolio position over time
-        """
-        # Total exposure
-        total_exposure = self.positions.abs().sum(axis=1)
-
-        # Scaling factor:
-        # - If total exposure < max leverage, then scaling factor = 1 (no scaling)
-        # - If total exposure > max leverage, then scale down proportionally
-        scaling_factor = (self.max_leverage / total_exposure).clip(upper=1.0)
-
-        # Apply scaling factor to each pair's position
-        agg_positions = self.positions.multiply(scaling_factor, axis=0)
-
-        # Sum agg_positions across all pairs to get net portfolio positions
-        net_agg_position = agg_positions.sum(axis=1)
-        return net_agg_position
\ No newline at end of file
+import pandas as pd
+import numpy as np
+
+class PortfolioManager:
+    """
+    Manages a portfolio consisting of multiple pairs, allowing aggregation and enforcing leverage/exposure limits.
+
+    Key Features:
+    - Add or remove pair positions (one at a time or in bulk)
+    - Append new bars of positions for streaming/live updates
+    - Aggregate positions across all pairs
+    - Apply a maximum leverage cap to control risk
+
+    Positions are kept in a preallocated (time x pairs) array with a pair -> column index.
+    Rows and columns grow by doubling, removed pairs free their column for reuse,
+    and aggregation only processes the bars added since the previous call.
+    """
+    def __init__(self, max_leverage: float=3.0, capacity: int=16):
+        self.max_leverage = max_leverage
+
+        self._book = np.full((capacity, capacity), np.nan) # (time x pair slots), NaN: no position recorded
+        self._column = {} # Pair name -> column of the book (insertion ordered)
+        self._free = [] # Columns released by removed pairs
+        self._n_columns = 0 # Columns used so far (live or free)
+        self._times = [] # Time label of each row
+        self._time_index = None
+
+        # Aggregated net position of each row, valid for the first _n_aggregated rows
+        self._net = np.zeros(capacity)
+        self._n_aggregated = 0
+
+    @property
+    def pairs(self):
+        return list(self._column)
+
+    @property
+    def index(self):
+        if self._time_index is None:
+            self._time_index = pd.Index(self._times)
+        return self._time_index
+
+    @property
+    def positions(self):
+        """
+        Positions of all pairs as a (time x pairs) DataFrame.
+        """
+        columns = list(self._column.values())
+        return pd.DataFrame(self._book[:len(self._times), columns], index=self.index, columns=self.pairs)
+
+    def add_pair(self, pair_name: str, positions: pd.Series):
+        """
+        Add a new pair's position to the portfolio.
+
+        Input:
+        - pair_name: Identifier for the pair
+        - positions: Positions of the pair over time
+        """
+        self.add_pairs({pair_name: positions})
+
+    def add_pairs(self, positions):
+        """
+        Add (or replace) the positions of several pairs at once.
+        The first positions added define the time index, later ones are aligned to it.
+
+        Input:
+        - positions: DataFrame with one column per pair, or dict of pair name -> positions Series
+        """
+        if isinstance(positions, pd.DataFrame):
+            frame = positions
+        else:
+            frame = pd.DataFrame(dict(positions))
+        if frame.shape[1] == 0:
+            return
+
+        if not self._times:
+            self._set_index(frame.index)
+        values = frame.reindex(self.index).to_numpy(dtype=float)
+
+        columns = [self._allocate(name) for name in frame.columns]
+        self._book[:len(self._times), columns] = values
+
+        # Past bars changed, aggregate again from the start
+        self._n_aggregated = 0
+
+    def remove_pairs(self, pair_names: list):
+        """
+        Remove pairs from the portfolio, releasing their columns.
+
+        Input:
+        - pair_names: Identifiers of the pairs to remove
+        """
+        for name in pair_names:
+            column = self._column.pop(name)
+            self._book[:, column] = np.nan
+            self._free.append(column)
+        self._n_aggregated = 0
+
+    def append_bar(self, positions, timestamp=None):
+        """
+        Append one bar of positions for all pairs and return the aggregated position of that bar (O(pairs)).
+
+        Inputs:
+        - positions: Dict of pair name -> position (new names are added as pairs, pairs left out have no position),
+                     or array of positions in the order of self.pairs
+        - timestamp: Time label of the bar (default: the row number)
+
+        Output:
+        - net_position (float): Aggregated portfolio position of the bar, leverage cap applied
+        """
+        row = len(self._times)
+        if row == self._book.shape[0]:
+            self._grow(rows=max(1, 2 * row))
+
+        self._book[row] = np.nan
+        if isinstance(positions, dict):
+            for name, position in positions.items():
+                # Allocate first: a new column may reallocate the book
+                column = self._allocate(name)
+                self._book[row, column] = position
+        else:
+            self._book[row, list(self._column.values())] = np.asarray(positions, dtype=float)
+
+        self._times.append(row if timestamp is None else timestamp)
+        self._time_index = None
+
+        # Keep the incremental aggregation up to date when it already covers all previous bars
+        net_position = self.aggregate_bar(row)
+        if self._n_aggregated == row:
+            self._net[row] = net_position
+            self._n_aggregated += 1
+        return net_position
+
+    def aggregate_bar(self, row: int=-1):
+        """
+        Aggregated position of one bar with the leverage cap applied (see aggregate).
+
+        Input:
+        - row: Row number of the bar (default: latest)
+
+        Output:
+        - net_position (float): Aggregated portfolio position of the bar
+        """
+        row = row % len(self._times)
+        bar = self._book[row, :self._n_columns]
+
+        # Total exposure and scaling factor capped at 1
+        total_exposure = np.nansum(np.abs(bar))
+        scaling_factor = min(self.max_leverage / total_exposure, 1.0) if total_exposure > 0 else 1.0
+        return float(np.nansum(bar) * scaling_factor)
+
+    def aggregate(self):
+        """
+        Aggregate positions across all pairs and enforce leverage limits.
+
+        Steps:
+        1) Compute total exposure (sum of absolute positions)
+        2) Compute scaling factor to limit leverage
+        3) Scale all pair positions proportionally
+        4) Sum scaled positions to get total portfolio exposure per time step
+
+        Only the bars added since the previous call are computed,
+        unless pairs were added or removed in the meantime.
+
+        Output:
+        - net_agg_position (pd.Series): Aggregated portfolio position over time
+        """
+        start = self._n_aggregated
+        stop = len(self._times)
+        block = self._book[start:stop, :self._n_columns]
+
+        # Total exposure
+        total_exposure = np.nansum(np.abs(block), axis=1)
+
+        # Scaling factor:
+        # - If total exposure < max leverage, then scaling factor = 1 (no scaling)
+        # - If total exposure > max leverage, then scale down proportionally
+        with np.errstate(divide="ignore"):
+            scaling_factor = np.minimum(self.max_leverage / total_exposure, 1.0)
+
+        # Apply scaling factor to each pair's position and sum across pairs
+        self._net[start:stop] = np.nansum(block, axis=1) * scaling_factor
+        self._n_aggregated = stop
+
+        net_agg_position = pd.Series(self._net[:stop].copy(), index=self.index)
+        return net_agg_position
+
+    def _set_index(self, index):
+        self._times = list(index)
+        self._time_index = pd.Index(index)
+        if len(self._times) > self._book.shape[0]:
+            self._grow(rows=len(self._times))
+
+    def _allocate(self, name):
+        # Existing pair keeps its column, otherwise reuse a free column or take a new one
+        if name in self._column:
+            return self._column[name]
+        if self._free:
+            column = self._free.pop()
+        else:
+            if self._n_columns == self._book.shape[1]:
+                self._grow(columns=max(1, 2 * self._n_columns))
+            column = self._n_columns
+            self._n_columns += 1
+        self._column[name] = column
+        return column
+
+    def _grow(self, rows: int=None, columns: int=None):
+        # Reallocate the book (and aggregation buffer) with more rows and/or columns
+        rows = max(rows or 0, self._book.shape[0])
+        columns = max(columns or 0, self._book.shape[1])
+        book = np.full((rows, columns), np.nan)
+        book[:self._book.shape[0], :self._book.shape[1]] = self._book
+        self._book = book
+        net = np.zeros(rows)
+        net[:len(self._net)] = self._net
+        self._net = net
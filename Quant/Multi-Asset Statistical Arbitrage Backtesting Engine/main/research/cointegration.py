@@ -0,0 +1,211 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+# Price matrix shared with worker processes (set once per worker by _init_worker)
+_WORKER_PRICES = None
+
+def _default_maxlag(nobs: int, ntrend: int):
+    """
+    Default ADF lag length used by statsmodels (Schwert 1989), capped by the sample size.
+    """
+    maxlag = int(np.ceil(12.0 * np.power(nobs / 100.0, 1 / 4.0)))
+    maxlag = min(nobs // 2 - ntrend - 1, maxlag)
+    if maxlag < 0:
+        raise ValueError("sample size is too short to use selected regression component")
+    return maxlag
+
+def _adf_moments(X: np.ndarray, lag: int, nobs: int, regression: str):
+    """
+    Build the ADF regressions of all columns of X and return their normal equations.
+
+    Input:
+    - X: Time-series matrix (time x series)
+    - lag: Number of lagged differences to include
+    - nobs: Number of observations to keep (trimmed from the start of the sample)
+    - regression: "n" (no constant) or "c" (constant)
+
+    Output:
+    - gram (np.ndarray): (series x k x k) X'X of the regressors [level, (const), lagged diffs]
+    - xty (np.ndarray): (series x k) X'y
+    - yty (np.ndarray): (series) y'y, with y the first differences
+    """
+    # Series along rows so that every regressor is a contiguous slice
+    levels = np.ascontiguousarray(X.T)
+    diff = np.diff(levels, axis=1)
+    T = diff.shape[1]
+    ntrend = 1 if regression == "c" else 0
+
+    design = np.empty((levels.shape[0], 1 + ntrend + lag, nobs))
+    design[:, 0] = levels[:, T - nobs:T] # Lagged level x_{t-1}
+    if ntrend:
+        design[:, 1] = 1.0 # Constant
+    for i in range(1, lag+1):
+        design[:, ntrend + i] = diff[:, T - nobs - i:T - i] # Lagged difference dx_{t-i}
+    target = diff[:, T - nobs:]
+
+    gram = design @ design.transpose(0, 2, 1)
+    xty = (design @ target[..., None])[..., 0]
+    yty = np.einsum("pt,pt->p", target, target)
+    return gram, xty, yty
+
+def _ols_tstat(gram: np.ndarray, xty: np.ndarray, yty: np.ndarray, nobs: int):
+    """
+    Solve a batch of OLS normal equations and return the t-statistic of the first coefficient and the SSR.
+    """
+    k = gram.shape[-1]
+    inv = np.linalg.inv(gram)
+    params = np.einsum("pij,pj->pi", inv, xty)
+    ssr = yty - np.einsum("pi,pi->p", params, xty)
+    ssr = np.maximum(ssr, np.finfo(float).tiny)
+    sigma2 = ssr / (nobs - k)
+    tstat = params[:, 0] / np.sqrt(sigma2 * inv[:, 0, 0])
+    return tstat, ssr
+
+def batch_adfuller(X: np.ndarray, maxlag: int=None, regression: str="c", autolag: str="AIC", batch_size: int=256):
+    """
+    Augmented Dickey-Fuller test for every column of a matrix at once.
+
+    Reproduces statsmodels' adfuller (same lag search, sample trimming and MacKinnon p-values),
+    but fits the regressions of all columns together with batched normal equations.
+
+    Input:
+    - X: Time-series matrix (time x series), no NaNs
+    - maxlag: Maximum lag considered (default: 12*(nobs/100)^(1/4))
+    - regression: "c" (constant) or "n" (no constant)
+    - autolag: "AIC" to select the lag by Akaike Information Criterion, None to use maxlag
+    - batch_size: Number of columns fitted together (bounds the size of the design tensor)
+
+    Output:
+    - adf_stat (np.ndarray): ADF test statistic per column
+    - p_value (np.ndarray): MacKinnon approximate p-value per column (NaN for constant columns)
+    - used_lag (np.ndarray): Number of lagged differences used per column
+    """
+    from statsmodels.tsa.adfvalues import mackinnonp
+
+    if regression not in ("c", "n"):
+        raise ValueError("regression must be 'c' or 'n'")
+
+    X = np.asarray(X, dtype=float)
+    if X.ndim == 1:
+        X = X[:, None]
+    T, m = X.shape
+    ntrend = 1 if regression == "c" else 0
+    if maxlag is None:
+        maxlag = _default_maxlag(T, ntrend)
+
+    # Fit wide matrices in column batches to bound memory
+    if m > batch_size:
+        results = [batch_adfuller(X[:, i:i+batch_size], maxlag, regression, autolag, batch_size) for i in range(0, m, batch_size)]
+        return tuple(np.concatenate([r[k] for r in results]) for k in range(3))
+
+    # Constant series have no ADF statistic (statsmodels raises), report NaN for them
+    constant = X.max(axis=0) == X.min(axis=0)
+    if constant.any():
+        adf_stat = np.full(m, np.nan)
+        p_value = np.full(m, np.nan)
+        used_lag = np.zeros(m, dtype=int)
+        if (~constant).any():
+            adf_stat[~constant], p_value[~constant], used_lag[~constant] = batch_adfuller(X[:, ~constant], maxlag, regression, autolag, batch_size)
+        return adf_stat, p_value, used_lag
+
+    if autolag is not None:
+        # Lag search: all candidate lags are fitted on the same (maxlag-trimmed) sample
+        nobs = T - 1 - maxlag
+        gram, xty, yty = _adf_moments(X, maxlag, nobs, regression)
+
+        best_aic = np.full(m, np.inf)
+        used_lag = np.zeros(m, dtype=int)
+        for lag in range(maxlag+1):
+            k = 1 + ntrend + lag
+            _, ssr = _ols_tstat(gram[:, :k, :k], xty[:, :k], yty, nobs)
+            aic = nobs * (np.log(2 * np.pi) + np.log(ssr / nobs) + 1) + 2 * k
+
+            # Strict improvement keeps the smallest lag on ties (as statsmodels does)
+            better = aic < best_aic
+            best_aic[better] = aic[better]
+            used_lag[better] = lag
+    else:
+        used_lag = np.full(m, maxlag, dtype=int)
+
+    # Refit each group of columns sharing a lag on its own (longer) sample
+    adf_stat = np.empty(m)
+    for lag in np.unique(used_lag):
+        cols = np.flatnonzero(used_lag == lag)
+        nobs = T - 1 - lag
+        gram, xty, yty = _adf_moments(X[:, cols], lag, nobs, regression)
+        adf_stat[cols], _ = _ols_tstat(gram, xty, yty, nobs)
+
+    p_value = np.array([mackinnonp(stat, regression=regression, N=1) for stat in adf_stat])
+    return adf_stat, p_value, used_lag
+
+def _coint_block(prices: np.ndarray, left: np.ndarray, right: np.ndarray, maxlag: int=None):
+    """
+    Engle-Granger test for a block of pairs (prices[:, left] regressed on prices[:, right]).
+    """
+    from statsmodels.tsa.adfvalues import mackinnonp
+
+    # Cointegrating regression y = alpha + beta*x solved from centered columns
+    y = prices[:, left]
+    x = prices[:, right]
+    y = y - y.mean(axis=0)
+    x = x - x.mean(axis=0)
+    sxy = np.einsum("tp,tp->p", x, y)
+    sxx = np.einsum("tp,tp->p", x, x)
+    syy = np.einsum("tp,tp->p", y, y)
+    beta = sxy / sxx
+    residuals = y - beta * x
+
+    # (Almost) perfectly colinear pairs are reported as cointegrated, as in statsmodels
+    rsquared = sxy**2 / (sxx * syy)
+    colinear = rsquared >= 1 - 100 * np.sqrt(np.finfo(float).eps)
+
+    stats = np.full(len(left), -np.inf)
+    if (~colinear).any():
+        stats[~colinear], _, _ = batch_adfuller(residuals[:, ~colinear], maxlag=maxlag, regression="n")
+
+    # p-values from the MacKinnon cointegration distribution (constant, 2 variables)
+    pvalues = np.array([mackinnonp(stat, regression="c", N=2) for stat in stats])
+    return stats, pvalues
+
+def _init_worker(prices: np.ndarray):
+    global _WORKER_PRICES
+    _WORKER_PRICES = prices
+
+def _worker_coint_block(args):
+    left, right, maxlag = args
+    return _coint_block(_WORKER_PRICES, left, right, maxlag)
+
+def batch_coint(prices: np.ndarray, left: np.ndarray, right: np.ndarray, maxlag: int=None, batch_size: int=256, n_jobs: int=1):
+    """
+    Engle-Granger cointegration tests for many pairs, in batches and optionally over a process pool.
+
+    Input:
+    - prices: Price matrix (time x assets), no NaNs
+    - left: Column indices of the dependent series of each pair
+    - right: Column indices of the independent series of each pair
+    - maxlag: Maximum ADF lag (default: statsmodels' default)
+    - batch_size: Number of pairs fitted together in one batch
+    - n_jobs: Number of worker processes (1 runs in the current process)
+
+    Output:
+    - stats (np.ndarray): Engle-Granger t-statistic per pair
+    - pvalues (np.ndarray): MacKinnon p-value per pair
+    """
+    prices = np.asarray(prices, dtype=float)
+    left = np.asarray(left, dtype=int)
+    right = np.asarray(right, dtype=int)
+
+    # Split pairs into batches to bound the size of the (pairs x lags x time) design tensor
+    batches = [(left[i:i+batch_size], right[i:i+batch_size], maxlag) for i in range(0, len(left), batch_size)]
+
+    if n_jobs == 1 or len(batches) <= 1:
+        results = [_coint_block(prices, *batch) for batch in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(prices,)) as pool:
+            results = list(pool.map(_worker_coint_block, batches))
+
+    if not results:
+        return np.empty(0), np.empty(0)
+    stats = np.concatenate([r[0] for r in results])
+    pvalues = np.concatenate([r[1] for r in results])
+    return stats, pvalues
\ No newline at end of file
@@ -0,0 +1,136 @@
+import numpy as np
+
+class RollingCorrelation:
+    """
+    Streaming rolling-window correlation of returns between all pairs of n assets.
+
+    Keeps a ring buffer of the last `window` returns together with the running sums of returns,
+    squared returns and the (n x n) sum of cross products, so each new bar costs O(n^2)
+    instead of recomputing every window from scratch. The sums are re-synchronized from the buffer
+    once per window to stop floating point drift (amortized O(n^2)).
+
+    Correlations are reported for the unique pairs (i < j) only, in np.triu_indices(n, k=1) order,
+    as a compact 1-D array (float32 by default).
+    A pair has a correlation once both assets have `window` valid returns in the window
+    (same as prices.pct_change().rolling(window).corr()), otherwise NaN.
+    """
+    def __init__(self, n_assets: int, window: int=60, tickers: list=None, dtype=np.float32):
+        self.n_assets = n_assets
+        self.window = window
+        self.tickers = list(tickers) if tickers is not None else list(range(n_assets))
+        self.dtype = np.dtype(dtype)
+        self.n_updates = 0 # Number of returns seen
+
+        # Unique pairs (stock 1 = left[p], stock 2 = right[p]) and their position in the flattened (n x n) matrix
+        self.left, self.right = np.triu_indices(n_assets, k=1)
+        self._flat = self.left * n_assets + self.right
+
+        # Ring buffers of returns (missing returns stored as 0) and of missing flags
+        self._r = np.zeros((window, n_assets))
+        self._missing = np.zeros((window, n_assets), dtype=bool)
+        self._last_price = None
+
+        # Running sums
+        self._s = np.zeros(n_assets)
+        self._ss = np.zeros(n_assets)
+        self._sxy = np.zeros((n_assets, n_assets))
+        self._n_missing = np.zeros(n_assets, dtype=np.int64)
+        self._work = np.empty((n_assets, n_assets))
+
+        # Latest correlations (NaN until the window is full)
+        self.current = np.full(len(self.left), np.nan, dtype=self.dtype)
+
+    def update(self, prices: np.ndarray):
+        """
+        Add one bar of prices for every asset.
+
+        Input:
+        - prices: Latest price of each asset (NaN if missing)
+
+        Output:
+        - corr (np.ndarray): Rolling correlation of each unique pair at this bar
+        """
+        prices = np.asarray(prices, dtype=float)
+        if self._last_price is None:
+            # The first bar only provides the reference prices for the first returns
+            self._last_price = prices.copy()
+            return self.current
+
+        # Simple returns (missing where either price is missing)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = prices / self._last_price - 1
+        self._last_price = prices.copy()
+        missing = ~np.isfinite(r)
+        r[missing] = 0
+
+        # Swap the oldest return out of the running sums
+        slot = self.n_updates % self.window
+        old_r = self._r[slot]
+        self._s += r - old_r
+        self._ss += r * r - old_r * old_r
+        self._n_missing += missing.astype(np.int64) - self._missing[slot]
+        # Rank-2 update of the cross products: r r' - old_r old_r'
+        self._sxy += np.vstack([r, old_r]).T @ np.vstack([r, -old_r])
+        self._r[slot] = r
+        self._missing[slot] = missing
+        self.n_updates += 1
+
+        if self.n_updates % self.window == 0:
+            self._resync()
+
+        if self.n_updates >= self.window:
+            self.current = self._correlations()
+        return self.current
+
+    def _correlations(self):
+        n = self.window
+        var = np.maximum(self._ss - self._s ** 2 / n, 0)
+        with np.errstate(divide="ignore"):
+            inv_std = 1 / np.sqrt(var)
+        inv_std[self._n_missing > 0] = np.nan # Asset without a full window of returns
+
+        # Scaled covariance matrix on contiguous (n x n) buffers, then keep the upper triangle
+        work = self._work
+        np.multiply.outer(self._s, self._s / n, out=work)
+        np.subtract(self._sxy, work, out=work)
+        work *= inv_std[:, None]
+        work *= inv_std[None, :]
+        return np.take(work, self._flat).astype(self.dtype, copy=False)
+
+    def _resync(self):
+        self._s = self._r.sum(axis=0)
+        self._ss = (self._r ** 2).sum(axis=0)
+        self._sxy = self._r.T @ self._r
+        self._n_missing = self._missing.sum(axis=0)
+
+    def matrix(self):
+        """
+        Return the latest correlations as a full symmetric (n x n) matrix.
+        """
+        corr = np.eye(self.n_assets, dtype=self.dtype)
+        corr[self.left, self.right] = self.current
+        corr[self.right, self.left] = self.current
+        return corr
+
+    def top_k(self, k: int, absolute: bool=False):
+        """
+        Current k most correlated pairs.
+
+        Input:
+        - k: Number of pairs to return
+        - absolute: Rank by |correlation| instead of correlation
+
+        Output:
+        - pairs (list of tuples): List of tuples (stock 1, stock 2, correlation), most correlated first
+        """
+        score = np.abs(self.current) if absolute else self.current
+        score = np.where(np.isnan(score), -np.inf, score) # Pairs without a correlation rank last
+        valid = int(np.isfinite(score).sum())
+        k = min(k, valid)
+        if k <= 0:
+            return []
+
+        # Partial selection of the k largest, then sort only those
+        top = np.argpartition(score, len(score) - k)[len(score) - k:]
+        top = top[np.argsort(score[top])[::-1]]
+        return [(self.tickers[self.left[p]], self.tickers[self.right[p]], float(self.current[p])) for p in top]
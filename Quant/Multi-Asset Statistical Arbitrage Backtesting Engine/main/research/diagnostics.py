@@ -1,64 +1,197 @@
-import numpy as np
-from statsmodels.tsa.stattools import adfuller
-
-def half_life(spread: np.ndarray):
-    """
-    Generate the half-life of mean reversion for a time-series spread (time taken for spread between 2 stocks to shrink by half)
-
-    Input:
-    - spread: Time-series containing the spread between two assets
-
-    Output:
-    - hl (float): Estimated half-life
-    """
-    # Lagged spread (all but last value)
-    spread_lag = spread[:-1]
-
-    # Compute change in spread
-    delta = np.diff(spread)
-
-    # Regress delta on lagged spread to estimate speed of mean reversion
-    beta = np.polyfit(spread_lag, delta, 1)[0]
-
-    # Compute half-life = -ln(2) / beta
-    hl = -np.log(2) / beta if beta !=0 else np.nan
-    return hl
-
-def hurst_exponent(ts: np.ndarray, lags: int=100):
-    """
-    Compute Hurst exponent (how likely the time-series is going to continue moving in the same direction: 
-    - Hurst = 0.5: Random Walk
-    - Hurst > 0.5: Likely to continue in same direction
-    - Hurst < 0.5: Likely to continue in opposite direction i.e. Mean-Reverting)
-
-    Input:
-    - ts: Time-series
-    - lags: Maximum lag to compute differences
-
-    Output:
-    - Hurst (float): Hurst Exponent
-    """
-    # Limit lag to half the time-series length to avoid small-sample bias
-    lags = min(lags, len(ts)//2)
-
-    # Compute standard deviation of differences for each lag
-    tau = [np.std(np.subtract(ts[lag:], ts[:-lag])) for lag in range(2, lags)]
-
-    # Compute Hurst Exponent
-    hurst = np.polyfit(np.log(range(2, lags)), np.log(tau), 1)[0] * 2
-    return hurst
-
-def adf_test(ts: np.ndarray):
-    """
-    Perform Augmented Dickey-Fuller (ADF) test for stationarity
-
-    Input:
-    - ts: Time-series
-
-    Output:
-    - (dict): ADF statistic and p-value:
-                - adf_stat: test statistic
-                - p_value: probability of null hypothesis
-    """
-    result = adfuller(ts)
-    return {"adf_stat": result[0], "p_value": result[1]}
\ No newline at end of file
+import hashlib
+import numpy as np
+import pandas as pd
+from functools import wraps
+from collections import OrderedDict
+
+def half_life(spread: np.ndarray):
+    """
+    Generate the half-life of mean reversion for a time-series spread (time taken for spread between 2 stocks to shrink by half)
+
+    Input:
+    - spread: Time-series containing the spread between two assets
+
+    Output:
+    - hl (float): Estimated half-life
+    """
+    # Lagged spread (all but last value)
+    spread_lag = spread[:-1]
+
+    # Compute change in spread
+    delta = np.diff(spread)
+
+    # Regress delta on lagged spread to estimate speed of mean reversion
+    beta = np.polyfit(spread_lag, delta, 1)[0]
+
+    # Compute half-life = -ln(2) / beta
+    hl = -np.log(2) / beta if beta !=0 else np.nan
+    return hl
+
+def hurst_exponent(ts: np.ndarray, lags: int=100):
+    """
+    Compute Hurst exponent (how likely the time-series is going to continue moving in the same direction: 
+    - Hurst = 0.5: Random Walk
+    - Hurst > 0.5: Likely to continue in same direction
+    - Hurst < 0.5: Likely to continue in opposite direction i.e. Mean-Reverting)
+
+    Input:
+    - ts: Time-series
+    - lags: Maximum lag to compute differences
+
+    Output:
+    - Hurst (float): Hurst Exponent
+    """
+    # Limit lag to half the time-series length to avoid small-sample bias
+    lags = min(lags, len(ts)//2)
+
+    # Compute standard deviation of differences for each lag
+    tau = [np.std(np.subtract(ts[lag:], ts[:-lag])) for lag in range(2, lags)]
+
+    # Compute Hurst Exponent
+    hurst = np.polyfit(np.log(range(2, lags)), np.log(tau), 1)[0] * 2
+    return hurst
+
+def adf_test(ts: np.ndarray):
+    """
+    Perform Augmented Dickey-Fuller (ADF) test for stationarity
+
+    Input:
+    - ts: Time-series
+
+    Output:
+    - (dict): ADF statistic and p-value:
+                - adf_stat: test statistic
+                - p_value: probability of null hypothesis
+    """
+    from statsmodels.tsa.stattools import adfuller
+
+    result = adfuller(ts)
+    return {"adf_stat": result[0], "p_value": result[1]}
+
+def _memoize_by_content(maxsize: int=128):
+    """
+    Cache results of a function of one array-like argument, keyed by a hash of the array content
+    (values, shape, dtype, labels) and the remaining arguments. Least recently used entries are evicted.
+    """
+    def decorator(func):
+        cache = OrderedDict()
+
+        @wraps(func)
+        def wrapper(data, *args, **kwargs):
+            values = np.ascontiguousarray(np.asarray(data))
+            digest = hashlib.blake2b(values.tobytes(), digest_size=16)
+            digest.update(repr((values.shape, values.dtype.str, args, sorted(kwargs.items()))).encode())
+            if isinstance(data, (pd.Series, pd.DataFrame)):
+                labels = data.columns if isinstance(data, pd.DataFrame) else [data.name]
+                digest.update(repr(list(labels)).encode())
+            key = digest.hexdigest()
+
+            if key in cache:
+                cache.move_to_end(key)
+            else:
+                cache[key] = func(data, *args, **kwargs)
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
+            # Return a copy so callers cannot alter the cached result
+            return cache[key].copy()
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+def half_life_batch(spreads: np.ndarray):
+    """
+    Half-life of mean reversion for every column of a spread matrix (same estimate as half_life).
+
+    Input:
+    - spreads: Spread matrix (time x pairs)
+
+    Output:
+    - hl (np.ndarray): Estimated half-life of each column
+    """
+    spreads = np.asarray(spreads, dtype=float)
+    spread_lag = spreads[:-1]
+    delta = np.diff(spreads, axis=0)
+
+    # OLS slope of delta on lagged spread for all columns at once
+    x = spread_lag - spread_lag.mean(axis=0)
+    y = delta - delta.mean(axis=0)
+    beta = np.einsum("tp,tp->p", x, y) / np.einsum("tp,tp->p", x, x)
+
+    # Compute half-life = -ln(2) / beta
+    with np.errstate(divide="ignore"):
+        hl = np.where(beta != 0, -np.log(2) / beta, np.nan)
+    return hl
+
+def hurst_exponent_batch(ts: np.ndarray, lags: int=100):
+    """
+    Hurst exponent of every column of a time-series matrix (same estimate as hurst_exponent).
+
+    Input:
+    - ts: Time-series matrix (time x pairs)
+    - lags: Maximum lag to compute differences
+
+    Output:
+    - hurst (np.ndarray): Hurst exponent of each column
+    """
+    ts = np.asarray(ts, dtype=float)
+
+    # Limit lag to half the time-series length to avoid small-sample bias
+    lags = min(lags, len(ts)//2)
+    lag_values = np.arange(2, lags)
+
+    # Standard deviation of differences for each lag, for all columns at once (lags x pairs)
+    tau = np.empty((len(lag_values), ts.shape[1]))
+    for k, lag in enumerate(lag_values):
+        tau[k] = np.std(ts[lag:] - ts[:-lag], axis=0)
+
+    # Slope of log(tau) on log(lag) for every column
+    x = np.log(lag_values)
+    x = x - x.mean()
+    with np.errstate(divide="ignore"):
+        y = np.log(tau)
+    slope = x @ (y - y.mean(axis=0)) / (x @ x)
+    return slope * 2
+
+def adf_test_batch(ts: np.ndarray):
+    """
+    Augmented Dickey-Fuller test for every column of a time-series matrix (same test as adf_test).
+
+    Input:
+    - ts: Time-series matrix (time x pairs)
+
+    Output:
+    - (dict): Arrays of ADF statistics and p-values:
+                - adf_stat: test statistic
+                - p_value: probability of null hypothesis
+    """
+    from .cointegration import batch_adfuller
+
+    adf_stat, p_value, _ = batch_adfuller(ts, regression="c")
+    return {"adf_stat": adf_stat, "p_value": p_value}
+
+@_memoize_by_content()
+def diagnostics_batch(spreads, lags: int=100):
+    """
+    Screen many candidate spreads at once: half-life, Hurst exponent and ADF test for every column.
+    Results are memoized by the content of the input, so re-screening unchanged spreads is free.
+
+    Input:
+    - spreads: Spread matrix (time x pairs), DataFrame or array, no NaNs
+    - lags: Maximum lag for the Hurst exponent
+
+    Output:
+    - (pd.DataFrame): One row per column with half_life, hurst, adf_stat and p_value
+    """
+    values = np.asarray(spreads, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+    index = spreads.columns if isinstance(spreads, pd.DataFrame) else None
+
+    adf = adf_test_batch(values)
+    return pd.DataFrame({
+        "half_life": half_life_batch(values),
+        "hurst": hurst_exponent_batch(values, lags),
+        "adf_stat": adf["adf_stat"],
+        "p_value": adf["p_value"]
+    }, index=index)
\ No newline at end of file
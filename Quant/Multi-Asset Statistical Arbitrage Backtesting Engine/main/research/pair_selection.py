@@ -1,56 +1,127 @@
-import pandas as pd
-import numpy as np
-from statsmodels.tsa.stattools import coint
-
-def rolling_correlation(prices: pd.DataFrame, window: int=60):
-    """
-    Compute rolling correlation matrix of time-series returns.
-
-    Input: 
-    - prices: DataFrame with each column as time series
-    - window: Rolling window size
-
-    Output:
-    - rolling_corr (pd.DataFrame): Multi-index dataframe containing rolling correlations between all pairs
-    """
-    return prices.pct_change().rolling(window).corr()
-
-def find_cointegrated_pairs(prices: pd.DataFrame, significance=0.05):
-    """
-    Returns a pair of cointegrated pairs based on Engle-Granger Test.
-
-    Input:
-    - prices: DataFrame with each column as time series
-    - significance: p-value threshold to determine correlation
-
-    Output:
-    - pairs (list of tuples): List of tuples (stock 1, stock 2, p-value) for cointegrated pairs
-    - pvalue_matrix (np.ndarray): Matrix of p-values for all pairwise cointegration tests
-    """
-    n = prices.shape[1] # number of time-series columns
-
-    # Initialize a matrix to store the p-values of cointegration tests
-    pvalue_matrix = np.ones((n, n))
-
-    keys = prices.columns # Column names (Stock names)
-
-    pairs = [] # List to store cointegrated pairs
-
-    # Loop through each unique pairs of time-series
-    for i in range(n):
-        for j in range(i+1, n):
-            S1 = prices[keys[i]] # time-series of stock 1
-            S2 = prices[keys[j]] # time-series of stock 2
-
-            # Perform Engle-Granger cointegration test
-            _, pvalue, _ = coint(S1, S2) # coint() returns t-value, p-value, crit value but we only need p-value
- 
-            # Store p-value in matrix
-            pvalue_matrix[i, j] = pvalue
-
-            # If p-value is below significance level, consider them cointegrated
-            if pvalue < significance:
-                pairs.append((keys[i], keys[j], pvalue))
-
-    # Return list of cointegrated pairs and matrix of p-values
+import pandas as pd
+import numpy as np
+
+def rolling_correlation(prices: pd.DataFrame, window: int=60):
+    """
+    Compute rolling correlation matrix of time-series returns.
+
+    Input: 
+    - prices: DataFrame with each column as time series
+    - window: Rolling window size
+
+    Output:
+    - rolling_corr (pd.DataFrame): Multi-index dataframe containing rolling correlations between all pairs
+    """
+    return prices.pct_change().rolling(window).corr()
+
+def rolling_correlation_array(prices: pd.DataFrame, window: int=60, dtype=np.float32, out: np.ndarray=None):
+    """
+    Compute rolling correlations of time-series returns as a compact array (streaming, O(n^2) per bar).
+
+    Same values as rolling_correlation, but only the unique pairs are stored, one float32 column per pair,
+    so memory is T x n(n-1)/2 x 4 bytes instead of a T x n x n MultiIndex DataFrame.
+
+    Input:
+    - prices: DataFrame with each column as time series
+    - window: Rolling window size
+    - dtype: Storage dtype of the correlations
+    - out: Optional preallocated (T x n(n-1)/2) array to fill (e.g. a np.memmap for very large universes)
+
+    Output:
+    - corr (np.ndarray): (T x pairs) rolling correlations, NaN until the window is full
+    - pairs (list of tuples): (stock 1, stock 2) of each column
+    """
+    from .correlation import RollingCorrelation
+
+    estimator = RollingCorrelation(prices.shape[1], window=window, tickers=prices.columns, dtype=dtype)
+    if out is None:
+        out = np.empty((len(prices), len(estimator.left)), dtype=dtype)
+
+    values = prices.to_numpy(dtype=float)
+    for t in range(len(values)):
+        out[t] = estimator.update(values[t])
+
+    pairs = [(prices.columns[i], prices.columns[j]) for i, j in zip(estimator.left, estimator.right)]
+    return out, pairs
+
+def correlation_prefilter(prices: pd.DataFrame, window: int=60, k: int=100, absolute: bool=False):
+    """
+    Select the k most correlated pairs over the last window, as a cheap filter before cointegration tests.
+
+    Input:
+    - prices: DataFrame with each column as time series
+    - window: Number of most recent returns used
+    - k: Number of pairs to keep
+    - absolute: Rank by |correlation| instead of correlation
+
+    Output:
+    - candidates (list of tuples): (stock 1, stock 2, correlation), most correlated first,
+                                   which can be passed as candidates to find_cointegrated_pairs
+    """
+    from .correlation import RollingCorrelation
+
+    estimator = RollingCorrelation(prices.shape[1], window=window, tickers=prices.columns)
+
+    # Only the last window of returns (window + 1 prices) is needed
+    for row in prices.to_numpy(dtype=float)[-(window+1):]:
+        estimator.update(row)
+    return estimator.top_k(k, absolute=absolute)
+
+def find_cointegrated_pairs(prices: pd.DataFrame, significance=0.05, candidates=None, n_jobs: int=1, batch_size: int=256):
+    """
+    Returns a pair of cointegrated pairs based on Engle-Granger Test.
+
+    All pairs are tested together by the batched engine in research/cointegration.py:
+    the cointegrating regressions share one matrix computation, the ADF regressions are solved in batches,
+    and the batches can be spread over a process pool.
+
+    Input:
+    - prices: DataFrame with each column as time series
+    - significance: p-value threshold to determine correlation
+    - candidates: Optional prefilter of pairs to test, either a boolean (n x n) matrix or a list of (stock 1, stock 2, ...) tuples
+                  (e.g. the output of correlation_prefilter).
+                  Pairs that are not candidates are skipped and keep a p-value of 1.
+    - n_jobs: Number of worker processes used for the tests
+    - batch_size: Number of pairs tested together in one batch
+
+    Output:
+    - pairs (list of tuples): List of tuples (stock 1, stock 2, p-value) for cointegrated pairs
+    - pvalue_matrix (np.ndarray): Matrix of p-values for all pairwise cointegration tests
+    """
+    from .cointegration import batch_coint
+
+    n = prices.shape[1] # number of time-series columns
+
+    # Initialize a matrix to store the p-values of cointegration tests
+    pvalue_matrix = np.ones((n, n))
+
+    keys = prices.columns # Column names (Stock names)
+
+    # Unique pairs of time-series (i < j), stock 1 = keys[i] and stock 2 = keys[j]
+    left, right = np.triu_indices(n, k=1)
+
+    # Skip pairs rejected by an earlier (cheaper) filter
+    if candidates is not None:
+        if isinstance(candidates, (np.ndarray, pd.DataFrame)):
+            mask = np.asarray(candidates, dtype=bool)
+            mask = mask | mask.T
+        else:
+            position = {key: i for i, key in enumerate(keys)}
+            mask = np.zeros((n, n), dtype=bool)
+            for stock1, stock2, *_ in candidates:
+                mask[position[stock1], position[stock2]] = True
+                mask[position[stock2], position[stock1]] = True
+        keep = mask[left, right]
+        left, right = left[keep], right[keep]
+
+    # Perform Engle-Granger cointegration tests for all pairs at once
+    _, pvalues = batch_coint(prices.to_numpy(dtype=float), left, right, batch_size=batch_size, n_jobs=n_jobs)
+
+    # Store p-values in matrix
+    pvalue_matrix[left, right] = pvalues
+
+    # If p-value is below significance level, consider them cointegrated
+    pairs = [(keys[i], keys[j], pvalue) for i, j, pvalue in zip(left, right, pvalues) if pvalue < significance]
+
+    # Return list of cointegrated pairs and matrix of p-values
     return pairs, pvalue_matrix
\ No newline at end of file
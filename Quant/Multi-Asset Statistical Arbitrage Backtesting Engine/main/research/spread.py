@@ -1,40 +1,385 @@
-import pandas as pd
-import numpy as np
-
-def compute_beta(S1: pd.Series, S2: pd.Series):
-    """
-    Compute the hedge ratio (beta) between the two time-series using Ordinary Least Squares (OLS).
-
-    Input:
-    - S1: The "dependent" time-series (Long Position)
-    - S2: The "independent" time-series (Short Position)
-
-    Output:
-    - beta (float): Hedge Ratio
-    """
-    # Fit a linear model: y = beta*x + alpha
-    beta = np.polyfit(S2, S1, 1)[0]
-    return beta
-
-def construct_spread(S1: pd.Series, S2: pd.Series):
-    """
-    Construct the spread between the two time-series then normalize it to a z-score.
-
-    Input:
-    - S1: Time-series of price of stock 1 
-    - S2: Time-series of price of stock 2
-
-    Output:
-    - spread (pd.Series): Raw spread: S1 - beta*S2
-    - zscore (pd.Series): Normalized spread
-    """
-    # Compute hedge ratio (beta)
-    beta = compute_beta(S1, S2)
-
-    # Compute raw spread
-    spread = S1 - beta * S2
-
-    # Normalize spread to z-score
-    zscore = (spread - spread.mean()) / spread.std()
-
-    return spread, zscore
\ No newline at end of file
+import pandas as pd
+import numpy as np
+from ..utils.rolling import rolling_sum, first_valid
+
+def compute_beta(S1: pd.Series, S2: pd.Series):
+    """
+    Compute the hedge ratio (beta) between the two time-series using Ordinary Least Squares (OLS).
+
+    Input:
+    - S1: The "dependent" time-series (Long Position)
+    - S2: The "independent" time-series (Short Position)
+
+    Output:
+    - beta (float): Hedge Ratio
+    """
+    # Fit a linear model: y = beta*x + alpha
+    beta = np.polyfit(S2, S1, 1)[0]
+    return beta
+
+def construct_spread(S1: pd.Series, S2: pd.Series):
+    """
+    Construct the spread between the two time-series then normalize it to a z-score.
+
+    Input:
+    - S1: Time-series of price of stock 1 
+    - S2: Time-series of price of stock 2
+
+    Output:
+    - spread (pd.Series): Raw spread: S1 - beta*S2
+    - zscore (pd.Series): Normalized spread
+    """
+    # Compute hedge ratio (beta)
+    beta = compute_beta(S1, S2)
+
+    # Compute raw spread
+    spread = S1 - beta * S2
+
+    # Normalize spread to z-score
+    zscore = (spread - spread.mean()) / spread.std()
+
+    return spread, zscore
+
+def construct_spreads(S1: np.ndarray, S2: np.ndarray, fit_rows: int=None):
+    """
+    Batch version of construct_spread for many pairs at once (one column per pair).
+
+    Input:
+    - S1: Price matrix of the first leg of each pair (time x pairs)
+    - S2: Price matrix of the second leg of each pair (time x pairs)
+    - fit_rows: Estimate the hedge ratio and the z-score mean/std on the first fit_rows rows only
+                (e.g. a training window) and apply them to all rows (None: all rows)
+
+    Output:
+    - spread (np.ndarray): Raw spreads: S1 - beta*S2 (time x pairs)
+    - zscore (np.ndarray): Normalized spreads (time x pairs)
+    - beta (np.ndarray): Hedge ratio of each pair
+    """
+    S1 = np.asarray(S1, dtype=float)
+    S2 = np.asarray(S2, dtype=float)
+
+    fit = slice(0, fit_rows)
+
+    # OLS slope of S1 on S2 for every pair (same estimate as compute_beta)
+    x = S2[fit] - S2[fit].mean(axis=0)
+    y = S1[fit] - S1[fit].mean(axis=0)
+    beta = np.einsum("tp,tp->p", x, y) / np.einsum("tp,tp->p", x, x)
+
+    # Compute raw spreads
+    spread = S1 - beta * S2
+
+    # Normalize spreads to z-scores (sample standard deviation, as pandas)
+    zscore = (spread - spread[fit].mean(axis=0)) / spread[fit].std(axis=0, ddof=1)
+
+    return spread, zscore, beta
+
+def _as_matrix(S):
+    """
+    Convert a Series/DataFrame/array to a float (time x pairs) array.
+    """
+    values = np.asarray(S, dtype=float)
+    return values[:, None] if values.ndim == 1 else values
+
+def _like_input(values: np.ndarray, template):
+    """
+    Wrap a (time x pairs) array back into the type of the original input.
+    """
+    if isinstance(template, pd.Series):
+        return pd.Series(values[:, 0], index=template.index)
+    if isinstance(template, pd.DataFrame):
+        return pd.DataFrame(values, index=template.index, columns=template.columns)
+    return values[:, 0] if np.ndim(template) == 1 else values
+
+def _rolling_sum(values: np.ndarray, window: int):
+    """
+    Rolling sum over the last `window` rows, NaN until the window is full and while it holds a missing value
+    (NaN-masked running sums re-anchored periodically, see utils/rolling.py).
+    """
+    return rolling_sum(values, window)[0]
+
+def rolling_zscore(spread, window: int=60):
+    """
+    Normalize a spread with its trailing rolling mean and standard deviation (no look-ahead).
+
+    Input:
+    - spread: Spread series, or (time x pairs) matrix of spreads
+    - window: Rolling window size
+
+    Output:
+    - zscore: Rolling z-score, same type as spread (NaN until the window is full)
+    """
+    values = _as_matrix(spread)
+
+    # Center on the first observation to limit cancellation in the running sums
+    centered = values - first_valid(values)
+    s = _rolling_sum(centered, window)
+    sq = _rolling_sum(centered**2, window)
+
+    mean = s / window
+    var = np.maximum(sq - s * mean, 0) / (window - 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        zscore = (centered - mean) / np.sqrt(var)
+    return _like_input(zscore, spread)
+
+def construct_rolling_spread(S1, S2, window: int=60, zscore_window: int=None):
+    """
+    Construct spreads with a rolling-window hedge ratio and rolling z-score.
+
+    Each bar only uses data up to and including that bar, so there is no look-ahead.
+    The regressions come from running sums of x, y, x^2 and xy, so each bar costs O(1) per pair,
+    and any number of pairs can be processed at once by passing (time x pairs) matrices.
+
+    Input:
+    - S1: Time-series (or time x pairs matrix) of price of stock 1
+    - S2: Time-series (or time x pairs matrix) of price of stock 2
+    - window: Rolling window for the hedge ratio
+    - zscore_window: Rolling window for the z-score (defaults to window)
+
+    Output:
+    - spread: Raw spread: S1 - beta_t*S2
+    - zscore: Rolling z-score of the spread
+    - beta: Rolling hedge ratio
+    """
+    if zscore_window is None:
+        zscore_window = window
+
+    y = _as_matrix(S1)
+    x = _as_matrix(S2)
+
+    # Hedge ratio is invariant to shifting x and y, center them to limit cancellation
+    # (a bar missing either price is missing for both, so the regressions use complete pairs only)
+    missing = np.isnan(y) | np.isnan(x)
+    yc = np.where(missing, np.nan, y - first_valid(y))
+    xc = np.where(missing, np.nan, x - first_valid(x))
+
+    # Rolling OLS slope: (n*Sxy - Sx*Sy) / (n*Sxx - Sx^2)
+    sx = _rolling_sum(xc, window)
+    sy = _rolling_sum(yc, window)
+    sxx = _rolling_sum(xc * xc, window)
+    sxy = _rolling_sum(xc * yc, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        beta = (window * sxy - sx * sy) / (window * sxx - sx * sx)
+
+    # Compute raw spread
+    spread = y - beta * x
+
+    # Normalize spread with the rolling z-score (valid once both windows are full)
+    zscore = np.full_like(spread, np.nan)
+    start = window - 1
+    if len(spread) > start:
+        zscore[start:] = rolling_zscore(spread[start:], zscore_window)
+
+    return _like_input(spread, S1), _like_input(zscore, S1), _like_input(beta, S1)
+
+def construct_ewm_spread(S1, S2, halflife: float=30, zscore_halflife: float=None, min_periods: int=None):
+    """
+    Construct spreads with an exponentially weighted hedge ratio and z-score.
+
+    Runs EWMSpreadEstimator over the sample, so the batch result is exactly what a live
+    estimator fed bar by bar would produce.
+
+    Input:
+    - S1: Time-series (or time x pairs matrix) of price of stock 1
+    - S2: Time-series (or time x pairs matrix) of price of stock 2
+    - halflife: Half-life (in bars) of the hedge ratio weights
+    - zscore_halflife: Half-life (in bars) of the z-score weights (defaults to halflife)
+    - min_periods: Number of bars before estimates are reported (defaults to halflife)
+
+    Output:
+    - spread: Raw spread: S1 - beta_t*S2
+    - zscore: Exponentially weighted z-score of the spread
+    - beta: Exponentially weighted hedge ratio
+    """
+    y = _as_matrix(S1)
+    x = _as_matrix(S2)
+
+    estimator = EWMSpreadEstimator(y.shape[1], halflife, zscore_halflife, min_periods)
+    spread = np.empty_like(y)
+    zscore = np.empty_like(y)
+    beta = np.empty_like(y)
+    for t in range(len(y)):
+        spread[t], zscore[t], beta[t] = estimator.update(y[t], x[t])
+
+    return _like_input(spread, S1), _like_input(zscore, S1), _like_input(beta, S1)
+
+class RollingSpreadEstimator:
+    """
+    Streaming rolling-window hedge ratio and z-score for many pairs.
+
+    Keeps ring buffers of the last `window` prices and spreads together with their running sums,
+    so each new bar costs O(1) per pair. The sums are re-synchronized from the buffers once per window
+    to stop floating point drift (amortized O(1)).
+    """
+    def __init__(self, n_pairs: int, window: int=60, zscore_window: int=None):
+        self.window = window
+        self.zscore_window = zscore_window if zscore_window is not None else window
+        self.n_updates = 0
+
+        # Ring buffers (oldest value is overwritten by the newest)
+        self._x = np.zeros((window, n_pairs))
+        self._y = np.zeros((window, n_pairs))
+        self._s = np.zeros((self.zscore_window, n_pairs))
+        self._n_spreads = 0
+
+        # Offsets (first observation) subtracted before summing, to limit cancellation
+        self._x0 = None
+        self._y0 = None
+        self._s0 = None
+
+        # Running sums
+        self._sx = np.zeros(n_pairs)
+        self._sy = np.zeros(n_pairs)
+        self._sxx = np.zeros(n_pairs)
+        self._sxy = np.zeros(n_pairs)
+        self._ss = np.zeros(n_pairs)
+        self._sss = np.zeros(n_pairs)
+
+    def update(self, price1: np.ndarray, price2: np.ndarray):
+        """
+        Add one bar of prices for every pair.
+
+        Input:
+        - price1: Latest price of stock 1 of each pair
+        - price2: Latest price of stock 2 of each pair
+
+        Output:
+        - spread (np.ndarray): Spread of each pair at this bar (NaN until window is full)
+        - zscore (np.ndarray): Rolling z-score of each pair (NaN until both windows are full)
+        - beta (np.ndarray): Rolling hedge ratio of each pair
+        """
+        y_raw = np.asarray(price1, dtype=float)
+        x_raw = np.asarray(price2, dtype=float)
+        if self._x0 is None:
+            self._x0, self._y0 = x_raw.copy(), y_raw.copy()
+        x = x_raw - self._x0
+        y = y_raw - self._y0
+        slot = self.n_updates % self.window
+
+        # Swap the oldest observation out of the running sums
+        old_x, old_y = self._x[slot], self._y[slot]
+        self._sx += x - old_x
+        self._sy += y - old_y
+        self._sxx += x * x - old_x * old_x
+        self._sxy += x * y - old_x * old_y
+        self._x[slot], self._y[slot] = x, y
+        self.n_updates += 1
+
+        if self.n_updates % self.window == 0:
+            self._resync()
+
+        n = self.window
+        if self.n_updates < n:
+            nan = np.full_like(x, np.nan)
+            return nan, nan, nan
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            beta = (n * self._sxy - self._sx * self._sy) / (n * self._sxx - self._sx ** 2)
+        spread = y_raw - beta * x_raw
+
+        # Rolling z-score of the spread
+        if self._s0 is None:
+            self._s0 = spread.copy()
+        s = spread - self._s0
+        m = self.zscore_window
+        slot = self._n_spreads % m
+        old_s = self._s[slot]
+        self._ss += s - old_s
+        self._sss += s * s - old_s * old_s
+        self._s[slot] = s
+        self._n_spreads += 1
+        if self._n_spreads % m == 0:
+            self._ss = self._s.sum(axis=0)
+            self._sss = (self._s ** 2).sum(axis=0)
+
+        if self._n_spreads < m:
+            return spread, np.full_like(x, np.nan), beta
+
+        mean = self._ss / m
+        var = np.maximum(self._sss - self._ss * mean, 0) / (m - 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            zscore = (s - mean) / np.sqrt(var)
+        return spread, zscore, beta
+
+    def _resync(self):
+        self._sx = self._x.sum(axis=0)
+        self._sy = self._y.sum(axis=0)
+        self._sxx = (self._x ** 2).sum(axis=0)
+        self._sxy = (self._x * self._y).sum(axis=0)
+
+class EWMSpreadEstimator:
+    """
+    Streaming exponentially weighted hedge ratio and z-score for many pairs.
+
+    Keeps exponentially weighted means of x, y, x^2, xy and of the spread and its square,
+    so each new bar costs O(1) per pair and no history is stored.
+    """
+    def __init__(self, n_pairs: int, halflife: float=30, zscore_halflife: float=None, min_periods: int=None):
+        self.alpha = 1 - 0.5 ** (1 / halflife)
+        self.zscore_alpha = 1 - 0.5 ** (1 / (zscore_halflife if zscore_halflife is not None else halflife))
+        self.min_periods = min_periods if min_periods is not None else int(np.ceil(halflife))
+        self.n_updates = 0
+
+        self._mx = np.zeros(n_pairs)
+        self._my = np.zeros(n_pairs)
+        self._mxx = np.zeros(n_pairs)
+        self._mxy = np.zeros(n_pairs)
+        self._ms = np.zeros(n_pairs)
+        self._mss = np.zeros(n_pairs)
+        self._n_spreads = 0
+
+        # Offsets (first observation) subtracted before averaging, to limit cancellation
+        self._x0 = None
+        self._y0 = None
+        self._s0 = None
+
+    def update(self, price1: np.ndarray, price2: np.ndarray):
+        """
+        Add one bar of prices for every pair.
+
+        Input:
+        - price1: Latest price of stock 1 of each pair
+        - price2: Latest price of stock 2 of each pair
+
+        Output:
+        - spread (np.ndarray): Spread of each pair at this bar
+        - zscore (np.ndarray): Exponentially weighted z-score of each pair
+        - beta (np.ndarray): Exponentially weighted hedge ratio of each pair
+        (spread and beta are NaN for the first min_periods bars, the z-score for twice as long)
+        """
+        y_raw = np.asarray(price1, dtype=float)
+        x_raw = np.asarray(price2, dtype=float)
+        if self._x0 is None:
+            self._x0, self._y0 = x_raw.copy(), y_raw.copy()
+        x = x_raw - self._x0
+        y = y_raw - self._y0
+
+        # First bar initializes the moments, later bars blend in with weight alpha
+        a = self.alpha if self.n_updates else 1.0
+        self._mx += a * (x - self._mx)
+        self._my += a * (y - self._my)
+        self._mxx += a * (x * x - self._mxx)
+        self._mxy += a * (x * y - self._mxy)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            beta = (self._mxy - self._mx * self._my) / (self._mxx - self._mx ** 2)
+        spread = y_raw - beta * x_raw
+
+        self.n_updates += 1
+        if self.n_updates <= self.min_periods:
+            nan = np.full_like(x, np.nan)
+            return nan, nan, nan
+
+        # Spread moments start once the hedge ratio has warmed up, so early unstable betas are not remembered
+        if self._s0 is None:
+            self._s0 = spread.copy()
+        s = spread - self._s0
+        b = self.zscore_alpha if self._n_spreads else 1.0
+        self._ms += b * (s - self._ms)
+        self._mss += b * (s * s - self._mss)
+        self._n_spreads += 1
+        if self._n_spreads < self.min_periods:
+            return spread, np.full_like(x, np.nan), beta
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            zscore = (s - self._ms) / np.sqrt(np.maximum(self._mss - self._ms ** 2, 0))
+        return spread, zscore, beta
\ No newline at end of file
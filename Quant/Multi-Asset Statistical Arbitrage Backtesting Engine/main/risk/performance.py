@@ -1,47 +1,231 @@
-import pandas as pd
-import numpy as np
-
-def sharpe_ratio(returns: pd.Series, risk_free_rate=0.0):
-    """
-    Compute annualized Sharpe Ratio.
-    """
-    return (returns.mean() - risk_free_rate) / returns.std() * np.sqrt(252)
-
-def sortino_ratio(returns: pd.Series, risk_free_rate=0.0):
-    """
-    Compute annualized Sortino Ratio (similar to Sharpe Ratio but penalizes downside volatility).
-    """
-    # Downside Volatility
-    downside_vol = returns[returns<0].std()
-    return (returns.mean() - risk_free_rate) / downside_vol * np.sqrt(252)
-
-def calmar_ratio(returns: pd.Series):
-    """
-    Compute annualized Calmar Ratio (measures return relative to max drawdown).
-    """
-    cumulative = (1+returns).cumprod()
-    peak = cumulative.cummax()
-    drawdown = (peak-cumulative) / peak
-    max_dd = drawdown.max()
-    return (cumulative.pct_change().mean()*252) / max_dd if max_dd>0 else np.nan
-
-def max_drawdown(returns: pd.Series):
-    """
-    Compute max drawdown of a return series.
-    """
-    cumulative = (1+returns).cumprod()
-    peak = cumulative.cummax()
-    drawdown = (peak-cumulative) / peak
-    return drawdown.max()
-
-def hit_rate(returns: pd.Series):
-    """
-    Percentage of periods with positive returns.
-    """
-    return (returns>0).sum() / len(returns)
-
-def turnover(positions: pd.Series):
-    """
-    Measure portfolio turnover as total absolute position changes.
-    """
-    return positions.diff().abs().sum()
\ No newline at end of file
+import pandas as pd
+import numpy as np
+from ..utils.frequency import periods_per_year as infer_periods_per_year
+
+# Annualization: periods_per_year=None infers the number of bars per year from the returns' DatetimeIndex
+# (252 for daily data or without dates, e.g. 98,280 for 1-minute US equity bars), see utils/frequency.py
+
+def sharpe_ratio(returns: pd.Series, risk_free_rate=0.0, periods_per_year=None):
+    """
+    Compute annualized Sharpe Ratio.
+    """
+    periods_per_year = periods_per_year or infer_periods_per_year(returns.index)
+    return (returns.mean() - risk_free_rate) / returns.std() * np.sqrt(periods_per_year)
+
+def sortino_ratio(returns: pd.Series, risk_free_rate=0.0, periods_per_year=None):
+    """
+    Compute annualized Sortino Ratio (similar to Sharpe Ratio but penalizes downside volatility).
+    """
+    periods_per_year = periods_per_year or infer_periods_per_year(returns.index)
+    # Downside Volatility
+    downside_vol = returns[returns<0].std()
+    return (returns.mean() - risk_free_rate) / downside_vol * np.sqrt(periods_per_year)
+
+def calmar_ratio(returns: pd.Series, periods_per_year=None):
+    """
+    Compute annualized Calmar Ratio (measures return relative to max drawdown).
+    """
+    periods_per_year = periods_per_year or infer_periods_per_year(returns.index)
+    cumulative = (1+returns).cumprod()
+    peak = cumulative.cummax()
+    drawdown = (peak-cumulative) / peak
+    max_dd = drawdown.max()
+    return (cumulative.pct_change().mean()*periods_per_year) / max_dd if max_dd>0 else np.nan
+
+def max_drawdown(returns: pd.Series):
+    """
+    Compute max drawdown of a return series.
+    """
+    cumulative = (1+returns).cumprod()
+    peak = cumulative.cummax()
+    drawdown = (peak-cumulative) / peak
+    return drawdown.max()
+
+def hit_rate(returns: pd.Series):
+    """
+    Percentage of periods with positive returns.
+    """
+    return (returns>0).sum() / len(returns)
+
+def turnover(positions: pd.Series):
+    """
+    Measure portfolio turnover as total absolute position changes.
+    """
+    return positions.diff().abs().sum()
+
+def performance_report(returns, positions=None, risk_free_rate=0.0, periods_per_year=None):
+    """
+    Compute every metric above for many strategies in one pass.
+
+    Cumulative equity, peaks and return moments are computed once for the whole (time x strategies) matrix
+    and shared by all metrics, with the same definitions as the single-series functions.
+
+    Inputs:
+    - returns: Return series (Series), or (time x strategies) DataFrame/array, e.g. the pair returns of a backtest
+               or one column per parameter set of a sweep
+    - positions: Optional positions of the same shape, for turnover
+    - risk_free_rate: Per-period risk-free rate
+    - periods_per_year: Number of periods per year used to annualize (None: inferred from the dates)
+
+    Output:
+    - report (pd.DataFrame): One row per strategy, columns total_return, annual_return, annual_volatility,
+                             sharpe, sortino, calmar, max_drawdown, hit_rate, (turnover), and n_obs
+                             (number of non-missing returns the metrics are computed from)
+    """
+    values, columns, index = _as_matrix(returns)
+    periods_per_year = periods_per_year or infer_periods_per_year(index)
+    missing = np.isnan(values)
+    has_missing = missing.any()
+    n_obs = len(values) - missing.sum(axis=0)
+    ann = np.sqrt(periods_per_year)
+
+    # Moments (NaNs skipped, as pandas does; the NaN-aware versions are only used when needed)
+    mean = np.nanmean(values, axis=0) if has_missing else values.mean(axis=0)
+    std = np.nanstd(values, axis=0, ddof=1) if has_missing else values.std(axis=0, ddof=1)
+
+    # Downside volatility: standard deviation of the negative returns only
+    negative = values < 0
+    n_neg = negative.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        neg_mean = np.where(negative, values, 0).sum(axis=0) / n_neg
+        downside_vol = np.sqrt((np.where(negative, values - neg_mean, 0) ** 2).sum(axis=0) / (n_neg - 1))
+
+    # Cumulative equity and drawdown, computed once
+    if has_missing:
+        # As pandas: missing returns leave the equity unchanged but are themselves NaN, and are skipped by
+        # the running peak, the maximum and pct_change (the first equity return after a NaN is NaN)
+        cumulative = np.nancumprod(1 + values, axis=0)
+        total_return = cumulative[-1] - 1
+        cumulative[missing] = np.nan
+        peak = np.fmax.accumulate(cumulative, axis=0)
+        max_dd = np.fmax.reduce((peak - cumulative) / peak, axis=0)
+    else:
+        cumulative = np.cumprod(1 + values, axis=0)
+        total_return = cumulative[-1] - 1
+        peak = np.maximum.accumulate(cumulative, axis=0)
+        max_dd = ((peak - cumulative) / peak).max(axis=0)
+
+    # Calmar uses the mean of the equity's period returns (first period excluded, as cumulative.pct_change())
+    with np.errstate(divide="ignore", invalid="ignore"):
+        equity_returns = cumulative[1:] / cumulative[:-1] - 1
+        sharpe = (mean - risk_free_rate) / std * ann
+        sortino = (mean - risk_free_rate) / downside_vol * ann
+        calmar = np.where(max_dd > 0, np.nanmean(equity_returns, axis=0) * periods_per_year / max_dd, np.nan)
+
+    report = pd.DataFrame({
+        'total_return': total_return,
+        'annual_return': mean * periods_per_year,
+        'annual_volatility': std * ann,
+        'sharpe': sharpe,
+        'sortino': sortino,
+        'calmar': calmar,
+        'max_drawdown': max_dd,
+        'hit_rate': (values > 0).sum(axis=0) / len(values)
+    }, index=columns)
+
+    if positions is not None:
+        position_values, _, _ = _as_matrix(positions)
+        report['turnover'] = np.nansum(np.abs(np.diff(position_values, axis=0)), axis=0)
+    report['n_obs'] = n_obs
+    return report
+
+def rolling_performance(returns, window: int=63, positions=None, risk_free_rate=0.0, periods_per_year=None):
+    """
+    Rolling-window versions of the metrics for many strategies at once.
+
+    Rolling sums of returns, squared returns and downside returns are computed from cumulative sums (O(1) per bar),
+    and the rolling maximum drawdown from one sweep over the lags of the window (O(window) per bar).
+
+    Inputs:
+    - returns: Return series (Series), or (time x strategies) DataFrame/array
+    - window: Rolling window size
+    - positions: Optional positions of the same shape, for rolling turnover
+    - risk_free_rate: Per-period risk-free rate
+    - periods_per_year: Number of periods per year used to annualize (None: inferred from the dates)
+
+    Output:
+    - rolling (dict): Metric name (annual_return, annual_volatility, sharpe, sortino, calmar, max_drawdown, hit_rate, (turnover))
+                      -> (time x strategies) DataFrame, NaN until the window is full
+                      (calmar of a window is calmar_ratio of the window's returns)
+    """
+    values, columns, index = _as_matrix(returns)
+    periods_per_year = periods_per_year or infer_periods_per_year(index)
+    values = np.nan_to_num(values)
+    ann = np.sqrt(periods_per_year)
+    n = window
+
+    names = ['annual_return', 'annual_volatility', 'sharpe', 'sortino', 'calmar', 'max_drawdown', 'hit_rate']
+    names += ['turnover'] if positions is not None else []
+    if n > len(values):
+        # The window is never full
+        return {name: pd.DataFrame(np.nan, index=index, columns=columns) for name in names}
+
+    def rolling_sum(x):
+        # Sum over the last `window` rows, NaN until the window is full
+        csum = np.cumsum(x, axis=0)
+        out = np.full(x.shape, np.nan)
+        out[n-1] = csum[n-1]
+        out[n:] = csum[n:] - csum[:-n]
+        return out
+
+    negative = values < 0
+    s = rolling_sum(values)
+    sq = rolling_sum(values ** 2)
+    n_neg = rolling_sum(negative.astype(float))
+    s_neg = rolling_sum(np.where(negative, values, 0))
+    sq_neg = rolling_sum(np.where(negative, values ** 2, 0))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = s / n
+        std = np.sqrt(np.maximum(sq - s * mean, 0) / (n - 1))
+        downside_vol = np.sqrt(np.maximum(sq_neg - s_neg ** 2 / n_neg, 0) / (n_neg - 1))
+        sharpe = (mean - risk_free_rate) / std * ann
+        sortino = (mean - risk_free_rate) / downside_vol * ann
+
+    # Rolling maximum drawdown: for the window ending at t, the worst ratio of equity at u to its peak since the window start.
+    # ratio holds equity[u] / max(equity[u-k..u]) for the current lag k, and the window start is k bars before u.
+    cumulative = np.cumprod(1 + values, axis=0)
+    running_peak = cumulative.copy()
+    worst = np.full(values.shape, np.inf)
+    for k in range(n):
+        if k:
+            np.maximum(running_peak[k:], cumulative[:-k], out=running_peak[k:])
+        # u = t - (n-1-k), so the value at u is moved n-1-k rows forward
+        shift = n - 1 - k
+        ratio = cumulative[k:] / running_peak[k:]
+        np.minimum(worst[k + shift:], ratio[:len(ratio) - shift], out=worst[k + shift:])
+    max_dd = 1 - worst
+    max_dd[:n-1] = np.nan
+
+    # Calmar as calmar_ratio and performance_report: mean of the window equity's period returns, i.e. of the
+    # window's returns without its first one
+    equity_mean = np.full(values.shape, np.nan)
+    equity_mean[n-1:] = (s[n-1:] - values[:len(values)-n+1]) / (n - 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        calmar = np.where(max_dd > 0, equity_mean * periods_per_year / max_dd, np.nan)
+
+    rolling = {
+        'annual_return': mean * periods_per_year,
+        'annual_volatility': std * ann,
+        'sharpe': sharpe,
+        'sortino': sortino,
+        'calmar': calmar,
+        'max_drawdown': max_dd,
+        'hit_rate': rolling_sum((values > 0).astype(float)) / n
+    }
+    if positions is not None:
+        position_values, _, _ = _as_matrix(positions)
+        trades = np.zeros_like(position_values)
+        trades[1:] = np.abs(np.diff(position_values, axis=0))
+        rolling['turnover'] = rolling_sum(np.nan_to_num(trades))
+    return {name: pd.DataFrame(metric, index=index, columns=columns) for name, metric in rolling.items()}
+
+def _as_matrix(data):
+    # (time x strategies) float array with its column labels and index
+    if isinstance(data, pd.Series):
+        return data.to_numpy(dtype=float)[:, None], [data.name if data.name is not None else 0], data.index
+    if isinstance(data, pd.DataFrame):
+        return data.to_numpy(dtype=float), data.columns, data.index
+    values = np.asarray(data, dtype=float)
+    values = values[:, None] if values.ndim == 1 else values
+    return values, pd.RangeIndex(values.shape[1]), pd.RangeIndex(values.shape[0])
@@ -1,61 +1,202 @@
-import pandas as pd
-import numpy as np
-
-class RiskManager:
-    """
-    Applies portfolio-level risk controls to limit losses and exposure.
-
-    Controls being Implemented:
-    - Maximum Drawdown Stop
-    - Maximum Leverage Cap
-    """
-    def __init__(self, max_drawdown=0.2, max_leverage=3.0):
-        self.max_drawdown = max_drawdown
-        self.max_leverage = max_leverage
-
-    def enforce_drawdown(self, pnl: pd.Series):
-        """
-        Enforce a maximum drawdown rule.
-        If the current drawdown exceeds the allowed limit, halt the strategy (flatten all positions)
-        
-        Inputs:
-        - pnl: Cumulative PnL
-
-        Outputs:
-        - pnl (pd.Series): If within limits, return original pnl. Else, returns a zero series indicating trading has stopped.
-        """
-        # Track peak of PnL 
-        peak = pnl.cummax() 
-
-        # Compute drawdown as percentage of peak
-        drawdown = (peak-pnl) / peak
-
-        # If latest drawdown exceeds limit, stop trading (flatten all position)
-        if drawdown.iloc[-1] > self.max_drawdown:
-            return pd.Series(0, index=pnl.index)
-        # Else return original PnL
-        return pnl
-    
-    def enforce_leverage(self, positions: pd.Series, max_leverage=None):
-        """
-        Enforce a maximum levereage constraint on portfolio positions.
-
-        Inputs:
-        - positions: Portfolio positions
-        - max_leverage: Override default leverage limit (if entered)
-
-        Outputs:
-        - positions: If limit not exceeded, return original positions. Else, return scaled positions.
-        """
-        if max_leverage is None:
-            max_leverage = self.max_leverage
-
-        # Total Leverage = sum of absolute positions
-        total_leverage = np.abs(positions).sum()
-
-        # Scale positions proportionally if leverage is too high
-        if total_leverage > max_leverage:
-            scaling = max_leverage / total_leverage
-            return positions * scaling
-        # If leverage limit not exceeded
-        return positions
\ No newline at end of file
+import pandas as pd
+import numpy as np
+
+class RiskManager:
+    """
+    Applies portfolio-level risk controls to limit losses and exposure.
+
+    Controls being Implemented:
+    - Maximum Drawdown Stop
+    - Maximum Leverage Cap
+    - Per-pair Z-score Stop (a pair is flattened once its |z-score| reaches pair_stop_zscore,
+      and stays flat until its signal goes flat or changes side)
+
+    The controls can be applied bar by bar (reset + step, O(pairs) state updates per bar)
+    or to whole (time x pairs) arrays at once (apply_limits + drawdown_breach), with the same results
+    (given the same legs: gross exposure counts legs x |position|, 2 for pairs).
+    """
+    def __init__(self, max_drawdown=0.2, max_leverage=3.0, pair_stop_zscore=None):
+        self.max_drawdown = max_drawdown
+        self.max_leverage = max_leverage
+        self.pair_stop_zscore = pair_stop_zscore # None: no per-pair stop
+        self.reset(0)
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Build a RiskManager from a RiskConfig (config/settings.py).
+        """
+        return cls(max_drawdown=config.max_drawdown,
+                   max_leverage=config.max_leverage,
+                   pair_stop_zscore=config.pair_stop_zscore)
+
+    def enforce_drawdown(self, pnl: pd.Series):
+        """
+        Enforce a maximum drawdown rule.
+        If the drawdown exceeds the allowed limit, halt the strategy (flatten all positions) from that point onward.
+
+        Inputs:
+        - pnl: Cumulative PnL
+
+        Outputs:
+        - pnl (pd.Series): If within limits, return original pnl. Else, the pnl up to the first breach,
+                           held constant afterwards indicating trading has stopped.
+        """
+        # Track peak of PnL
+        peak = pnl.cummax()
+
+        # Compute drawdown as percentage of peak
+        drawdown = (peak-pnl) / peak
+
+        # If drawdown exceeds limit, stop trading (flatten all positions) from the first breach onward
+        breaches = np.flatnonzero((drawdown > self.max_drawdown).to_numpy())
+        if breaches.size:
+            pnl = pnl.copy()
+            pnl.iloc[breaches[0]:] = pnl.iloc[breaches[0]]
+        # Else return original PnL
+        return pnl
+
+    def enforce_leverage(self, positions: pd.Series, max_leverage=None, legs: int=1):
+        """
+        Enforce a maximum levereage constraint on portfolio positions.
+
+        Inputs:
+        - positions: Portfolio positions
+        - max_leverage: Override default leverage limit (if entered)
+        - legs: Number of legs of equal notional behind each position (2 for pairs, see apply_limits)
+
+        Outputs:
+        - positions: If limit not exceeded, return original positions. Else, return scaled positions.
+        """
+        if max_leverage is None:
+            max_leverage = self.max_leverage
+
+        # Total Leverage = sum of absolute positions of all legs
+        total_leverage = legs * np.abs(positions).sum()
+
+        # Scale positions proportionally if leverage is too high
+        if total_leverage > max_leverage:
+            scaling = max_leverage / total_leverage
+            return positions * scaling
+        # If leverage limit not exceeded
+        return positions
+
+    def reset(self, n_pairs: int):
+        """
+        Start a new bar-by-bar run.
+
+        Input:
+        - n_pairs: Number of pairs whose positions are passed to step
+        """
+        self.equity = 1.0
+        self.peak = 1.0
+        self.halted = False
+        self._side = np.zeros(n_pairs, dtype=np.int8) # Side of each pair's current trade
+        self._stopped = np.zeros(n_pairs, dtype=bool) # Pairs stopped out of their current trade
+
+    def step(self, positions: np.ndarray, bar_return: float=0.0, zscores: np.ndarray=None, max_leverage=None, legs: int=1):
+        """
+        Apply all controls to one bar of desired positions.
+
+        Steps:
+        1) Update equity with the return realized over the bar and halt trading on a drawdown breach
+        2) Stop out pairs whose |z-score| reached pair_stop_zscore (until their trade ends)
+        3) Cap gross exposure at the leverage limit
+
+        Inputs:
+        - positions: Desired position of each pair at this bar
+        - bar_return: Portfolio return realized over this bar (from the previous bar's positions)
+        - zscores: Z-score of each pair at this bar (needed for the per-pair stop)
+        - max_leverage: Override default leverage limit (if entered)
+        - legs: Number of legs of equal notional behind each position (2 for pairs, see apply_limits)
+
+        Outputs:
+        - positions (np.ndarray): Positions allowed at this bar
+        """
+        positions = np.array(positions, dtype=float)
+
+        # 1) Drawdown stop (peak starts at the initial capital)
+        self.equity *= 1 + bar_return
+        self.peak = max(self.peak, self.equity)
+        if 1 - self.equity / self.peak > self.max_drawdown:
+            self.halted = True
+        if self.halted:
+            return np.zeros_like(positions)
+
+        # 2) Per-pair stop: a new trade (flat or other side) clears the stop, a z-score breach sets it
+        side = np.sign(positions).astype(np.int8)
+        self._stopped &= side == self._side
+        self._side = side
+        if self.pair_stop_zscore is not None and zscores is not None:
+            self._stopped |= (np.abs(zscores) >= self.pair_stop_zscore) & (side != 0)
+        positions[self._stopped] = 0
+
+        # 3) Leverage cap
+        return self.enforce_leverage(positions, max_leverage, legs)
+
+    def apply_limits(self, positions: np.ndarray, zscores: np.ndarray=None, max_leverage=None, state: dict=None, legs: int=1):
+        """
+        Apply the per-pair z-score stop and the leverage cap to a whole (time x pairs) position array
+        (the same as step on every bar, without the drawdown stop, see drawdown_breach).
+
+        Inputs:
+        - positions: Desired positions (time x pairs)
+        - zscores: Z-scores (time x pairs), needed for the per-pair stop
+        - max_leverage: Override default leverage limit (if entered)
+        - state: Optional dict carrying the side and stop flag of each pair's open trade from one call to the next,
+                 so consecutive time blocks give the same result as one call (updated in place)
+        - legs: Number of legs of equal notional behind each position, counted in the gross exposure
+                (2 for a dollar-neutral pair: |position| long S1 and |position| short S2)
+
+        Outputs:
+        - positions (np.ndarray): Allowed positions (time x pairs)
+        """
+        if max_leverage is None:
+            max_leverage = self.max_leverage
+        positions = np.array(positions, dtype=float)
+
+        if self.pair_stop_zscore is not None and zscores is not None:
+            # Number each trade (run of bars on the same side) of every pair
+            side = np.sign(positions)
+            new_trade = np.ones(side.shape, dtype=bool)
+            new_trade[1:] = side[1:] != side[:-1]
+            trade_id = np.cumsum(new_trade, axis=0)
+
+            # A pair is stopped from the first breach of its current trade until the trade ends
+            with np.errstate(invalid="ignore"):
+                breach = (np.abs(zscores) >= self.pair_stop_zscore) & (side != 0)
+            if state is not None and 'side' in state and len(side):
+                # A trade stopped in the previous block stays stopped while it continues
+                breach[0] |= state['stopped'] & (side[0] == state['side']) & (side[0] != 0)
+            last_breached_trade = np.maximum.accumulate(np.where(breach, trade_id, 0), axis=0)
+            stopped = last_breached_trade == trade_id
+            positions[stopped] = 0
+            if state is not None and len(side):
+                state['side'] = side[-1].copy()
+                state['stopped'] = stopped[-1] & (side[-1] != 0)
+
+        # Leverage cap on gross exposure (all legs) at each bar
+        gross = legs * np.abs(positions).sum(axis=1)
+        with np.errstate(divide="ignore"):
+            positions *= np.minimum(max_leverage / gross, 1.0)[:, None]
+        return positions
+
+    def drawdown_breach(self, returns: np.ndarray, initial_equity=1.0, initial_peak=1.0):
+        """
+        First bar at which the drawdown limit is breached.
+
+        Input:
+        - returns: Portfolio returns (time), or (time x strategies) to check many runs (e.g. a parameter sweep) at once
+        - initial_equity, initial_peak: Equity and peak before the first return (to continue from a previous time block)
+
+        Output:
+        - breach: Row of the first breach (len(returns) if never breached), an int or one per strategy
+        """
+        returns = np.asarray(returns, dtype=float)
+        equity = initial_equity * np.cumprod(1 + returns, axis=0)
+        peak = np.maximum(np.maximum.accumulate(equity, axis=0), initial_peak)
+        breached = 1 - equity / peak > self.max_drawdown
+
+        # argmax finds the first True, columns without any breach get len(returns)
+        breach = np.where(breached.any(axis=0), breached.argmax(axis=0), len(returns))
+        return int(breach) if breach.ndim == 0 else breach
@@ -1,62 +1,111 @@
-import pandas as pd
-import numpy as np
-from .signal_utils import debounce_signals
-
-def generate_signals(zscore: pd.Series,
-                     entry_threshold: float=2.0,
-                     exit_threshold: float=0.5,
-                     max_hold: int=None):
-    """
-    Generate long/short trading signals based on spread z-score.
-
-    Trading Logic:
-    - Long if z-score <= -entry_threshold
-    - Short if z-score >= entry_threshold
-    - Exit if |z-score| <= exit_threshold or max holding period is reached
-
-    Input:
-    - zscore: Normalized spread (z-score)
-    - entry_threshold: Absolute z-score required to enter a position
-    - exit_threshold: Absolute z-score required to exit a position
-    - max_hold: Maximum holding period of a position
-
-    Output:
-    - signals (pd.Series): Position signals (-1:Short, 0:Flat, 1:Long)
-    """
-    # Initialize signal series
-    signals = pd.Series(0, index=zscore.index)
-
-    # Set entry conditions
-    long_mask = zscore <= -entry_threshold # Oversold: expect mean reversion upward
-    short_mask = zscore >= entry_threshold # Overbought: expect mean reversion downward
-
-    # Set exit condition
-    exit_mask = zscore.abs() <= exit_threshold # Mean reversion reached
-
-    position = 0 # Current position
-    hold_counter = 0 # Track how long position has been held
-
-    # Iterate through time
-    for t in range(len(zscore)):
-        # Enter new position if flat
-        if position==0:
-            if long_mask.iloc[t]:
-                position = 1
-            elif short_mask.iloc[t]:
-                position = -1
-        
-        elif position!=0:
-            # Increase holding period count
-            hold_counter += 1
-
-            # Exit position if spread has reverted or max holding period is exceeded
-            if exit_mask.iloc[t] or (max_hold is not None and hold_counter >= max_hold):
-                # Reset position and hold_counter
-                position = 0
-                hold_counter = 0
-
-        # Record position for this time
-        signals.iloc[t] = position
-    
-    # Debounce signals
-    return debounce_signals(signals)
\ No newline at end of file
+import pandas as pd
+import numpy as np
+from .signal_utils import debounce_signals_matrix
+
+def generate_signals(zscore: pd.Series,
+                     entry_threshold: float=2.0,
+                     exit_threshold: float=0.5,
+                     max_hold: int=None,
+                     min_gap: int=1):
+    """
+    Generate long/short trading signals based on spread z-score.
+
+    Trading Logic:
+    - Long if z-score <= -entry_threshold
+    - Short if z-score >= entry_threshold
+    - Exit if |z-score| <= exit_threshold or max holding period is reached
+
+    Input:
+    - zscore: Normalized spread (z-score)
+    - entry_threshold: Absolute z-score required to enter a position
+    - exit_threshold: Absolute z-score required to exit a position
+    - max_hold: Maximum holding period of a position
+    - min_gap: Minimum number of periods between position changes (see debounce_signals)
+
+    Output:
+    - signals (pd.Series): Position signals (-1:Short, 0:Flat, 1:Long)
+    """
+    signals = generate_signals_matrix(zscore.to_numpy(dtype=float)[:, None],
+                                      entry_threshold=entry_threshold,
+                                      exit_threshold=exit_threshold,
+                                      max_hold=max_hold,
+                                      min_gap=min_gap)
+    return pd.Series(signals[:, 0].astype(np.int64), index=zscore.index)
+
+def generate_signals_matrix(zscore: np.ndarray,
+                            entry_threshold=2.0,
+                            exit_threshold=0.5,
+                            max_hold=None,
+                            min_gap=1,
+                            state: dict=None):
+    """
+    Generate signals for every column of a (time x pairs) z-score matrix in one call.
+
+    The hysteresis state machine of generate_signals runs bar by bar over all columns together,
+    so a column gives exactly the same signals as generate_signals on that series.
+    Thresholds may be scalars or one value per column (e.g. one column per parameter combination).
+
+    Input:
+    - zscore: Normalized spreads (time x pairs)
+    - entry_threshold: Absolute z-score required to enter a position
+    - exit_threshold: Absolute z-score required to exit a position
+    - max_hold: Maximum holding period of a position (None or NaN: no limit)
+    - min_gap: Minimum number of periods between position changes
+    - state: Optional dict carrying the open positions and holding periods (and debounce state) from one call
+             to the next, so a long series can be processed in consecutive time blocks (updated in place)
+
+    Output:
+    - signals (np.ndarray): Position signals (-1:Short, 0:Flat, 1:Long) as int8 (time x pairs)
+    """
+    zscore = np.asarray(zscore, dtype=float)
+    n_cols = zscore.shape[1]
+    entry_threshold = np.broadcast_to(np.asarray(entry_threshold, dtype=float), (n_cols,))
+    exit_threshold = np.broadcast_to(np.asarray(exit_threshold, dtype=float), (n_cols,))
+    if max_hold is None:
+        max_hold = np.inf
+    max_hold = np.broadcast_to(np.asarray(max_hold, dtype=float), (n_cols,))
+    max_hold = np.where(np.isnan(max_hold), np.inf, max_hold)
+
+    # Set entry conditions
+    long_mask = zscore <= -entry_threshold # Oversold: expect mean reversion upward
+    short_mask = zscore >= entry_threshold # Overbought: expect mean reversion downward
+
+    # Set exit condition
+    exit_mask = np.abs(zscore) <= exit_threshold # Mean reversion reached
+
+    signals = np.empty(zscore.shape, dtype=np.int8)
+    position = np.zeros(n_cols, dtype=np.int8) # Current positions
+    hold_counter = np.zeros(n_cols, dtype=np.int64) # Track how long positions have been held
+    if state is not None and 'position' in state:
+        # Continue from the end of the previous block
+        position[:] = state['position']
+        hold_counter[:] = state['hold_counter']
+
+    # Iterate through time, all columns at once
+    for t in range(len(zscore)):
+        flat = position == 0
+        held = ~flat
+
+        # Increase holding period count of open positions
+        hold_counter[held] += 1
+
+        # Exit positions if spread has reverted or max holding period is exceeded
+        exit_now = held & (exit_mask[t] | (hold_counter >= max_hold))
+
+        # Enter new positions if flat
+        position[flat & long_mask[t]] = 1
+        position[flat & ~long_mask[t] & short_mask[t]] = -1
+
+        # Reset positions and hold counters
+        position[exit_now] = 0
+        hold_counter[exit_now] = 0
+
+        # Record positions for this time
+        signals[t] = position
+
+    if state is not None:
+        state['position'] = position.copy()
+        state['hold_counter'] = hold_counter.copy()
+
+    # Debounce signals
+    return debounce_signals_matrix(signals, min_gap=min_gap, state=state)
\ No newline at end of file
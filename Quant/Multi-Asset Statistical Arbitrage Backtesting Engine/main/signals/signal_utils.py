@@ -1,30 +1,65 @@
-import pandas as pd
-
-def debounce_signals(signals: pd.Series, min_gap: int=1):
-    """
-    Debounce (limit how often a function is executed) trading signals to prevent rapid consecutive entries.
-    This function enforces a minumum gap of 1 between changes in position (-1 to 0, 0 to 1, etc., but not -1 to 1 and 1 to -1), helping to reduce noise, overtrading and whipsaw behavior.
-    
-    Input:
-    - signals: Raw position signals (-1, 0, 1)
-    - min_gap: Minimum number of periods required between consecutive position changes
-
-    Output:
-    - debounced (pd.Series): Debounced position signals i.e. if original = (0,1,-1,1) then debounced = (0,1,0,1)
-    """
-    last_signal = 0 # Last accepted signal value
-    counter = 0 
-    debounced = signals.copy()
-
-    for t in range(len(signals)):
-        # Detect change in signal
-        if signals.iloc[t] != last_signal:
-            # If change happens too soon after the previous one, suppress it
-            if counter < min_gap and last_signal != 0:
-                debounced.iloc[t] = 0
-            else:
-                # Accept new signal
-                last_signal = signals.iloc[t]
-                counter = 0
-        counter += 1
+import pandas as pd
+import numpy as np
+
+def debounce_signals(signals: pd.Series, min_gap: int=1):
+    """
+    Debounce (limit how often a function is executed) trading signals to prevent rapid consecutive entries.
+    This function enforces a minumum gap of 1 between changes in position (-1 to 0, 0 to 1, etc., but not -1 to 1 and 1 to -1), helping to reduce noise, overtrading and whipsaw behavior.
+
+    Input:
+    - signals: Raw position signals (-1, 0, 1)
+    - min_gap: Minimum number of periods required between consecutive position changes
+
+    Output:
+    - debounced (pd.Series): Debounced position signals i.e. if original = (0,1,-1,1) then debounced = (0,1,0,1)
+    """
+    debounced = debounce_signals_matrix(signals.to_numpy()[:, None], min_gap=min_gap)[:, 0]
+    return pd.Series(debounced, index=signals.index, name=signals.name)
+
+def debounce_signals_matrix(signals: np.ndarray, min_gap=1, state: dict=None):
+    """
+    Debounce every column of a (time x pairs) signal matrix at once.
+    Same rule as debounce_signals, applied bar by bar to all columns together.
+
+    Input:
+    - signals: Raw position signals (time x pairs)
+    - min_gap: Minimum gap between accepted changes, a scalar or one value per column
+    - state: Optional dict carrying the last accepted signals and counters to the next call (updated in place)
+
+    Output:
+    - debounced (np.ndarray): Debounced position signals, same shape and dtype as signals
+    """
+    signals = np.asarray(signals)
+    debounced = signals.copy()
+    min_gap = np.broadcast_to(np.asarray(min_gap), signals.shape[1:])
+
+    # The counter is always >= 1 when a change is checked against a non-zero signal,
+    # so a gap of 1 (or less) never suppresses anything
+    if np.all(min_gap <= 1):
+        return debounced
+
+    last_signal = np.zeros(signals.shape[1:], dtype=signals.dtype) # Last accepted signal value
+    counter = np.zeros(signals.shape[1:], dtype=np.int64)
+    if state is not None and 'last_signal' in state:
+        # Continue from the end of the previous block
+        last_signal[:] = state['last_signal']
+        counter[:] = state['counter']
+
+    for t in range(len(signals)):
+        # Detect change in signal
+        change = signals[t] != last_signal
+
+        # If change happens too soon after the previous one, suppress it
+        suppress = change & (counter < min_gap) & (last_signal != 0)
+        debounced[t][suppress] = 0
+
+        # Else, accept new signal
+        accept = change & ~suppress
+        last_signal[accept] = signals[t][accept]
+        counter[accept] = 0
+        counter += 1
+
+    if state is not None:
+        state['last_signal'] = last_signal
+        state['counter'] = counter
     return debounced
\ No newline at end of file
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252 # Trading days per year (markets closed on weekends)
+CALENDAR_DAYS = 365 # Days per year for markets trading every day (e.g. crypto)
+
+def periods_per_year(index, default: float=TRADING_DAYS):
+    """
+    Infer the number of bars per year from the timestamps of the data, used to annualize returns and ratios.
+
+    Rules:
+    - Intraday bars: median number of bars per day x trading days per year (e.g. 390 x 252 for 1-minute US equities)
+    - Daily bars: 252 (365 if the data has weekend bars)
+    - Lower frequencies: 365.25 / median spacing in days, rounded (52 weekly, 12 monthly, 4 quarterly, 1 yearly)
+
+    Inputs:
+    - index: Timestamps of the bars (DatetimeIndex); anything else gives the default
+    - default: Value returned when the frequency cannot be inferred (no dates, fewer than 3 bars)
+
+    Outputs:
+    - periods (float): Number of bars per year
+    """
+    if not isinstance(index, pd.DatetimeIndex) or len(index) < 3:
+        return default
+
+    # Median spacing between bars, in days
+    stamps = index.as_unit("ns").asi8
+    spacing = np.median(np.diff(stamps)) / (86400 * 1e9)
+    if spacing <= 0:
+        return default
+
+    # Weekend bars mean the market trades every day
+    days_per_year = CALENDAR_DAYS if (index.dayofweek >= 5).any() else TRADING_DAYS
+
+    if spacing < 1:
+        # Intraday: count the bars of each trading day
+        _, bars_per_day = np.unique(index.normalize().as_unit("ns").asi8, return_counts=True)
+        return float(np.median(bars_per_day) * days_per_year)
+    if spacing < 4:
+        # Daily (a weekend gap is at most 3 days, and is never the median spacing)
+        return float(days_per_year)
+    return float(max(round(365.25 / spacing), 1))
+
+def annualization_factor(index, default: float=TRADING_DAYS):
+    """
+    Square root of periods_per_year, the factor that annualizes a per-bar Sharpe ratio or volatility.
+    """
+    return np.sqrt(periods_per_year(index, default))
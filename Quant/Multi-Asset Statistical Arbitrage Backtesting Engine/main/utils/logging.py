@@ -1,21 +1,24 @@
-import logging
-from pathlib import Path
-
-LOG_DIR = Path("logs")
-LOG_DIR.mkdir(exist_ok=True)
-
-def get_logger(name:str) -> logging.Logger:
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
-    
-    formatter = logging.Formatter(
-        "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
-    )
-    
-    file_handler = logging.FileHandler(LOG_DIR / f"{name}.log")
-    file_handler.setFormatter(formatter)
-    
-    if not logger.handlers:
-        logger.addHandler(file_handler)
-    
+import logging
+from pathlib import Path
+
+def get_logger(name:str, log_dir=None) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+
+    if not logger.handlers:
+        # Log folder is created on first use (default: PathConfig().log_dir)
+        if log_dir is None:
+            from ..config.settings import PathConfig
+            log_dir = PathConfig().log_dir
+        log_dir = Path(log_dir)
+        log_dir.mkdir(parents=True, exist_ok=True)
+
+        formatter = logging.Formatter(
+            "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+        )
+
+        file_handler = logging.FileHandler(log_dir / f"{name}.log")
+        file_handler.setFormatter(formatter)
+        logger.addHandler(file_handler)
+
     return logger
\ No newline at end of file
@@ -0,0 +1,197 @@
+import os
+import json
+import time
+import threading
+import tracemalloc
+import pandas as pd
+from pathlib import Path
+from functools import wraps
+from contextlib import contextmanager
+
+class Profiler:
+    """
+    Lightweight instrumentation for pipeline stages.
+
+    Records:
+    - Spans: named, nested timing intervals (context manager `span` or decorator `timed`)
+    - Counters: running totals of rows, pairs, bars, ... processed (`count`)
+    - Peak memory of each span (optional, through tracemalloc, which slows the profiled code down;
+      if the profiler starts tracing, it stops it when the outermost span exits)
+
+    Spans can be summarized per name, exported as JSON, or as a Chrome trace (chrome://tracing, Perfetto).
+    A disabled profiler records nothing and costs almost nothing, so code can always be instrumented.
+    """
+    def __init__(self, name: str="pipeline", enabled: bool=True, trace_memory: bool=False, logger=None):
+        self.name = name
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self.logger = logger
+        self.reset()
+
+    def reset(self):
+        """
+        Drop all recorded spans and counters.
+        """
+        self.spans = []
+        self.counters = {}
+        self._origin = time.perf_counter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # Memory-traced spans open in any thread, and whether this profiler started tracemalloc
+        self._memory_spans = 0
+        self._started_tracing = False
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """
+        Time the enclosed block.
+
+        Inputs:
+        - name: Span name (e.g. "signals")
+        - attributes: Extra JSON-serializable details stored with the span (e.g. n_pairs=500)
+        """
+        if not self.enabled:
+            yield
+            return
+
+        stack = self._stack()
+        memory = self.trace_memory
+        if memory:
+            with self._lock:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    self._started_tracing = True
+                self._memory_spans += 1
+            # Keep the enclosing span's peak before resetting the peak for this span
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+            tracemalloc.reset_peak()
+            frame = {'name': name, 'peak': 0, 'base': current}
+        else:
+            frame = {'name': name}
+        stack.append(frame)
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            stack.pop()
+            record = {
+                'name': name,
+                'start': start - self._origin,
+                'seconds': end - start,
+                'depth': len(stack),
+                'parent': stack[-1]['name'] if stack else None,
+                'thread': threading.get_ident(),
+                'attributes': attributes
+            }
+            if memory:
+                # Peak above the memory in use when the span started, including nested spans
+                peak = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+                record['peak_memory_mb'] = max(peak - frame['base'], 0) / 1e6
+                if stack:
+                    stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+                # Tracing started by the profiler stops with the last open span (it slows everything down)
+                with self._lock:
+                    self._memory_spans -= 1
+                    if self._memory_spans == 0 and self._started_tracing:
+                        tracemalloc.stop()
+                        self._started_tracing = False
+            with self._lock:
+                self.spans.append(record)
+            if self.logger is not None:
+                self.logger.info(f"{self.name} | {name} | {record['seconds']:.4f}s")
+
+    def timed(self, name: str=None):
+        """
+        Decorator timing every call of a function as a span (default name: the function's name).
+        """
+        def decorator(func):
+            span_name = name or func.__qualname__
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count(self, name: str, value=1):
+        """
+        Add value to a counter (e.g. count("bars", len(prices))).
+        """
+        if self.enabled:
+            with self._lock:
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def summary(self):
+        """
+        Aggregate the spans by name.
+
+        Output:
+        - (pd.DataFrame): One row per span name, columns calls, total_seconds, mean_seconds, max_seconds
+                          (and peak_memory_mb when memory is traced), slowest first
+        """
+        if not self.spans:
+            return pd.DataFrame(columns=['calls', 'total_seconds', 'mean_seconds', 'max_seconds'])
+        spans = pd.DataFrame(self.spans)
+        aggregations = {
+            'calls': ('seconds', 'size'),
+            'total_seconds': ('seconds', 'sum'),
+            'mean_seconds': ('seconds', 'mean'),
+            'max_seconds': ('seconds', 'max')
+        }
+        if 'peak_memory_mb' in spans:
+            aggregations['peak_memory_mb'] = ('peak_memory_mb', 'max')
+        return spans.groupby('name').agg(**aggregations).sort_values('total_seconds', ascending=False)
+
+    def to_dict(self):
+        return {'name': self.name, 'spans': self.spans, 'counters': self.counters}
+
+    def to_json(self, path=None):
+        """
+        Export spans and counters as JSON (written to path if given).
+        """
+        text = json.dumps(self.to_dict(), indent=2, default=str)
+        if path is not None:
+            Path(path).write_text(text)
+        return text
+
+    def to_chrome_trace(self, path=None):
+        """
+        Export spans and counters in the Chrome trace event format (written to path if given).
+
+        Spans become complete ("X") events and counters one counter ("C") event at the end of the trace,
+        with timestamps in microseconds since the profiler was created.
+        """
+        pid = os.getpid()
+        events = []
+        for span in self.spans:
+            args = dict(span['attributes'])
+            if 'peak_memory_mb' in span:
+                args['peak_memory_mb'] = span['peak_memory_mb']
+            events.append({
+                'name': span['name'],
+                'cat': self.name,
+                'ph': "X",
+                'ts': span['start'] * 1e6,
+                'dur': span['seconds'] * 1e6,
+                'pid': pid,
+                'tid': span['thread'],
+                'args': args
+            })
+        if self.counters:
+            end = max((s['start'] + s['seconds'] for s in self.spans), default=0.0)
+            events.append({'name': "counters", 'ph': "C", 'ts': end * 1e6, 'pid': pid, 'args': dict(self.counters)})
+
+        text = json.dumps({'traceEvents': events, 'displayTimeUnit': "ms"}, default=str)
+        if path is not None:
+            Path(path).write_text(text)
+        return text
+
+    def _stack(self):
+        # Open spans of the current thread
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
@@ -0,0 +1,54 @@
+import numpy as np
+
+def rolling_sum(values: np.ndarray, window: int, min_periods: int=None, block: int=65536):
+    """
+    Rolling sum of each column over the last `window` rows, skipping missing values (as pandas rolling().sum()).
+
+    Missing values are masked out: running sums of the zero-filled values and running counts of the valid values,
+    so a NaN only affects the windows that contain it. The running sums restart every `block` rows
+    (each block starts `window` rows early), so their rounding error does not grow with the length of the series.
+
+    Inputs:
+    - values: (time) or (time x columns) array
+    - window: Window size
+    - min_periods: Minimum number of valid values in a window (None: window, i.e. NaN while the window holds a NaN)
+    - block: Rows per block of running sums
+
+    Outputs:
+    - sums (np.ndarray): Rolling sums, NaN where the window holds fewer than min_periods valid values
+    - counts (np.ndarray): Number of valid values in each window
+    """
+    values = np.asarray(values, dtype=float)
+    min_periods = window if min_periods is None else min_periods
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+
+    n = len(values)
+    sums = np.empty_like(filled)
+    counts = np.empty(values.shape, dtype=np.int64)
+    zero = np.zeros((1,) + values.shape[1:])
+    for start in range(0, n, max(block, 1)):
+        stop = min(start + block, n)
+        anchor = max(start - window, 0)
+        # prefix[i]: sum of rows anchor..anchor+i-1
+        prefix = np.concatenate([zero, np.cumsum(filled[anchor:stop], axis=0)])
+        prefix_count = np.concatenate([zero, np.cumsum(valid[anchor:stop], axis=0)])
+
+        # The window ending at row t covers rows max(t+1-window, 0)..t
+        rows = np.arange(start, stop)
+        end = rows + 1 - anchor
+        begin = np.maximum(rows + 1 - window, anchor) - anchor
+        sums[start:stop] = prefix[end] - prefix[begin]
+        counts[start:stop] = prefix_count[end] - prefix_count[begin]
+
+    sums[counts < min_periods] = np.nan
+    return sums, counts
+
+def first_valid(values: np.ndarray):
+    """
+    First non-missing value of each column (0 for columns without any), e.g. to center values before running sums.
+    """
+    values = np.asarray(values, dtype=float)
+    valid = ~np.isnan(values)
+    first = np.take_along_axis(values, valid.argmax(axis=0)[None], axis=0)
+    return np.where(valid.any(axis=0), first, 0.0)
@@ -0,0 +1,206 @@
+import warnings
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from .robustness_checks import false_discovery_control
+from ..utils.frequency import periods_per_year as infer_periods_per_year
+
+def bootstrap_indices(n_obs: int, n_resamples: int, block_size: float=20, method: str="stationary", rng=None):
+    """
+    Generate block-bootstrap resample indices in bulk.
+
+    Methods:
+    - "circular": Blocks of exactly block_size observations starting at random points, wrapping around the end
+    - "stationary": Blocks of random (geometric) length with mean block_size (Politis-Romano), wrapping around the end
+
+    Inputs:
+    - n_obs: Length of the series (and of each resample)
+    - n_resamples: Number of resamples
+    - block_size: (Mean) block length, roughly the horizon of the autocorrelation to preserve
+    - method: "stationary" or "circular"
+    - rng: Seed or np.random.Generator
+
+    Output:
+    - indices (np.ndarray): (n_resamples x n_obs) row positions of each resample
+    """
+    rng = np.random.default_rng(rng)
+    t = np.arange(n_obs)
+
+    if method == "circular":
+        block_size = int(block_size)
+        starts = rng.integers(0, n_obs, size=(n_resamples, -(-n_obs // block_size)))
+        indices = starts[:, t // block_size] + t % block_size
+    elif method == "stationary":
+        # A new block starts at each observation with probability 1/block_size
+        new_block = rng.random((n_resamples, n_obs)) < 1 / block_size
+        new_block[:, 0] = True
+        starts = rng.integers(0, n_obs, size=(n_resamples, n_obs))
+
+        # Time of the most recent block start, and the random start drawn for that block
+        block_time = np.maximum.accumulate(np.where(new_block, t, 0), axis=1)
+        indices = np.take_along_axis(starts, block_time, axis=1) + (t - block_time)
+    else:
+        raise ValueError(f"Unknown bootstrap method '{method}' (expected 'stationary' or 'circular')")
+    return indices % n_obs
+
+def bootstrap_distributions(returns,
+                            n_resamples: int=10000,
+                            block_size: float=20,
+                            method: str="stationary",
+                            drawdown: bool=False,
+                            periods_per_year=None,
+                            chunk_size: int=500,
+                            n_jobs: int=1,
+                            seed=None):
+    """
+    Bootstrap distributions of the Sharpe ratio (and optionally the maximum drawdown) of many strategies at once.
+
+    Resamples are processed in chunks of chunk_size (optionally over a process pool), so memory stays bounded
+    whatever n_resamples is. Each chunk gets its own random stream, so results do not depend on n_jobs.
+
+    For the Sharpe ratio, a chunk's resample indices are turned into a (resamples x time) count matrix C
+    (how often each observation is drawn), and the resampled sums of every strategy are the matrix products
+    C @ returns and C @ returns**2, without materializing any resampled path.
+    The maximum drawdown depends on the order of returns, so it requires the resampled paths themselves
+    (much more expensive: O(resamples x time x strategies)).
+
+    Inputs:
+    - returns: Return series (Series), or (time x strategies) DataFrame/array
+    - n_resamples: Number of bootstrap resamples
+    - block_size, method: Block bootstrap scheme (see bootstrap_indices)
+    - drawdown: Whether to also bootstrap the maximum drawdown
+    - periods_per_year: Number of periods per year used to annualize the Sharpe ratio (None: inferred from the dates)
+    - chunk_size: Number of resamples processed together
+    - n_jobs: Number of worker processes (1 runs in the current process)
+    - seed: Seed for reproducible resamples
+
+    Outputs:
+    - sharpe (np.ndarray): (n_resamples x strategies) bootstrapped annualized Sharpe ratios
+    - null_sharpe (np.ndarray): (n_resamples x strategies) Sharpe ratios of the resampled mean-centered returns,
+                                i.e. the distribution under the null hypothesis of zero mean return
+    - max_drawdown (np.ndarray or None): (n_resamples x strategies) bootstrapped maximum drawdowns
+    """
+    if periods_per_year is None:
+        periods_per_year = infer_periods_per_year(getattr(returns, "index", None))
+    values = np.asarray(returns, dtype=float)
+    values = values[:, None] if values.ndim == 1 else values
+
+    # One independent random stream per chunk
+    sizes = [min(chunk_size, n_resamples - i) for i in range(0, n_resamples, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    chunks = [(values, size, block_size, method, drawdown, periods_per_year, chunk_seed)
+              for size, chunk_seed in zip(sizes, seeds)]
+
+    if n_jobs == 1 or len(chunks) <= 1:
+        outputs = [_bootstrap_chunk(*chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            outputs = list(pool.map(_bootstrap_chunk, *zip(*chunks)))
+
+    sharpe = np.concatenate([out[0] for out in outputs])
+    null_sharpe = np.concatenate([out[1] for out in outputs])
+    max_drawdown = np.concatenate([out[2] for out in outputs]) if drawdown else None
+    return sharpe, null_sharpe, max_drawdown
+
+def bootstrap_test(returns,
+                   n_resamples: int=10000,
+                   block_size: float=20,
+                   method: str="stationary",
+                   alpha: float=0.05,
+                   drawdown: bool=False,
+                   periods_per_year=None,
+                   chunk_size: int=500,
+                   n_jobs: int=1,
+                   seed=None):
+    """
+    Test whether each strategy's Sharpe ratio is significantly positive, controlling the False Discovery Rate.
+
+    Steps:
+    1) Bootstrap the Sharpe ratio of every strategy (and optionally its maximum drawdown)
+    2) p-value: share of Sharpe ratios of the resampled mean-centered returns at least as large as the observed one
+    3) Benjamini-Hochberg FDR control over all strategies (false_discovery_control)
+
+    Inputs:
+    - returns: Return series (Series), or (time x strategies) DataFrame/array, e.g. one column per sweep parameter set
+               (NaN returns are ignored; strategies without a finite, non-zero-volatility Sharpe get p_value=1)
+    - alpha: Desired FDR level
+    - Other inputs: See bootstrap_distributions
+
+    Outputs:
+    - (pd.DataFrame): One row per strategy, columns sharpe, sharpe_ci_low, sharpe_ci_high, p_value, reject
+                      (and max_drawdown_median, max_drawdown_95 if drawdown=True)
+    """
+    if isinstance(returns, pd.Series):
+        returns = returns.to_frame()
+    if periods_per_year is None:
+        periods_per_year = infer_periods_per_year(getattr(returns, "index", None))
+    columns = returns.columns if isinstance(returns, pd.DataFrame) else None
+    values = np.asarray(returns, dtype=float)
+    values = values[:, None] if values.ndim == 1 else values
+
+    sharpe, null_sharpe, max_drawdown = bootstrap_distributions(values, n_resamples, block_size, method, drawdown,
+                                                                periods_per_year, chunk_size, n_jobs, seed)
+
+    # Observed Sharpe ratio (NaN returns, e.g. the leading NaN of pct_change, are ignored)
+    with np.errstate(divide="ignore", invalid="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        std = np.nanstd(values, axis=0, ddof=1)
+        observed = np.nanmean(values, axis=0) / std * np.sqrt(periods_per_year)
+
+    # One-sided p-value (with the +1 correction so it is never exactly 0)
+    # A strategy without a finite Sharpe ratio (no data, or zero variance e.g. a sweep cell that never trades)
+    # cannot be significant: p-value 1, never rejected
+    testable = np.isfinite(observed) & np.isfinite(std) & (std > 0)
+    p_values = (1 + (null_sharpe >= observed).sum(axis=0)) / (n_resamples + 1)
+    p_values = np.where(testable, p_values, 1.0)
+    reject = false_discovery_control(p_values, alpha=alpha) & testable
+
+    results = pd.DataFrame({
+        'sharpe': observed,
+        'sharpe_ci_low': np.nanquantile(sharpe, alpha / 2, axis=0),
+        'sharpe_ci_high': np.nanquantile(sharpe, 1 - alpha / 2, axis=0),
+        'p_value': p_values,
+        'reject': reject
+    }, index=columns)
+    if drawdown:
+        results['max_drawdown_median'] = np.median(max_drawdown, axis=0)
+        results['max_drawdown_95'] = np.quantile(max_drawdown, 0.95, axis=0)
+    return results
+
+def _bootstrap_chunk(values, n_resamples, block_size, method, drawdown, periods_per_year, seed):
+    """
+    Bootstrap one chunk of resamples (see bootstrap_distributions).
+    """
+    rng = np.random.default_rng(seed)
+    n_obs = len(values)
+    indices = bootstrap_indices(n_obs, n_resamples, block_size, method, rng)
+
+    # Count matrix: counts[b, t] = number of times observation t is drawn in resample b
+    offsets = np.arange(n_resamples)[:, None] * n_obs
+    counts = np.bincount((indices + offsets).ravel(), minlength=n_resamples * n_obs).reshape(n_resamples, n_obs)
+    counts = counts.astype(float)
+
+    # Resampled mean and sample standard deviation of every strategy, over the non-NaN observations drawn
+    valid = np.isfinite(values)
+    values = np.where(valid, values, 0.0)
+    n_valid = counts @ valid
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = counts @ values / n_valid
+        var = (counts @ values**2 - n_valid * mean**2) / (n_valid - 1)
+    std = np.sqrt(np.maximum(var, 0))
+
+    ann = np.sqrt(periods_per_year)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = mean / std * ann
+        # Mean-centering only shifts the mean (the standard deviation is unchanged)
+        null_sharpe = (mean - values.sum(axis=0) / valid.sum(axis=0)) / std * ann
+
+    max_drawdown = None
+    if drawdown:
+        max_drawdown = np.empty((n_resamples, values.shape[1]))
+        # NaN returns count as flat periods
+        for b in range(n_resamples):
+            equity = np.cumprod(1 + values[indices[b]], axis=0)
+            peak = np.maximum.accumulate(equity, axis=0)
+            max_drawdown[b] = ((peak - equity) / peak).max(axis=0)
+    return sharpe, null_sharpe, max_drawdown
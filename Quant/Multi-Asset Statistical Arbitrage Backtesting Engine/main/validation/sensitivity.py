@@ -1,58 +1,168 @@
-import numpy as np
-import pandas as pd
-
-def parameter_sweep(zscore: pd.Series,
-                    entry_range: list,
-                    exit_range: list,
-                    max_hold_range: list,
-                    prices: pd.DataFrame):
-    """
-    Perform a grid search/sensitivity analysis to test strategy robustness across multiple parameters.
-
-    Inputs:
-    - zscore: Spread z-score
-    - entry_range: Entry threshold
-    - exit_range: Exit threshold
-    - max_hold_range: Maximum holding period
-    - pricesL Asset price series for volatility targeting
-
-    Outputs:
-    - (pd.DataFrame): Consisting of columns: entry, exit, max_hold, final_pnl
-                      Each row represents one parameter combination
-    """
-    from Multi_Asset_Stat_Arb_Backtesting_Engine.main.signals.signal_generator import generate_signals
-    from Multi_Asset_Stat_Arb_Backtesting_Engine.main.portfolio.allocation import volatility_targeting
-
-    # Drop NaNs in zscore and prices
-    zscore = zscore.dropna()
-    prices = prices.loc[zscore.index].dropna()
-
-    results = []
-
-    # Loop through all combinations of parameters
-    for entry in entry_range:
-        for exit in exit_range:
-            for max_hold in max_hold_range:
-                # Generate trading signals for this parameter set
-                signals = generate_signals(zscore, entry_threshold=entry,
-                                           exit_threshold=exit,
-                                           max_hold=max_hold)
-                
-                # Convert signals to dollar positions with volatility targeting
-                positions = volatility_targeting(signals, prices, target_vol=0.02)
-                
-                # PnL calculation
-                daily_returns = positions.shift(1) * prices.pct_change()
-                daily_returns = daily_returns.replace([np.inf, -np.inf], 0).fillna(0)
-
-                final_pnl = np.nancumsum(daily_returns)[-1] # cumulative PnL for this parameter combo
-                
-                # Store results
-                results.append({
-                    'entry': entry,
-                    'exit': exit,
-                    'max_hold': max_hold,
-                    'final_pnl': final_pnl
-                })
-
-    return pd.DataFrame(results)
\ No newline at end of file
+import numpy as np
+import pandas as pd
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from ..signals.signal_generator import generate_signals_matrix
+from ..utils.frequency import periods_per_year as infer_periods_per_year
+
+def parameter_sweep(zscore,
+                    entry_range: list,
+                    exit_range: list,
+                    max_hold_range: list,
+                    prices,
+                    target_vol: float=0.02,
+                    capital: float=100000,
+                    chunk_size: int=2048,
+                    n_jobs: int=1,
+                    periods_per_year=None):
+    """
+    Perform a grid search/sensitivity analysis to test strategy robustness across multiple parameters.
+
+    The whole grid is evaluated as one batched array computation: returns and volatilities are computed once,
+    every (pair, entry, exit, max_hold) combination becomes one column of a signal matrix, and the columns
+    are processed in chunks (optionally over a process pool).
+
+    Inputs:
+    - zscore: Spread z-score (Series), or DataFrame with one column per pair
+    - entry_range: Entry threshold
+    - exit_range: Exit threshold
+    - max_hold_range: Maximum holding period (None: no limit)
+    - prices: Asset price series for volatility targeting (DataFrame with a column for each zscore column for several pairs,
+              matched by name)
+    - target_vol: Desired daily volatility used for position sizing
+    - capital: Capital allocated by dollar_neutral_allocation
+    - chunk_size: Number of grid columns evaluated together
+    - n_jobs: Number of worker processes (1 runs in the current process)
+    - periods_per_year: Bars per year used to annualize the Sharpe ratio (None: inferred from the dates, see utils/frequency.py)
+
+    Outputs:
+    - (pd.DataFrame): Consisting of columns: (pair,) entry, exit, max_hold, final_pnl, sharpe, max_drawdown, turnover
+                      Each row represents one parameter combination
+                      (max_drawdown is the largest peak-to-trough fall of cumulative PnL, in the same units as final_pnl)
+    """
+    multi_pair = isinstance(zscore, pd.DataFrame)
+    zscore = zscore.to_frame() if not multi_pair else zscore
+    prices = prices.to_frame() if isinstance(prices, pd.Series) else prices
+
+    # Pair each z-score column with its own price column (by name, not by position)
+    if multi_pair:
+        missing = [col for col in zscore.columns if col not in prices.columns]
+        if missing:
+            raise KeyError(f"Pairs without a price column: {missing}")
+        prices = prices[zscore.columns]
+    elif prices.shape[1] != 1:
+        raise ValueError(f"A single-pair zscore (Series) needs a single price series, got {prices.shape[1]} columns")
+
+    # Drop NaNs in zscore and prices (common sample across pairs)
+    zscore = zscore.dropna()
+    prices = prices.loc[zscore.index].dropna()
+    zscore = zscore.loc[prices.index]
+    periods_per_year = periods_per_year or infer_periods_per_year(zscore.index)
+
+    # Daily returns and volatility of each pair, computed once
+    price_values = prices.to_numpy(dtype=float)
+    returns = np.full_like(price_values, np.nan)
+    returns[1:] = price_values[1:] / price_values[:-1] - 1
+    vol = np.nanstd(returns[1:], axis=0, ddof=1)
+    scaling = np.where(vol > 0, target_vol / np.where(vol > 0, vol, 1), 1.0)
+
+    # One column per (pair, entry, exit, max_hold) combination
+    grid = [(pair, entry, exit, max_hold)
+            for pair in range(zscore.shape[1])
+            for entry in entry_range
+            for exit in exit_range
+            for max_hold in max_hold_range]
+    if not grid:
+        return pd.DataFrame(columns=["entry", "exit", "max_hold", "final_pnl", "sharpe", "max_drawdown", "turnover"])
+    pair_idx = np.array([g[0] for g in grid])
+    entries = np.array([g[1] for g in grid], dtype=float)
+    exits = np.array([g[2] for g in grid], dtype=float)
+    max_holds = np.array([np.nan if g[3] is None else g[3] for g in grid], dtype=float)
+
+    # Chunks are gathered lazily, so only the chunks being evaluated are held in memory
+    z_values = zscore.to_numpy(dtype=float)
+    chunks = ((z_values[:, pair_idx[i:i+chunk_size]],
+               returns[:, pair_idx[i:i+chunk_size]],
+               scaling[pair_idx[i:i+chunk_size]],
+               entries[i:i+chunk_size],
+               exits[i:i+chunk_size],
+               max_holds[i:i+chunk_size],
+               capital,
+               periods_per_year)
+              for i in range(0, len(grid), chunk_size))
+
+    if n_jobs == 1 or len(grid) <= chunk_size:
+        metrics = [_evaluate_block(*chunk) for chunk in chunks]
+    else:
+        metrics = _map_bounded(_evaluate_block, chunks, n_jobs)
+    metrics = np.concatenate(metrics, axis=1)
+
+    results = pd.DataFrame({
+        'entry': [g[1] for g in grid],
+        'exit': [g[2] for g in grid],
+        'max_hold': [g[3] for g in grid],
+        'final_pnl': metrics[0],
+        'sharpe': metrics[1],
+        'max_drawdown': metrics[2],
+        'turnover': metrics[3]
+    })
+    if multi_pair:
+        results.insert(0, 'pair', zscore.columns[pair_idx])
+    return results
+
+def _map_bounded(func, chunks, n_jobs: int):
+    """
+    Evaluate func(*chunk) for every chunk over a process pool, in order, with at most 2 chunks per worker
+    submitted at any time (pool.map would gather every chunk up front).
+    """
+    outputs = []
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+        for chunk in chunks:
+            if len(pending) >= 2 * n_jobs:
+                outputs.append(pending.popleft().result())
+            pending.append(pool.submit(func, *chunk))
+        outputs.extend(future.result() for future in pending)
+    return outputs
+
+def _evaluate_block(zscore, returns, scaling, entry, exit, max_hold, capital, periods_per_year=252):
+    """
+    Evaluate one chunk of grid columns.
+
+    Inputs:
+    - zscore: Z-scores (time x columns)
+    - returns: Asset returns for each column (time x columns)
+    - scaling: Volatility-targeting scale of each column
+    - entry, exit, max_hold: Parameters of each column
+    - capital: Capital allocated by dollar_neutral_allocation
+    - periods_per_year: Bars per year used to annualize the Sharpe ratio
+
+    Outputs:
+    - (np.ndarray): 4 x columns array of final_pnl, sharpe, max_drawdown, turnover
+    """
+    # Generate trading signals for all parameter sets at once
+    signals = generate_signals_matrix(zscore, entry_threshold=entry, exit_threshold=exit, max_hold=max_hold)
+
+    # Dollar-neutral allocation (equal split within each side) with volatility targeting
+    is_long = signals == 1
+    is_short = signals == -1
+    n_longs = np.maximum(is_long.sum(axis=0), 1)
+    n_shorts = np.maximum(is_short.sum(axis=0), 1)
+    positions = np.zeros(signals.shape)
+    positions += is_long * (capital / 2 / n_longs)
+    positions -= is_short * (capital / 2 / n_shorts)
+    positions *= scaling
+
+    # PnL calculation (yesterday's position times today's return)
+    daily_returns = np.zeros_like(positions)
+    daily_returns[1:] = positions[:-1] * returns[1:]
+    daily_returns[~np.isfinite(daily_returns)] = 0
+    cumulative = np.cumsum(daily_returns, axis=0)
+
+    final_pnl = cumulative[-1]
+    std = daily_returns.std(axis=0, ddof=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(std > 0, daily_returns.mean(axis=0) / std * np.sqrt(periods_per_year), np.nan)
+    max_drawdown = (np.maximum.accumulate(cumulative, axis=0) - cumulative).max(axis=0)
+    turnover = np.abs(np.diff(positions, axis=0)).sum(axis=0)
+    return np.vstack([final_pnl, sharpe, max_drawdown, turnover])
\ No newline at end of file
@@ -0,0 +1,198 @@
+import hashlib
+import tempfile
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+
+def walk_forward_splits(n_obs: int, train_size: int=504, test_size: int=63, step: int=None, anchored: bool=False):
+    """
+    Generate walk-forward train/test windows.
+
+    Inputs:
+    - n_obs: Number of observations (rows)
+    - train_size: Length of the training window (initial length if anchored)
+    - test_size: Length of each test window
+    - step: Rows between the starts of consecutive test windows (None: test_size, i.e. non-overlapping tests)
+    - anchored: If True the training window always starts at row 0 (expanding), else it rolls with fixed length
+
+    Outputs:
+    - splits (list of tuples): (train slice, test slice) of row positions, in time order
+    """
+    step = step if step is not None else test_size
+    splits = []
+    test_start = train_size
+    while test_start < n_obs:
+        train_start = 0 if anchored else test_start - train_size
+        splits.append((slice(train_start, test_start), slice(test_start, min(test_start + test_size, n_obs))))
+        test_start += step
+    return splits
+
+def walk_forward(prices: pd.DataFrame,
+                 train_size: int=504,
+                 test_size: int=63,
+                 step: int=None,
+                 anchored: bool=False,
+                 significance: float=0.05,
+                 max_pairs: int=20,
+                 prefilter_k: int=None,
+                 entry_range: list=(1.5, 2.0, 2.5),
+                 exit_range: list=(0.0, 0.5),
+                 max_hold_range: list=(None,),
+                 target_vol: float=0.02,
+                 cache_dir=None,
+                 n_jobs: int=1):
+    """
+    Walk-forward validation of the full pairs-trading pipeline.
+
+    For every fold, on the training window only:
+    1) Select cointegrated pairs (optionally among the top correlated pairs first)
+    2) Fit hedge ratios and z-score moments
+    3) Choose entry/exit/max_hold by the mean Sharpe ratio across the selected pairs (parameter_sweep)
+    Then the selected pairs are traded with the chosen parameters on the following test window.
+
+    Folds are independent and run in parallel processes. Cointegration p-values of a training window are cached
+    on disk, keyed by the window's exact content: only identical training windows reuse them (e.g. re-running with
+    another parameter grid, max_pairs or significance). A test statistic depends on the whole window, so windows
+    that merely overlap are tested again.
+
+    Inputs:
+    - prices: Aligned price DataFrame (dates x tickers)
+    - train_size, test_size, step, anchored: Window layout (see walk_forward_splits); step must be >= test_size,
+                                             so test windows do not overlap and every date has one OOS return
+    - significance: p-value threshold for pair selection
+    - max_pairs: Maximum number of pairs traded per fold (lowest p-values first)
+    - prefilter_k: If set, only the k most correlated pairs of the training window are tested for cointegration
+    - entry_range, exit_range, max_hold_range: Parameter grid searched on each training window
+    - target_vol: Desired daily volatility of each pair
+    - cache_dir: Folder for cached cointegration p-values (None: no caching)
+    - n_jobs: Number of worker processes (1 runs in the current process)
+
+    Outputs:
+    - folds (pd.DataFrame): One row per fold with its dates, selected pairs, chosen parameters and test performance
+    - oos_returns (pd.Series): Out-of-sample portfolio returns of all test windows, in time order
+    """
+    if step is not None and step < test_size:
+        raise ValueError(f"step ({step}) must be >= test_size ({test_size}): overlapping test windows would give "
+                         "duplicate out-of-sample dates")
+    splits = walk_forward_splits(len(prices), train_size, test_size, step, anchored)
+    run_fold = partial(_run_fold,
+                       significance=significance,
+                       max_pairs=max_pairs,
+                       prefilter_k=prefilter_k,
+                       entry_range=list(entry_range),
+                       exit_range=list(exit_range),
+                       max_hold_range=list(max_hold_range),
+                       target_vol=target_vol,
+                       cache_dir=cache_dir)
+
+    # Each fold only needs its own rows (training window followed by test window)
+    windows = [prices.iloc[train.start:test.stop] for train, test in splits]
+    fit_rows = [train.stop - train.start for train, _ in splits]
+
+    if n_jobs == 1 or len(splits) <= 1:
+        outputs = [run_fold(window, rows) for window, rows in zip(windows, fit_rows)]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            outputs = list(pool.map(run_fold, windows, fit_rows))
+
+    folds = pd.DataFrame([summary for summary, _ in outputs])
+    folds.insert(0, 'fold', range(len(folds)))
+    oos_returns = pd.concat([returns for _, returns in outputs]) if outputs else pd.Series(dtype=float)
+    return folds, oos_returns
+
+def _run_fold(window: pd.DataFrame, fit_rows: int, significance, max_pairs, prefilter_k,
+              entry_range, exit_range, max_hold_range, target_vol, cache_dir):
+    """
+    Fit on the first fit_rows rows of window and evaluate on the remaining rows.
+
+    Outputs:
+    - summary (dict): Fold dates, selected pairs, chosen parameters and test metrics
+    - returns (pd.Series): Portfolio returns over the test rows
+    """
+    from ..research.pair_selection import correlation_prefilter
+    from ..research.spread import construct_spreads
+    from ..signals.signal_generator import generate_signals_matrix
+    from ..backtest.engine import BacktestEngine
+    from ..risk.performance import performance_report
+    from .sensitivity import parameter_sweep
+
+    train = window.iloc[:fit_rows].dropna(axis=1)
+    test_index = window.index[fit_rows:]
+    summary = {
+        'train_start': train.index[0],
+        'train_end': train.index[-1],
+        'test_start': test_index[0],
+        'test_end': test_index[-1]
+    }
+
+    # 1) Pair selection on the training window
+    candidates = correlation_prefilter(train, k=prefilter_k) if prefilter_k else None
+    pvalue_matrix = _cointegration_pvalues(train, candidates, cache_dir)
+    left, right = np.nonzero(np.triu(pvalue_matrix < significance, k=1))
+    order = np.argsort(pvalue_matrix[left, right], kind="stable")[:max_pairs]
+    pairs = [(train.columns[left[i]], train.columns[right[i]]) for i in order]
+    summary['n_pairs'] = len(pairs)
+    summary['pairs'] = pairs
+
+    if not pairs:
+        # Nothing to trade in this fold
+        summary.update({'entry': np.nan, 'exit': np.nan, 'max_hold': None,
+                        'train_sharpe': np.nan, 'sharpe': np.nan, 'total_return': 0.0, 'max_drawdown': 0.0})
+        return summary, pd.Series(0.0, index=test_index)
+
+    # 2) Spreads fitted on the training window
+    S1 = train[[p[0] for p in pairs]].to_numpy(dtype=float)
+    S2 = train[[p[1] for p in pairs]].to_numpy(dtype=float)
+    _, zscores, _ = construct_spreads(S1, S2)
+    names = [f"{p[0]}_{p[1]}" for p in pairs]
+
+    # 3) Parameter choice on the training window: the sweep's volatility targeting and PnL use the pair's
+    # spread returns (S1 return - S2 return), given to it as a synthetic price path
+    spread_returns = np.zeros_like(S1)
+    spread_returns[1:] = S1[1:] / S1[:-1] - S2[1:] / S2[:-1]
+    spread_prices = pd.DataFrame(np.cumprod(1 + spread_returns, axis=0), index=train.index, columns=names)
+    sweep = parameter_sweep(pd.DataFrame(zscores, index=train.index, columns=names),
+                            entry_range, exit_range, max_hold_range, spread_prices, target_vol=target_vol)
+    by_params = sweep.groupby(['entry', 'exit', 'max_hold'], dropna=False)['sharpe'].mean()
+    best = by_params.idxmax() if by_params.notna().any() else by_params.index[0]
+    entry, exit, max_hold = best
+    max_hold = None if pd.isna(max_hold) else max_hold
+    summary.update({'entry': entry, 'exit': exit, 'max_hold': max_hold, 'train_sharpe': by_params.max()})
+
+    # 4) Out-of-sample evaluation: the engine fits on the training rows and trades the test rows only
+    signal_generator = partial(generate_signals_matrix, entry_threshold=entry, exit_threshold=exit, max_hold=max_hold)
+    engine = BacktestEngine(window, signal_generator, None, None, None)
+    result = engine.run(pairs, target_vol=target_vol, fit_until=fit_rows)
+    returns = result.portfolio_returns.iloc[fit_rows:]
+
+    report = performance_report(returns).iloc[0]
+    summary.update({'sharpe': report['sharpe'], 'total_return': report['total_return'], 'max_drawdown': report['max_drawdown']})
+    return summary, returns
+
+def _cointegration_pvalues(train: pd.DataFrame, candidates, cache_dir):
+    """
+    Cointegration p-value matrix of a training window, read from / written to the disk cache when enabled.
+    """
+    from ..research.pair_selection import find_cointegrated_pairs
+
+    if cache_dir is None:
+        return find_cointegrated_pairs(train, candidates=candidates)[1]
+
+    # Key: window content, tickers and candidate set
+    key = hashlib.blake2b(digest_size=16)
+    key.update(np.ascontiguousarray(train.to_numpy(dtype=float)).tobytes())
+    key.update(repr(list(train.columns)).encode())
+    key.update(repr(sorted((c[0], c[1]) for c in candidates) if candidates is not None else None).encode())
+    path = Path(cache_dir) / f"coint_{key.hexdigest()}.npy"
+
+    if path.exists():
+        return np.load(path)
+    pvalue_matrix = find_cointegrated_pairs(train, candidates=candidates)[1]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write to a uniquely named file then rename, so parallel folds (or processes) never read a partial file
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.stem + ".", suffix=".tmp", delete=False) as f:
+        np.save(f, pvalue_matrix)
+    Path(f.name).replace(path)
+    return pvalue_matrix
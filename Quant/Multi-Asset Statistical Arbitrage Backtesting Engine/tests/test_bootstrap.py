@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+import pytest
+from main.validation.bootstrap import bootstrap_test
+
+@pytest.fixture
+def returns():
+    index = pd.bdate_range("2020-01-01", periods=500)
+    rng = np.random.default_rng(0)
+    return pd.Series(0.002 + 0.005 * rng.standard_normal(500), index=index)
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+def test_untestable_columns_are_never_rejected(returns):
+    # All-NaN and zero-variance (never trading) strategies have no Sharpe ratio: p=1, not a discovery
+    strategies = pd.DataFrame({"good": returns, "nan": np.nan, "flat": 0.0})
+    results = bootstrap_test(strategies, n_resamples=500, seed=1)
+
+    assert results.loc["good", "reject"]
+    for col in ["nan", "flat"]:
+        assert results.loc[col, "p_value"] == 1.0
+        assert not results.loc[col, "reject"]
+
+def test_leading_nan_is_ignored(returns):
+    # The leading NaN of pct_change does not change the test
+    with_nan = returns.copy()
+    with_nan.iloc[0] = np.nan
+    results = bootstrap_test(with_nan, n_resamples=500, seed=1)
+    clean = bootstrap_test(returns.iloc[1:], n_resamples=500, seed=1)
+
+    assert np.isfinite(results["sharpe"].iloc[0])
+    assert results["sharpe"].iloc[0] == pytest.approx(clean["sharpe"].iloc[0])
+    assert results["reject"].iloc[0]
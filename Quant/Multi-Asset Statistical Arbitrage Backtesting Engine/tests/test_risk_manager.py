@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+from main.risk.risk_manager import RiskManager
+
+@pytest.mark.parametrize("legs", [1, 2])
+@pytest.mark.parametrize("max_drawdown", [0.05, 0.9])
+def test_step_matches_apply_limits(legs, max_drawdown):
+    # Bar-by-bar controls (step) equal the vectorized ones (apply_limits + drawdown_breach)
+    rng = np.random.default_rng(0)
+    n_bars, n_pairs = 500, 6
+    signals = np.sign(np.round(rng.standard_normal((n_bars, n_pairs)).cumsum(axis=0) / 3))
+    positions = signals * rng.uniform(0.2, 1.5, n_pairs)
+    zscores = 2 * rng.standard_normal((n_bars, n_pairs))
+    returns = 0.01 * rng.standard_normal(n_bars)
+
+    risk_manager = RiskManager(max_drawdown=max_drawdown, max_leverage=2.0, pair_stop_zscore=3.0)
+    risk_manager.reset(n_pairs)
+    stepped = np.array([risk_manager.step(positions[t], returns[t], zscores[t], legs=legs) for t in range(n_bars)])
+
+    vectorized = risk_manager.apply_limits(positions, zscores, legs=legs)
+    breach = risk_manager.drawdown_breach(returns)
+    vectorized[breach:] = 0
+
+    np.testing.assert_allclose(stepped, vectorized)
+    assert (legs * np.abs(stepped).sum(axis=1) <= 2.0 + 1e-12).all()
+    if max_drawdown < 0.1:
+        assert breach < n_bars